@@ -98,11 +98,11 @@ def demo_integration():
         print(f"Created: {word.word} (Status: {word.status.value})")
     
     # Set current word in playback service
-    playback_service.state.current_word = {
+    playback_service.update_state(current_word={
         'word': 'integrate',
         'meaning': 'combine one thing with another to form a whole',
         'category': 'topic vocab'
-    }
+    })
     print()
     
     # Test integrated workflow
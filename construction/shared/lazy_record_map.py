@@ -0,0 +1,252 @@
+"""
+Lazy view over a stored JSON map of records
+
+LazyRecordMap keeps the stored text and locates a record only when it is
+asked for: one lookup is a substring search plus decoding that record, and
+iterating builds an offset index of every key with literal searches (no
+record is parsed). Writes are collected and spliced into the original text
+on ``dumps``, so updating one word of a 100k-word map copies the text once
+and re-encodes only that word.
+
+Records must be JSON objects whose own fields are not objects (true of
+every progress record shape), so ``"key":{`` only occurs at the top level.
+"""
+import json
+from typing import Any, Callable, Dict, Iterator, List, Mapping, MutableMapping, Optional, Set, Tuple
+
+from .serialization import dumps, loads
+
+_decoder = json.JSONDecoder()
+
+def _escaped(text: str, position: int) -> bool:
+    """True if the character at ``position`` is escaped by a backslash"""
+    count = 0
+    position -= 1
+    while position >= 0 and text[position] == '\\':
+        count += 1
+        position -= 1
+    return count % 2 == 1
+
+class LazyRecordMap(MutableMapping):
+    """Mutable mapping of raw record dicts backed by the stored JSON text.
+
+    Reads return a freshly decoded dict each time (nothing handed out is
+    shared with the store); assignments and deletions are held until
+    ``dumps``, which returns the new text and rebases the view onto it.
+    """
+    
+    def __init__(self, text: str = '{}'):
+        self._text = text
+        # Text written by json.dumps with default separators: '"key": {'
+        first_colon = text.find('":')
+        while first_colon >= 0 and _escaped(text, first_colon):
+            first_colon = text.find('":', first_colon + 1)
+        self._spaced = first_colon >= 0 and text[first_colon + 2:first_colon + 3] == ' '
+        self._separator = '": {' if self._spaced else '":{'
+        # key -> (entry start, value start); _index covers every key once built
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None
+        self._located: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._changes: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()
+    
+    @classmethod
+    def from_records(cls, records: Mapping[str, Any]) -> 'LazyRecordMap':
+        """A view over already decoded records (e.g. from a columnar codec)"""
+        view = cls()
+        view._changes = dict(records)
+        return view
+    
+    @property
+    def changed(self) -> bool:
+        return bool(self._changes or self._deleted)
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._changes:
+            return self._changes[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        span = self._locate(key)
+        if span is None:
+            raise KeyError(key)
+        return _decoder.raw_decode(self._text, span[1])[0]
+    
+    def __setitem__(self, key: str, value: Any):
+        self._changes[key] = value
+        self._deleted.discard(key)
+    
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self._changes.pop(key, None)
+        self._deleted.add(key)
+    
+    def __contains__(self, key) -> bool:
+        if key in self._changes:
+            return True
+        return key not in self._deleted and self._locate(key) is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        index = self._build_index()
+        for key in index:
+            if key not in self._deleted:
+                yield key
+        for key in self._changes:
+            if key not in index:
+                yield key
+    
+    def __len__(self) -> int:
+        index = self._build_index()
+        stored = sum(1 for key in index if key not in self._deleted)
+        return stored + sum(1 for key in self._changes if key not in index)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Every record decoded in one parse of the text, changes applied"""
+        records = loads(self._text)
+        for key in self._deleted:
+            records.pop(key, None)
+        records.update(self._changes)
+        return records
+    
+    def dumps(self) -> str:
+        """The stored text with pending changes applied; the view is rebased onto it"""
+        if not self.changed:
+            return self._text
+        if self._spaced:
+            # Legacy layout: rewrite once in the compact form
+            text = dumps({key: self[key] for key in self})
+        else:
+            text = self._splice()
+        self.__init__(text)
+        return text
+    
+    def _splice(self) -> str:
+        text = self._text
+        edits = []
+        appended = []
+        for key in self._deleted:
+            span = self._locate(key)
+            if span is not None:
+                entry_start, value_start = span
+                end = _decoder.raw_decode(text, value_start)[1]
+                # Drop the entry with the comma before it (the first entry has none)
+                edits.append((entry_start - 1 if text[entry_start - 1] == ',' else entry_start, end, ''))
+        for key, value in self._changes.items():
+            span = self._locate(key)
+            if span is None:
+                appended.append(f'{dumps(key)}:{dumps(value)}')
+            else:
+                value_start = span[1]
+                end = _decoder.raw_decode(text, value_start)[1]
+                edits.append((value_start, end, dumps(value)))
+        
+        # One join over slices of the original, so the text is copied once.
+        # `leading` is true while nothing but '{' has been emitted; the comma
+        # after a run of deleted leading entries is then skipped.
+        close = text.rindex('}')
+        edits.sort()
+        edits.append((close, close, None))
+        pieces = []
+        position = 0
+        leading = False
+        for start, end, replacement in edits:
+            if leading and position < start and text[position] == ',':
+                position += 1
+            segment = text[position:start]
+            pieces.append(segment)
+            leading = segment == '{' or (leading and not segment)
+            if replacement is None:
+                break
+            pieces.append(replacement)
+            leading = leading and not replacement
+            position = end
+        if appended:
+            pieces.append(('' if leading else ',') + ','.join(appended))
+        pieces.append(text[close:])
+        return ''.join(pieces)
+    
+    def _locate(self, key: str) -> Optional[Tuple[int, int]]:
+        if self._index is not None:
+            return self._index.get(key)
+        if key in self._located:
+            return self._located[key]
+        text = self._text
+        needle = dumps(key)[:-1] + self._separator
+        span = None
+        position = text.find(needle)
+        while position >= 0:
+            before = text[position - 1] if position else ''
+            if before == ' ' and self._spaced:
+                before = text[position - 2]
+            if before in ('{', ','):
+                span = (position, position + len(needle) - 1)
+                break
+            position = text.find(needle, position + 1)
+        self._located[key] = span
+        return span
+    
+    def _build_index(self) -> Dict[str, Tuple[int, int]]:
+        if self._index is not None:
+            return self._index
+        text = self._text
+        find, rfind = text.find, text.rfind
+        separator = self._separator
+        index: Dict[str, Tuple[int, int]] = {}
+        position = find(separator)
+        while position >= 0:
+            if not _escaped(text, position):
+                start = rfind('"', 0, position)
+                while start > 0 and _escaped(text, start):
+                    start = rfind('"', 0, start)
+                key = text[start + 1:position]
+                if '\\' in key:
+                    key = json.loads(text[start:position + 1])
+                index[key] = (start, position + len(separator) - 1)
+            position = find(separator, position + len(separator))
+        self._index = index
+        return index
+
+class DecodedRecordView(Mapping):
+    """Read-only mapping that decodes each record on first access and keeps it.
+
+    ``decode(key, raw)`` turns a raw dict into a model object; objects are
+    cached for the life of the view, so mutating one and saving it through
+    the repository behaves as it did with a fully decoded dict.
+    """
+    
+    def __init__(self, records: Mapping[str, Any], decode: Callable[[str, Any], Any]):
+        self._records = records
+        self._decode = decode
+        self._cache: Dict[str, Any] = {}
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = self._decode(key, self._records[key])
+        return value
+    
+    def __contains__(self, key) -> bool:
+        return key in self._cache or key in self._records
+    
+    def __iter__(self) -> Iterator[str]:
+        # Snapshot, so callers may save records while iterating
+        return iter(list(self._records))
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        """Every record; a full walk parses the stored text once instead of
+        record by record"""
+        records = self._records
+        raw = records.to_dict() if isinstance(records, LazyRecordMap) else dict(records)
+        cache, decode = self._cache, self._decode
+        result = []
+        for key, data in raw.items():
+            value = cache.get(key)
+            if value is None:
+                value = cache[key] = decode(key, data)
+            result.append((key, value))
+        return result
+    
+    def values(self) -> List[Any]:
+        return [value for _, value in self.items()]
+    
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,432 @@
+"""
+Leaderboard engine - order-statistic ranking over learned-word scores
+
+Run the 1M-learner benchmark from the construction directory with:
+    python -m shared.leaderboard
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# Rolling window length in days; None keeps every contribution
+TIMEFRAMES = {
+    'today': 1,
+    'week': 7,
+    'allTime': None
+}
+
+DEFAULT_NICKNAME = 'Anonymous learner'
+
+@dataclass
+class LeaderboardEntry:
+    user_key: str
+    nickname: str
+    rank: int
+    learned_words: int
+    streak_days: Optional[int] = None
+    learning_minutes: Optional[int] = None
+    is_current_user: bool = False
+    
+    def to_dict(self) -> dict:
+        return {
+            'userKey': self.user_key,
+            'nickname': self.nickname,
+            'rank': self.rank,
+            'learnedWords': self.learned_words,
+            'streakDays': self.streak_days,
+            'learningMinutes': self.learning_minutes,
+            'isCurrentUser': self.is_current_user
+        }
+
+@dataclass
+class LeaderboardState:
+    timeframe: str
+    entries: List[LeaderboardEntry] = field(default_factory=list)
+    current_user_entry: Optional[LeaderboardEntry] = None
+    is_loading: bool = False
+    error: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        return {
+            'timeframe': self.timeframe,
+            'entries': [entry.to_dict() for entry in self.entries],
+            'currentUserEntry': self.current_user_entry.to_dict() if self.current_user_entry else None,
+            'isLoading': self.is_loading,
+            'error': self.error
+        }
+
+class FenwickTree:
+    """Binary indexed tree of counts over positions ``0 .. size - 1``"""
+    
+    def __init__(self, size: int):
+        self._tree = [0] * (size + 1)
+    
+    @classmethod
+    def from_counts(cls, counts: List[int]) -> 'FenwickTree':
+        """Build in O(n) instead of n separate O(log n) additions"""
+        tree = cls(0)
+        tree._tree = [0] + list(counts)
+        size = len(counts)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree._tree[parent] += tree._tree[i]
+        return tree
+    
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+    
+    def add(self, index: int, delta: int):
+        tree = self._tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+    
+    def prefix_sum(self, index: int) -> int:
+        """Sum of counts at positions ``0 .. index``"""
+        tree = self._tree
+        total = 0
+        i = min(index + 1, len(tree) - 1)
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+    
+    def find_by_prefix(self, target: int) -> int:
+        """Smallest position whose prefix sum reaches ``target`` (target >= 1)"""
+        tree = self._tree
+        position = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            next_position = position + step
+            if next_position < len(tree) and tree[next_position] < target:
+                position = next_position
+                target -= tree[next_position]
+            step >>= 1
+        return position
+
+class ScoreIndex:
+    """Ranks users by a non-negative integer score.
+
+    A Fenwick tree counts users per score, so rank lookups and score changes
+    cost O(log S) for a score range S regardless of the number of users.
+    Users with the same score share a rank and are kept in a per-score bucket
+    in the order they reached it, which lets ``top`` walk straight down the
+    occupied scores without sorting anyone.
+    """
+    
+    def __init__(self, max_score: int = 1023):
+        self._scores: Dict[str, int] = {}
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._tree = FenwickTree(max_score + 1)
+    
+    def __len__(self) -> int:
+        return len(self._scores)
+    
+    def __contains__(self, user_key: str) -> bool:
+        return user_key in self._scores
+    
+    def score_of(self, user_key: str) -> Optional[int]:
+        return self._scores.get(user_key)
+    
+    def set_score(self, user_key: str, score: int):
+        if score < 0:
+            raise ValueError(f'Score must be non-negative, got {score}')
+        old_score = self._scores.get(user_key)
+        if old_score == score:
+            return
+        if old_score is not None:
+            self._unlink(user_key, old_score)
+        self._link(user_key, score)
+    
+    def add_score(self, user_key: str, delta: int) -> int:
+        score = self._scores.get(user_key, 0) + delta
+        self.set_score(user_key, score)
+        return score
+    
+    def remove(self, user_key: str):
+        score = self._scores.get(user_key)
+        if score is not None:
+            self._unlink(user_key, score)
+    
+    def count_above(self, score: int) -> int:
+        """Number of users with a strictly higher score"""
+        return len(self._scores) - self._tree.prefix_sum(score)
+    
+    def rank_of(self, user_key: str) -> Optional[int]:
+        """1-based competition rank (ties share a rank), None if unranked"""
+        score = self._scores.get(user_key)
+        if score is None:
+            return None
+        return self.count_above(score) + 1
+    
+    def top(self, k: int) -> List[Tuple[str, int, int]]:
+        """The ``k`` best ``(user_key, score, rank)`` rows, best first"""
+        rows = []
+        remaining = len(self._scores)
+        rank = 1
+        while len(rows) < k and remaining > 0:
+            # Highest occupied score among the users not yet listed
+            score = self._tree.find_by_prefix(remaining)
+            bucket = self._buckets[score]
+            for user_key in bucket:
+                rows.append((user_key, score, rank))
+                if len(rows) == k:
+                    break
+            rank += len(bucket)
+            remaining -= len(bucket)
+        return rows
+    
+    def bulk_load(self, scores: Dict[str, int]):
+        """Replace the contents with ``scores`` in O(n + S)"""
+        self._scores = {}
+        self._buckets = {}
+        for user_key, score in scores.items():
+            if score < 0:
+                raise ValueError(f'Score must be non-negative, got {score}')
+            self._scores[user_key] = score
+            self._buckets.setdefault(score, {})[user_key] = None
+        self._rebuild_tree(max(len(self._tree), max(scores.values(), default=0) + 1))
+    
+    def _link(self, user_key: str, score: int):
+        if score >= len(self._tree):
+            self._rebuild_tree(max(score + 1, 2 * len(self._tree)))
+        self._scores[user_key] = score
+        bucket = self._buckets.get(score)
+        if bucket is None:
+            bucket = self._buckets[score] = {}
+        bucket[user_key] = None
+        self._tree.add(score, 1)
+    
+    def _unlink(self, user_key: str, score: int):
+        del self._scores[user_key]
+        bucket = self._buckets[score]
+        del bucket[user_key]
+        if not bucket:
+            del self._buckets[score]
+        self._tree.add(score, -1)
+    
+    def _rebuild_tree(self, size: int):
+        counts = [0] * size
+        for score, bucket in self._buckets.items():
+            counts[score] = len(bucket)
+        self._tree = FenwickTree.from_counts(counts)
+
+class RollingWindow:
+    """Learned-word and minute totals over the last ``days`` days.
+
+    Contributions are bucketed per day; advancing the window subtracts only
+    the day buckets that fell out of it, so the cost of a roll is
+    proportional to the activity being expired, not to the number of users.
+    """
+    
+    def __init__(self, days: Optional[int], max_score: int = 1023):
+        self.days = days
+        self.index = ScoreIndex(max_score)
+        self.minutes: Dict[str, int] = {}
+        self._daily: Dict[int, Dict[str, List[int]]] = {}
+        self._current_day: Optional[int] = None
+    
+    def start_day(self) -> Optional[int]:
+        if self.days is None or self._current_day is None:
+            return None
+        return self._current_day - self.days + 1
+    
+    def record(self, user_key: str, day: int, words: int, minutes: int):
+        if self._current_day is None or day > self._current_day:
+            self.advance_to(day)
+        start_day = self.start_day()
+        if start_day is not None and day < start_day:
+            return
+        
+        if self.days is not None:
+            totals = self._daily.setdefault(day, {}).setdefault(user_key, [0, 0])
+            totals[0] += words
+            totals[1] += minutes
+        if words:
+            self.index.add_score(user_key, words)
+        if minutes:
+            self.minutes[user_key] = self.minutes.get(user_key, 0) + minutes
+    
+    def advance_to(self, day: int):
+        if self._current_day is not None and day <= self._current_day:
+            return
+        self._current_day = day
+        start_day = self.start_day()
+        if start_day is None:
+            return
+        for expired_day in [d for d in self._daily if d < start_day]:
+            for user_key, (words, minutes) in self._daily.pop(expired_day).items():
+                self._subtract(user_key, words, minutes)
+    
+    def _subtract(self, user_key: str, words: int, minutes: int):
+        if words:
+            score = self.index.score_of(user_key) - words
+            if score > 0:
+                self.index.set_score(user_key, score)
+            else:
+                self.index.remove(user_key)
+        if minutes:
+            remaining = self.minutes.get(user_key, 0) - minutes
+            if remaining > 0:
+                self.minutes[user_key] = remaining
+            else:
+                self.minutes.pop(user_key, None)
+
+class Leaderboard:
+    """Today / week / all-time leaderboards fed by learned-word events"""
+    
+    def __init__(self, today: Optional[date] = None, max_score: int = 1023):
+        self.windows = {
+            timeframe: RollingWindow(days, max_score)
+            for timeframe, days in TIMEFRAMES.items()
+        }
+        self._nicknames: Dict[str, str] = {}
+        self._last_active: Dict[str, int] = {}
+        self._streaks: Dict[str, int] = {}
+        self._today = (today or date.today()).toordinal()
+        self.advance_to(today or date.today())
+    
+    def set_nickname(self, user_key: str, nickname: str):
+        self._nicknames[user_key] = nickname
+    
+    def record_learned(self, user_key: str, words: int = 1, minutes: int = 0,
+                       day: Optional[date] = None):
+        """Credit a learner with newly learned words (and optional minutes)"""
+        ordinal = day.toordinal() if day else self._today
+        if ordinal > self._today:
+            self.advance_to(day)
+        for window in self.windows.values():
+            window.record(user_key, ordinal, words, minutes)
+        self._update_streak(user_key, ordinal)
+    
+    def advance_to(self, day: date):
+        """Roll every window forward to ``day`` (call on date change)"""
+        ordinal = day.toordinal()
+        self._today = max(self._today, ordinal)
+        for window in self.windows.values():
+            window.advance_to(self._today)
+    
+    def load_all_time(self, learned_words: Dict[str, int]):
+        """Seed all-time totals (e.g. from stored progress) in one pass"""
+        self.windows['allTime'].index.bulk_load(learned_words)
+    
+    def rank_of(self, user_key: str, timeframe: str = 'today') -> Optional[int]:
+        return self._window(timeframe).index.rank_of(user_key)
+    
+    def streak_of(self, user_key: str) -> int:
+        last_active = self._last_active.get(user_key)
+        if last_active is None or last_active < self._today - 1:
+            return 0
+        return self._streaks.get(user_key, 0)
+    
+    def get_entry(self, user_key: str, timeframe: str = 'today',
+                  current_user_key: Optional[str] = None) -> LeaderboardEntry:
+        """Entry for one learner; learners without activity rank after everyone"""
+        window = self._window(timeframe)
+        rank = window.index.rank_of(user_key)
+        return self._entry(
+            window,
+            user_key,
+            window.index.score_of(user_key) or 0,
+            rank if rank is not None else len(window.index) + 1,
+            current_user_key
+        )
+    
+    def get_state(self, timeframe: str = 'today', current_user_key: Optional[str] = None,
+                  limit: int = 5) -> LeaderboardState:
+        window = self._window(timeframe)
+        entries = [
+            self._entry(window, user_key, score, rank, current_user_key)
+            for user_key, score, rank in window.index.top(limit)
+        ]
+        current_user_entry = None
+        if current_user_key is not None:
+            current_user_entry = next(
+                (entry for entry in entries if entry.is_current_user), None
+            ) or self.get_entry(current_user_key, timeframe, current_user_key)
+        return LeaderboardState(
+            timeframe=timeframe,
+            entries=entries,
+            current_user_entry=current_user_entry
+        )
+    
+    def _entry(self, window: RollingWindow, user_key: str, score: int, rank: int,
+               current_user_key: Optional[str]) -> LeaderboardEntry:
+        streak = self.streak_of(user_key)
+        minutes = window.minutes.get(user_key)
+        return LeaderboardEntry(
+            user_key=user_key,
+            nickname=self._nicknames.get(user_key, DEFAULT_NICKNAME),
+            rank=rank,
+            learned_words=score,
+            streak_days=streak or None,
+            learning_minutes=minutes,
+            is_current_user=user_key == current_user_key
+        )
+    
+    def _window(self, timeframe: str) -> RollingWindow:
+        window = self.windows.get(timeframe)
+        if window is None:
+            raise ValueError(f'Unknown timeframe {timeframe!r}; expected one of {list(TIMEFRAMES)}')
+        return window
+    
+    def _update_streak(self, user_key: str, ordinal: int):
+        last_active = self._last_active.get(user_key)
+        if last_active is None or ordinal > last_active + 1:
+            self._streaks[user_key] = 1
+        elif ordinal == last_active + 1:
+            self._streaks[user_key] = self._streaks.get(user_key, 0) + 1
+        else:
+            return
+        self._last_active[user_key] = ordinal
+
+def _timed(label: str, operations: int, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    per_op = elapsed / operations * 1e6
+    print(f'{label:<44}{elapsed * 1000:>10.1f} ms{per_op:>14.2f} us/op')
+    return result
+
+def _benchmark(learners: int = 1_000_000, operations: int = 100_000, seed: int = 7):
+    rng = random.Random(seed)
+    user_keys = [f'user-{i}' for i in range(learners)]
+    all_time = {user_key: rng.randint(0, 3263) for user_key in user_keys}
+    today = date.today()
+    board = Leaderboard(today=today - timedelta(days=6), max_score=4095)
+    
+    print(f'{learners:,} learners, {operations:,} operations per step')
+    _timed('bulk load all-time scores', learners, lambda: board.load_all_time(all_time))
+    
+    def record_week():
+        for offset in range(6, -1, -1):
+            day = today - timedelta(days=offset)
+            for _ in range(operations // 7):
+                board.record_learned(rng.choice(user_keys), rng.randint(1, 5), rng.randint(1, 20), day)
+    _timed('record learned words over 7 days', operations, record_week)
+    
+    probes = [rng.choice(user_keys) for _ in range(operations)]
+    for timeframe in TIMEFRAMES:
+        _timed(f'rank lookup ({timeframe})', operations,
+               lambda: [board.rank_of(user_key, timeframe) for user_key in probes])
+    _timed('top-10 (allTime)', 1000, lambda: [board.get_state('allTime', probes[i], 10) for i in range(1000)])
+    _timed('top-10 (today)', 1000, lambda: [board.get_state('today', probes[i], 10) for i in range(1000)])
+    _timed('roll windows to next day', 1, lambda: board.advance_to(today + timedelta(days=1)))
+    
+    def naive_rank():
+        ordered = sorted(all_time.items(), key=lambda item: -item[1])
+        return next(i for i, (user_key, _) in enumerate(ordered) if user_key == probes[0])
+    _timed('naive sort-per-request rank (1 query)', 1, naive_rank)
+    
+    state = board.get_state('week', probes[0], 5)
+    for entry in state.entries:
+        print(f'  #{entry.rank:<6}{entry.nickname:<20}{entry.learned_words:>6} words')
+    current = state.current_user_entry
+    print(f'  you: #{current.rank} with {current.learned_words} words this week')
+
+if __name__ == '__main__':
+    _benchmark()
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 from typing import Any, Optional
@@ -21,8 +22,41 @@ class LocalStorageSimulator:
     
     def set_item(self, key: str, value: str) -> None:
         file_path = self._get_file_path(key)
+        # One json.dumps call: json.dump streams through the slower iterencode
+        text = json.dumps(value)
         with open(file_path, 'w') as f:
-            json.dump(value, f)
+            f.write(text)
+    
+    def get_item_version(self, key: str) -> Optional[str]:
+        """Change token for a key (hash of the stored text), None if absent.
+        Reads the file but does not parse it; mtime and size would miss a
+        same-size rewrite within the filesystem's mtime granularity."""
+        try:
+            with open(self._get_file_path(key), 'rb') as f:
+                return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        except FileNotFoundError:
+            return None
+    
+    def sync(self, keys) -> None:
+        """fsync the files of the given keys and the directory holding them"""
+        for key in keys:
+            try:
+                fd = os.open(self._get_file_path(key), os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        try:
+            fd = os.open(self.storage_dir, os.O_RDONLY)
+        except OSError:
+            # Directories cannot be opened on every platform
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
     
     def remove_item(self, key: str) -> None:
         file_path = self._get_file_path(key)
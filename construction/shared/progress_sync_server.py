@@ -0,0 +1,179 @@
+"""
+SQLite stand-in for the server-side progress store used by delta sync
+
+Mirrors the role of the Supabase learned-word tables: one row per
+(user, word) carrying a server version and the change sequence that last
+touched it, so clients can push batched upserts and pull only what changed.
+"""
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from .serialization import dumps, loads
+
+SCHEMA = """
+create table if not exists learned_progress (
+  user_unique_key text not null,
+  word_id text not null,
+  data text,
+  version integer not null,
+  deleted integer not null default 0,
+  change_seq integer not null,
+  primary key (user_unique_key, word_id)
+);
+create index if not exists learned_progress_changes
+  on learned_progress (user_unique_key, change_seq);
+create table if not exists progress_sync_sequence (
+  user_unique_key text primary key,
+  last_seq integer not null
+);
+"""
+
+class SqliteProgressServer:
+    """Server-side store with optimistic concurrency per record.
+
+    A pushed change carries the server version the client based it on; it is
+    applied only if that still matches, otherwise the current server row is
+    returned as a conflict for the client to resolve.
+    """
+    
+    def __init__(self, path: str = ':memory:'):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+    
+    def close(self):
+        self._db.close()
+    
+    def push(self, request: dict) -> dict:
+        """Apply ``{'user_key', 'changes': [{'word_key', 'base_version', 'data', 'deleted'}]}``"""
+        user_key = request['user_key']
+        changes = request['changes']
+        with self._lock, self._db:
+            current = self._current_versions(user_key, [change['word_key'] for change in changes])
+            previous_seq = seq = self._last_seq(user_key)
+            accepted, rows, conflicts = [], [], []
+            for change in changes:
+                word_key = change['word_key']
+                server_version = current.get(word_key, 0)
+                if change.get('base_version', 0) != server_version:
+                    conflicts.append(word_key)
+                    continue
+                seq += 1
+                version = server_version + 1
+                deleted = bool(change.get('deleted'))
+                data = None if deleted else dumps(change['data'])
+                rows.append((user_key, word_key, data, version, int(deleted), seq))
+                accepted.append({'word_key': word_key, 'version': version})
+            
+            # One batched upsert for the whole push
+            self._db.executemany(
+                'insert into learned_progress '
+                '(user_unique_key, word_id, data, version, deleted, change_seq) '
+                'values (?, ?, ?, ?, ?, ?) '
+                'on conflict (user_unique_key, word_id) do update set '
+                'data = excluded.data, version = excluded.version, '
+                'deleted = excluded.deleted, change_seq = excluded.change_seq',
+                rows
+            )
+            self._db.execute(
+                'insert into progress_sync_sequence (user_unique_key, last_seq) values (?, ?) '
+                'on conflict (user_unique_key) do update set last_seq = excluded.last_seq',
+                (user_key, seq)
+            )
+            return {
+                'accepted': accepted,
+                'conflicts': self._rows(user_key, conflicts),
+                'previous_seq': previous_seq,
+                'seq': seq
+            }
+    
+    def pull(self, request: dict) -> dict:
+        """Changes after ``since`` in sequence order, at most ``limit`` per call"""
+        user_key = request['user_key']
+        since = request.get('since', 0)
+        limit = request.get('limit', 500)
+        with self._lock:
+            cursor = self._db.execute(
+                'select word_id, data, version, deleted, change_seq from learned_progress '
+                'where user_unique_key = ? and change_seq > ? order by change_seq limit ?',
+                (user_key, since, limit + 1)
+            )
+            rows = cursor.fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'changes': [self._change(row) for row in rows],
+            'seq': rows[-1][4] if rows else since,
+            'has_more': has_more
+        }
+    
+    def _current_versions(self, user_key: str, word_keys: List[str]) -> Dict[str, int]:
+        versions = {}
+        for start in range(0, len(word_keys), 500):
+            chunk = word_keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for word_key, version in self._db.execute(
+                f'select word_id, version from learned_progress '
+                f'where user_unique_key = ? and word_id in ({placeholders})',
+                [user_key, *chunk]
+            ):
+                versions[word_key] = version
+        return versions
+    
+    def _last_seq(self, user_key: str) -> int:
+        row = self._db.execute(
+            'select last_seq from progress_sync_sequence where user_unique_key = ?', (user_key,)
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def _rows(self, user_key: str, word_keys: List[str]) -> List[dict]:
+        changes = []
+        for word_key in word_keys:
+            row = self._db.execute(
+                'select word_id, data, version, deleted, change_seq from learned_progress '
+                'where user_unique_key = ? and word_id = ?', (user_key, word_key)
+            ).fetchone()
+            if row:
+                changes.append(self._change(row))
+        return changes
+    
+    @staticmethod
+    def _change(row) -> dict:
+        word_key, data, version, deleted, _ = row
+        return {
+            'word_key': word_key,
+            'data': loads(data) if data is not None else None,
+            'version': version,
+            'deleted': bool(deleted)
+        }
+
+@dataclass
+class TransportStats:
+    round_trips: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+class LoopbackTransport:
+    """Calls the server in-process but serializes every request and response
+    as JSON, so payload sizes and round trips match a real network hop"""
+    
+    def __init__(self, server: SqliteProgressServer):
+        self.server = server
+        self.stats = TransportStats()
+        self._handlers: Dict[str, Callable[[dict], dict]] = {
+            'push': server.push,
+            'pull': server.pull
+        }
+    
+    def call(self, method: str, request: dict) -> Any:
+        body = dumps(request).encode('utf-8')
+        response = dumps(self._handlers[method](loads(body))).encode('utf-8')
+        self.stats.round_trips += 1
+        self.stats.bytes_sent += len(body)
+        self.stats.bytes_received += len(response)
+        return loads(response)
+    
+    def reset_stats(self):
+        self.stats = TransportStats()
@@ -0,0 +1,173 @@
+"""
+Reactivation calendar for words on hiatus
+
+Mastered and retired words leave the review rotation until a return day
+(``next_review_date``), and due-word queries skip them, so finding the ones
+whose hiatus has ended would otherwise take a scan over every word. The
+calendar files each such word in a bucket for its return day; ``sweep(day)``
+takes out exactly the words due by that day, touching only those words and
+the buckets they sit in.
+"""
+import heapq
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+def day_of(review_date: Optional[str]) -> str:
+    """Calendar day ('YYYY-MM-DD') of a stored review date. A missing or
+    unparsable date is already due, like ``is_due_for_review`` treats it,
+    so it maps to '' (before every real day)."""
+    if not review_date:
+        return ''
+    try:
+        return datetime.fromisoformat(review_date).date().isoformat()
+    except (ValueError, TypeError):
+        return ''
+
+class ReactivationCalendar:
+    """Words bucketed by the ISO day they return to the review rotation.
+
+    ISO days sort as strings, so bucket days sit in a min-heap as they are.
+    Cancelling a word drops it from its bucket; a bucket emptied that way
+    leaves its day in the heap, which is skipped when it reaches the top.
+    Buckets keep insertion order, so sweeps are deterministic.
+    """
+    
+    def __init__(self):
+        self._buckets: Dict[str, Dict[str, None]] = {}
+        self._days: Dict[str, str] = {}
+        self._heap: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._days)
+    
+    def __contains__(self, word_key: str) -> bool:
+        return word_key in self._days
+    
+    def return_day(self, word_key: str) -> Optional[str]:
+        return self._days.get(word_key)
+    
+    def schedule(self, word_key: str, day: str):
+        """File a word under its return day, moving it if already filed"""
+        current = self._days.get(word_key)
+        if current == day:
+            return
+        if current is not None:
+            self._unfile(word_key, current)
+        bucket = self._buckets.get(day)
+        if bucket is None:
+            bucket = self._buckets[day] = {}
+            heapq.heappush(self._heap, day)
+            self._compact_if_needed()
+        bucket[word_key] = None
+        self._days[word_key] = day
+    
+    def cancel(self, word_key: str):
+        """Forget a word (it returned early, was reset or was removed)"""
+        day = self._days.pop(word_key, None)
+        if day is not None:
+            self._unfile(word_key, day)
+    
+    def clear(self):
+        self._buckets.clear()
+        self._days.clear()
+        self._heap.clear()
+    
+    def next_day(self) -> Optional[str]:
+        """Earliest day any filed word returns"""
+        heap = self._heap
+        while heap and heap[0] not in self._buckets:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+    
+    def due(self, day: str) -> List[str]:
+        """Words that return on or before ``day``, earliest first, left filed"""
+        return [
+            word_key
+            for bucket_day in sorted(d for d in self._buckets if d <= day)
+            for word_key in self._buckets[bucket_day]
+        ]
+    
+    def sweep(self, day: str) -> List[str]:
+        """Take out and return every word due on or before ``day``, earliest
+        first. Costs O(k) for k returned words plus O(log B) per bucket."""
+        heap = self._heap
+        swept = []
+        while heap and heap[0] <= day:
+            bucket = self._buckets.pop(heapq.heappop(heap), None)
+            if bucket:
+                swept.extend(bucket)
+        for word_key in swept:
+            del self._days[word_key]
+        return swept
+    
+    def entries(self) -> Tuple[List[str], List[str]]:
+        """Filed words and their return days, for snapshots"""
+        return list(self._days), list(self._days.values())
+    
+    def load(self, word_keys: List[str], days: List[str]):
+        """Replace the contents with the output of ``entries()``"""
+        self.clear()
+        buckets = self._buckets
+        for word_key, day in zip(word_keys, days):
+            bucket = buckets.get(day)
+            if bucket is None:
+                bucket = buckets[day] = {}
+            bucket[word_key] = None
+        self._days = dict(zip(word_keys, days))
+        self._heap = list(buckets)
+        heapq.heapify(self._heap)
+    
+    def _unfile(self, word_key: str, day: str):
+        bucket = self._buckets[day]
+        del bucket[word_key]
+        if not bucket:
+            del self._buckets[day]
+    
+    def _compact_if_needed(self):
+        # Rebuild once stale days outnumber live buckets so the heap stays O(B)
+        if len(self._heap) > 2 * len(self._buckets) + 64:
+            self._heap = list(self._buckets)
+            heapq.heapify(self._heap)
+
+def _benchmark(counts=(10000, 100000, 1000000), hiatus_share: float = 0.3):
+    """Daily reactivation over a year: scan every word vs sweep the calendar"""
+    import random
+    import time
+    from datetime import timedelta
+    
+    start = date(2026, 1, 1)
+    days = [(start + timedelta(days=i)).isoformat() for i in range(366)]
+    print(f"{'words':>8}{'on hiatus':>11}{'scan ms/day':>13}{'sweep ms/day':>14}{'words/day':>11}")
+    for count in counts:
+        rng = random.Random(1)
+        return_days = {
+            f'word{i}': days[rng.randrange(len(days))] if rng.random() < hiatus_share else None
+            for i in range(count)
+        }
+        
+        # Full scan: check every word's return day, removing the ones that came back
+        pending = dict(return_days)
+        started = time.perf_counter()
+        scanned = 0
+        for day in days[:30]:
+            due = [word_key for word_key, return_day in pending.items()
+                   if return_day is not None and return_day <= day]
+            for word_key in due:
+                pending[word_key] = None
+            scanned += len(due)
+        scan_ms = (time.perf_counter() - started) * 1000 / 30
+        
+        calendar = ReactivationCalendar()
+        for word_key, return_day in return_days.items():
+            if return_day is not None:
+                calendar.schedule(word_key, return_day)
+        on_hiatus = len(calendar)
+        started = time.perf_counter()
+        swept = sum(len(calendar.sweep(day)) for day in days[:30])
+        sweep_ms = (time.perf_counter() - started) * 1000 / 30
+        if swept != scanned:
+            raise AssertionError(f'sweep returned {swept} words, scan {scanned}')
+        print(f'{count:>8}{on_hiatus:>11}{scan_ms:>13.2f}{sweep_ms:>14.3f}{swept / 30:>11.0f}')
+
+if __name__ == '__main__':
+    _benchmark()
@@ -0,0 +1,634 @@
+"""
+Append-only per-learner review log
+
+Progress records keep only counters, so every review and exposure is also
+appended here: word, time, outcome and action. Entries are stored column by
+column in typed arrays, in segments of SEGMENT_SIZE with each time stored as
+the delta from the previous entry, and every word keeps the positions of its
+entries, so slicing by word or by time range touches only the matching
+entries and the segments they sit in.
+
+Memory stays bounded by tiers: once there are more than ``max_raw_entries``
+raw entries, the oldest segments are rolled up into per-word daily counts,
+and once those pass ``max_daily_rows`` the oldest days are rolled up into
+monthly counts. ``counts`` sums across all tiers; raw entries are kept for
+the recent history that analysis and model fitting need.
+
+``save`` writes a log to a localStorage-like store in pieces: each full
+segment once, under ``<key>_<number>``, and a head item under ``key`` with
+the open segment, the rollups and the word list. A flush therefore costs
+the same however long the log has grown. ``dumps``/``loads`` give the whole
+log as one text instead.
+"""
+import base64
+import bisect
+import itertools
+import json
+import math
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+FORMAT_VERSION = 1
+# Head item written by ``save``; full segments are items of their own
+SPLIT_FORMAT_VERSION = 2
+SEGMENT_SIZE = 1024
+NO_OUTCOME = -1
+SECONDS_PER_DAY = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Last day number a date can represent
+_LAST_DAY = date.max.toordinal() - _EPOCH_ORDINAL
+_SEGMENT_HEADER = struct.Struct('<qqI')
+_ROLLUP_HEADER = struct.Struct('<I')
+
+class ReviewEntries(NamedTuple):
+    """Raw log entries as parallel columns, oldest first"""
+    words: List[str]
+    timestamps: List[int]
+    # 1 correct, 0 incorrect, NO_OUTCOME for entries without one (exposures)
+    outcomes: List[int]
+    actions: List[str]
+
+class ReviewCounts(NamedTuple):
+    total: int = 0
+    correct: int = 0
+    incorrect: int = 0
+
+def _pack(*columns: array) -> bytes:
+    if sys.byteorder == 'big':
+        columns = [array(column.typecode, column) for column in columns]
+        for column in columns:
+            column.byteswap()
+    return b''.join(column.tobytes() for column in columns)
+
+def _unpack(data: bytes, count: int, typecodes: str) -> List[array]:
+    columns, offset = [], 0
+    for typecode in typecodes:
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(data[offset:offset + size])
+        if sys.byteorder == 'big':
+            column.byteswap()
+        columns.append(column)
+        offset += size
+    return columns
+
+class _Segment:
+    """Up to SEGMENT_SIZE consecutive entries"""
+    __slots__ = ('base', 'last', 'words', 'deltas', 'outcomes', 'actions', 'blob')
+    TYPECODES = 'IIbB'
+    
+    def __init__(self, base: int):
+        self.base = base
+        self.last = base
+        self.words = array('I')
+        self.deltas = array('I')
+        self.outcomes = array('b')
+        self.actions = array('B')
+        # Encoded form, cached once the segment is full and no longer changes
+        self.blob: Optional[str] = None
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def append(self, word_id: int, timestamp: int, outcome: int, action_id: int):
+        # A clock that went backwards records the entry at the previous time,
+        # keeping times sorted
+        delta = max(0, timestamp - self.last)
+        self.words.append(word_id)
+        self.deltas.append(delta)
+        self.outcomes.append(outcome)
+        self.actions.append(action_id)
+        self.last += delta
+    
+    def times(self) -> List[int]:
+        return list(itertools.accumulate(self.deltas, initial=self.base))[1:]
+    
+    def encode(self) -> str:
+        if self.blob is not None:
+            return self.blob
+        data = _SEGMENT_HEADER.pack(self.base, self.last, len(self)) + _pack(
+            self.words, self.deltas, self.outcomes, self.actions)
+        blob = base64.b64encode(zlib.compress(data)).decode('ascii')
+        if len(self) == SEGMENT_SIZE:
+            self.blob = blob
+        return blob
+    
+    @classmethod
+    def decode(cls, blob: str) -> '_Segment':
+        data = zlib.decompress(base64.b64decode(blob))
+        base, last, count = _SEGMENT_HEADER.unpack_from(data)
+        segment = cls(base)
+        segment.last = last
+        segment.words, segment.deltas, segment.outcomes, segment.actions = _unpack(
+            data[_SEGMENT_HEADER.size:], count, cls.TYPECODES)
+        if count == SEGMENT_SIZE:
+            segment.blob = blob
+        return segment
+
+class _Rollup:
+    """Entry counts per (word, period, action), periods non-decreasing"""
+    __slots__ = ('words', 'periods', 'actions', 'totals', 'correct', 'incorrect', 'blob')
+    TYPECODES = 'IIBIII'
+    
+    def __init__(self):
+        self.words = array('I')
+        self.periods = array('I')
+        self.actions = array('B')
+        self.totals = array('I')
+        self.correct = array('I')
+        self.incorrect = array('I')
+        # Encoded form, cached until the rows change (only on compaction)
+        self.blob: Optional[str] = None
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def columns(self) -> Tuple[array, ...]:
+        return self.words, self.periods, self.actions, self.totals, self.correct, self.incorrect
+    
+    def extend(self, groups: Dict[Tuple[int, int, int], List[int]]):
+        """Append grouped counts keyed (period, word, action), in key order"""
+        self.blob = None
+        for (period, word_id, action_id), (total, correct, incorrect) in sorted(groups.items()):
+            self.words.append(word_id)
+            self.periods.append(period)
+            self.actions.append(action_id)
+            self.totals.append(total)
+            self.correct.append(correct)
+            self.incorrect.append(incorrect)
+    
+    def take(self, first: int, last: int) -> Dict[Tuple[int, int, int], List[int]]:
+        """Remove rows ``first:last``, returning them grouped"""
+        self.blob = None
+        groups: Dict[Tuple[int, int, int], List[int]] = {}
+        rows = zip(*(column[first:last] for column in self.columns()))
+        for word_id, period, action_id, total, correct, incorrect in rows:
+            _add(groups, (period, word_id, action_id), total, correct, incorrect)
+        for column in self.columns():
+            del column[first:last]
+        return groups
+    
+    def counts(self, word_id: Optional[int], action_id: Optional[int],
+               first_period: int, last_period: int) -> List[int]:
+        lo = bisect.bisect_left(self.periods, first_period)
+        hi = bisect.bisect_right(self.periods, last_period)
+        result = [0, 0, 0]
+        for i in range(lo, hi):
+            if (word_id is None or self.words[i] == word_id) and (action_id is None or self.actions[i] == action_id):
+                result[0] += self.totals[i]
+                result[1] += self.correct[i]
+                result[2] += self.incorrect[i]
+        return result
+    
+    def encode(self) -> str:
+        if self.blob is None:
+            data = _ROLLUP_HEADER.pack(len(self)) + _pack(*self.columns())
+            self.blob = base64.b64encode(zlib.compress(data)).decode('ascii')
+        return self.blob
+    
+    @classmethod
+    def decode(cls, blob: str) -> '_Rollup':
+        data = zlib.decompress(base64.b64decode(blob))
+        count, = _ROLLUP_HEADER.unpack_from(data)
+        rollup = cls()
+        (rollup.words, rollup.periods, rollup.actions,
+         rollup.totals, rollup.correct, rollup.incorrect) = _unpack(data[_ROLLUP_HEADER.size:], count, cls.TYPECODES)
+        rollup.blob = blob
+        return rollup
+
+def _add(groups: dict, key: tuple, total: int, correct: int, incorrect: int):
+    counts = groups.get(key)
+    if counts is None:
+        groups[key] = [total, correct, incorrect]
+    else:
+        counts[0] += total
+        counts[1] += correct
+        counts[2] += incorrect
+
+def _bisect_left(count: int, value, key, lo: int = 0) -> int:
+    """First i in lo..count with key(i) >= value, for ascending keys
+    (bisect's own key= argument needs Python 3.10)"""
+    hi = count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key(mid) < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _day_range(start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+    """First and last day overlapping start <= time < end, clamped to the
+    days a date can hold (last < first when no day does)"""
+    first = 0.0 if start is None else min(max(start / SECONDS_PER_DAY, 0.0), float(_LAST_DAY))
+    last = float(_LAST_DAY + 1) if end is None else min(max(end / SECONDS_PER_DAY, 0.0), float(_LAST_DAY + 1))
+    return math.floor(first), math.ceil(last) - 1
+
+def _month_of_day(day: int) -> int:
+    value = date.fromordinal(day + _EPOCH_ORDINAL)
+    return value.year * 12 + value.month - 1
+
+class ReviewLog:
+    """One learner's review and exposure history"""
+    
+    def __init__(self, max_raw_entries: int = 50000, max_daily_rows: int = 20000):
+        if max_raw_entries < SEGMENT_SIZE:
+            raise ValueError(f'max_raw_entries must be at least {SEGMENT_SIZE}')
+        self.max_raw_entries = max_raw_entries
+        self.max_daily_rows = max_daily_rows
+        self._words: List[str] = []
+        self._word_ids: Dict[str, int] = {}
+        self._actions: List[str] = []
+        self._action_ids: Dict[str, int] = {}
+        self._segments: List[_Segment] = []
+        self._open: Optional[_Segment] = None
+        # Sequence number of the first raw entry; segment i starts SEGMENT_SIZE * i later
+        self._first_seq = 0
+        self._raw_count = 0
+        self._positions: Dict[int, array] = {}
+        self._daily = _Rollup()
+        self._monthly = _Rollup()
+        # All-time counts of rolled-up entries, by word and then action
+        self._rolled_totals: Dict[int, Dict[int, List[int]]] = {}
+        self._decoded: 'OrderedDict[int, List[int]]' = OrderedDict()
+        # Entries appended since the log was last encoded
+        self.unsaved = 0
+        # Full segments held as their own items by ``save``: numbers stored_first..stored_end-1
+        self._stored_first = 0
+        self._stored_end = 0
+    
+    def __len__(self) -> int:
+        """Raw entries held (rolled-up entries are only counted)"""
+        return self._raw_count
+    
+    def words(self) -> List[str]:
+        """Words with raw entries"""
+        return [self._words[word_id] for word_id in self._positions]
+    
+    def append(self, word: str, outcome: Optional[bool] = None, action: str = 'review',
+               timestamp: Optional[float] = None):
+        """Record one entry; amortized O(1) including compaction"""
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        word_id = self._word_ids.get(word)
+        if word_id is None:
+            word_id = self._word_ids[word] = len(self._words)
+            self._words.append(word)
+        action_id = self._action_ids.get(action)
+        if action_id is None:
+            if len(self._actions) == 256:
+                raise ValueError('A review log holds at most 256 action types')
+            action_id = self._action_ids[action] = len(self._actions)
+            self._actions.append(action)
+        
+        segment = self._open
+        if segment is None or len(segment.words) == SEGMENT_SIZE:
+            # Deltas carry on from the previous segment's last entry
+            segment = self._open = _Segment(timestamp if segment is None else segment.last)
+            self._segments.append(segment)
+        positions = self._positions.get(word_id)
+        if positions is None:
+            positions = self._positions[word_id] = array('I')
+        positions.append(self._first_seq + self._raw_count)
+        segment.append(word_id, timestamp, NO_OUTCOME if outcome is None else int(bool(outcome)), action_id)
+        self._raw_count += 1
+        self.unsaved += 1
+        
+        if self._raw_count > self.max_raw_entries:
+            self._compact()
+    
+    def for_word(self, word: str, start: Optional[float] = None, end: Optional[float] = None) -> ReviewEntries:
+        """Raw entries for one word, optionally limited to start <= time < end"""
+        word_id = self._word_ids.get(word)
+        positions = self._positions.get(word_id) if word_id is not None else None
+        if not positions:
+            return ReviewEntries([], [], [], [])
+        count = len(positions)
+        lo = 0 if start is None else _bisect_left(count, start, lambda i: self._time_at(positions[i]))
+        hi = count if end is None else _bisect_left(count, end, lambda i: self._time_at(positions[i]), lo)
+        return self._gather(positions[lo:hi])
+    
+    def between(self, start: Optional[float] = None, end: Optional[float] = None) -> ReviewEntries:
+        """Raw entries for every word with start <= time < end"""
+        if not self._segments:
+            return ReviewEntries([], [], [], [])
+        lo = 0 if start is None else self._seq_at_time(start) - self._first_seq
+        hi = self._raw_count if end is None else self._seq_at_time(end) - self._first_seq
+        words, times, outcomes, actions = [], [], [], []
+        # Whole column slices of each segment the range covers
+        for index in range(lo // SEGMENT_SIZE, (max(lo, hi) + SEGMENT_SIZE - 1) // SEGMENT_SIZE):
+            segment = self._segments[index]
+            first = max(lo - index * SEGMENT_SIZE, 0)
+            last = min(hi - index * SEGMENT_SIZE, len(segment))
+            words += map(self._words.__getitem__, segment.words[first:last])
+            times += self._segment_times(index)[first:last]
+            outcomes += segment.outcomes[first:last]
+            actions += map(self._actions.__getitem__, segment.actions[first:last])
+        return ReviewEntries(words, times, outcomes, actions)
+    
+    def counts(self, word: Optional[str] = None, action: Optional[str] = None,
+               start: Optional[float] = None, end: Optional[float] = None) -> ReviewCounts:
+        """Entries and outcomes across all tiers. Rolled-up entries fall in
+        the range by their day or month, raw ones by their exact time."""
+        word_id = self._word_ids.get(word) if word is not None else None
+        action_id = self._action_ids.get(action) if action is not None else None
+        if (word is not None and word_id is None) or (action is not None and action_id is None):
+            return ReviewCounts()
+        
+        if start is None and end is None:
+            # Running totals instead of a scan over every rolled-up row
+            result = [0, 0, 0]
+            by_word = self._rolled_totals.values() if word_id is None else [self._rolled_totals.get(word_id, {})]
+            for by_action in by_word:
+                for rolled_action, totals in by_action.items():
+                    if action_id is None or rolled_action == action_id:
+                        result = [a + b for a, b in zip(result, totals)]
+        else:
+            result = [0, 0, 0]
+            first_day, last_day = _day_range(start, end)
+            if first_day <= last_day:
+                result = self._daily.counts(word_id, action_id, first_day, last_day)
+                first_month = _month_of_day(first_day)
+                last_month = _month_of_day(last_day)
+                for i, value in enumerate(self._monthly.counts(word_id, action_id, first_month, last_month)):
+                    result[i] += value
+        
+        entries = self.for_word(word, start, end) if word is not None else self.between(start, end)
+        for outcome, entry_action in zip(entries.outcomes, entries.actions):
+            if action is None or entry_action == action:
+                result[0] += 1
+                if outcome == 1:
+                    result[1] += 1
+                elif outcome == 0:
+                    result[2] += 1
+        return ReviewCounts(*result)
+    
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and the per-word index"""
+        columns = [column for segment in self._segments
+                   for column in (segment.words, segment.deltas, segment.outcomes, segment.actions)]
+        columns += self._daily.columns() + self._monthly.columns()
+        columns += self._positions.values()
+        return sum(column.itemsize * len(column) for column in columns)
+    
+    def stats(self) -> dict:
+        return {
+            'raw_entries': self._raw_count,
+            'daily_rows': len(self._daily),
+            'monthly_rows': len(self._monthly),
+            'words': len(self._words),
+            'bytes': self.nbytes()
+        }
+    
+    def dumps(self) -> str:
+        """Compact text form for storage; full segments are encoded only once"""
+        self.unsaved = 0
+        return json.dumps({
+            'version': FORMAT_VERSION,
+            'words': self._words,
+            'actions': self._actions,
+            'firstSeq': self._first_seq,
+            'segments': [segment.encode() for segment in self._segments],
+            'daily': self._daily.encode(),
+            'monthly': self._monthly.encode()
+        }, separators=(',', ':'))
+    
+    @classmethod
+    def loads(cls, text: Optional[str], **limits) -> 'ReviewLog':
+        """Log from ``dumps`` output; empty when there is none yet"""
+        if not text:
+            return cls(**limits)
+        data = json.loads(text)
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f'Unsupported review log version: {data.get("version")}')
+        return cls._from_data(data, data['segments'], **limits)
+    
+    def save(self, storage, key: str):
+        """Write the log to ``storage`` (get_item/set_item/remove_item):
+        full segments not written before, the head item, then removal of
+        segments rolled up since the last save"""
+        first = self._first_seq // SEGMENT_SIZE
+        full = len(self._segments)
+        if full and len(self._segments[-1]) < SEGMENT_SIZE:
+            full -= 1
+        for number in range(max(self._stored_end, first), first + full):
+            storage.set_item(f'{key}_{number}', self._segments[number - first].encode())
+        storage.set_item(key, json.dumps({
+            'version': SPLIT_FORMAT_VERSION,
+            'words': self._words,
+            'actions': self._actions,
+            'firstSeq': self._first_seq,
+            'segments': full,
+            'open': self._segments[-1].encode() if full < len(self._segments) else None,
+            'daily': self._daily.encode(),
+            'monthly': self._monthly.encode()
+        }, separators=(',', ':')))
+        for number in range(self._stored_first, min(first, self._stored_end)):
+            storage.remove_item(f'{key}_{number}')
+        self._stored_first, self._stored_end = first, first + full
+        self.unsaved = 0
+    
+    @classmethod
+    def load(cls, storage, key: str, **limits) -> 'ReviewLog':
+        """Log written by ``save`` (or a single ``dumps`` item, which the
+        next save splits up); empty when there is none yet"""
+        text = storage.get_item(key)
+        if not text:
+            return cls(**limits)
+        data = json.loads(text)
+        if data.get('version') == FORMAT_VERSION:
+            return cls._from_data(data, data['segments'], **limits)
+        if data.get('version') != SPLIT_FORMAT_VERSION:
+            raise ValueError(f'Unsupported review log version: {data.get("version")}')
+        first = data['firstSeq'] // SEGMENT_SIZE
+        numbers = range(first, first + data['segments'])
+        blobs = [storage.get_item(f'{key}_{number}') for number in numbers]
+        if None in blobs:
+            raise ValueError(f'Review log segment {key}_{numbers[blobs.index(None)]} is missing')
+        if data['open'] is not None:
+            blobs.append(data['open'])
+        log = cls._from_data(data, blobs, **limits)
+        # Compaction on load drops segments; they are removed on the next save
+        log._stored_first, log._stored_end = numbers.start, numbers.stop
+        return log
+    
+    @classmethod
+    def _from_data(cls, data: dict, blobs: List[str], **limits) -> 'ReviewLog':
+        log = cls(**limits)
+        log._words = data['words']
+        log._word_ids = {word: i for i, word in enumerate(log._words)}
+        log._actions = data['actions']
+        log._action_ids = {action: i for i, action in enumerate(log._actions)}
+        log._first_seq = data['firstSeq']
+        log._segments = [_Segment.decode(blob) for blob in blobs]
+        log._daily = _Rollup.decode(data['daily'])
+        log._monthly = _Rollup.decode(data['monthly'])
+        for rollup in (log._daily, log._monthly):
+            log._add_rolled_totals({
+                (i, word_id, action_id): [total, correct, incorrect]
+                for i, (word_id, action_id, total, correct, incorrect) in enumerate(zip(
+                    rollup.words, rollup.actions, rollup.totals, rollup.correct, rollup.incorrect))
+            })
+        log._open = log._segments[-1] if log._segments else None
+        seq = log._first_seq
+        for segment in log._segments:
+            for word_id in segment.words:
+                positions = log._positions.get(word_id)
+                if positions is None:
+                    positions = log._positions[word_id] = array('I')
+                positions.append(seq)
+                seq += 1
+        log._raw_count = seq - log._first_seq
+        if log._raw_count > log.max_raw_entries:
+            log._compact()
+        return log
+    
+    def _gather(self, seqs) -> ReviewEntries:
+        words, times, outcomes, actions = [], [], [], []
+        for seq in seqs:
+            index, offset = divmod(seq - self._first_seq, SEGMENT_SIZE)
+            segment = self._segments[index]
+            words.append(self._words[segment.words[offset]])
+            times.append(self._segment_times(index)[offset])
+            outcomes.append(segment.outcomes[offset])
+            actions.append(self._actions[segment.actions[offset]])
+        return ReviewEntries(words, times, outcomes, actions)
+    
+    def _time_at(self, seq: int) -> int:
+        index, offset = divmod(seq - self._first_seq, SEGMENT_SIZE)
+        return self._segment_times(index)[offset]
+    
+    def _seq_at_time(self, timestamp: float) -> int:
+        """First sequence number whose time is >= timestamp"""
+        segments = self._segments
+        index = _bisect_left(len(segments), timestamp, lambda i: segments[i].last)
+        if index == len(segments):
+            return self._first_seq + self._raw_count
+        offset = bisect.bisect_left(self._segment_times(index), timestamp)
+        return self._first_seq + SEGMENT_SIZE * index + offset
+    
+    def _segment_times(self, index: int) -> List[int]:
+        segment = self._segments[index]
+        if len(segment) < SEGMENT_SIZE:
+            # The open segment still grows; decoding up to 1024 deltas is cheap
+            return segment.times()
+        key = self._first_seq + SEGMENT_SIZE * index
+        times = self._decoded.get(key)
+        if times is None:
+            times = self._decoded[key] = segment.times()
+            if len(self._decoded) > 16:
+                self._decoded.popitem(last=False)
+        else:
+            self._decoded.move_to_end(key)
+        return times
+    
+    def _add_rolled_totals(self, groups: Dict[Tuple[int, int, int], List[int]]):
+        for (_, word_id, action_id), counts in groups.items():
+            by_action = self._rolled_totals.get(word_id)
+            if by_action is None:
+                by_action = self._rolled_totals[word_id] = {}
+            _add(by_action, action_id, *counts)
+    
+    def _compact(self):
+        """Roll the oldest full segments up into daily counts, and the oldest
+        daily counts into monthly ones"""
+        while self._raw_count > self.max_raw_entries and len(self._segments) > 1:
+            segment = self._segments.pop(0)
+            self._decoded.pop(self._first_seq, None)
+            groups: Dict[Tuple[int, int, int], List[int]] = {}
+            for word_id, timestamp, outcome, action_id in zip(
+                    segment.words, segment.times(), segment.outcomes, segment.actions):
+                _add(groups, (timestamp // SECONDS_PER_DAY, word_id, action_id),
+                     1, int(outcome == 1), int(outcome == 0))
+            self._daily.extend(groups)
+            self._add_rolled_totals(groups)
+            
+            self._first_seq += SEGMENT_SIZE
+            self._raw_count -= len(segment)
+            for word_id in set(segment.words):
+                positions = self._positions[word_id]
+                del positions[:bisect.bisect_left(positions, self._first_seq)]
+                if not positions:
+                    del self._positions[word_id]
+        
+        while len(self._daily) > self.max_daily_rows:
+            # Oldest half, whole days only, merged into the monthly tier
+            cut = bisect.bisect_left(self._daily.periods, self._daily.periods[len(self._daily) // 2])
+            cut = cut or max(1, len(self._daily) // 2)
+            rolled = self._daily.take(0, cut)
+            # Rolled days are never older than the newest month, the only one to merge with
+            first_month = _month_of_day(min(day for day, _, _ in rolled))
+            periods = self._monthly.periods
+            monthly = self._monthly.take(bisect.bisect_left(periods, first_month), len(periods))
+            for (day, word_id, action_id), counts in rolled.items():
+                _add(monthly, (_month_of_day(day), word_id, action_id), *counts)
+            self._monthly.extend(monthly)
+
+def _benchmark(entries: int = 1000000, words: int = 3000):
+    """Appends, memory and slicing for a year of reviews: the log vs a plain
+    list of entry tuples"""
+    import random
+    import tracemalloc
+    
+    rng = random.Random(1)
+    start = 1767225600  # 2026-01-01
+    step = 365 * SECONDS_PER_DAY // entries
+    stream = [(f'word{rng.randrange(words)}', rng.random() < 0.8, 'review' if rng.random() < 0.5 else 'exposure',
+               start + i * step) for i in range(entries)]
+    
+    started = time.perf_counter()
+    log = ReviewLog()
+    for word, outcome, action, timestamp in stream:
+        log.append(word, outcome, action, timestamp)
+    append_us = (time.perf_counter() - started) * 1e6 / entries
+    text = log.dumps()
+    
+    # Memory of the same state, rebuilt from storage while tracing
+    tracemalloc.start()
+    restored = ReviewLog.loads(text)
+    log_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    tracemalloc.start()
+    naive = [(word, timestamp, int(outcome), action) for word, outcome, action, timestamp in stream]
+    naive_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    def best(fn, repeats: int = 5) -> float:
+        timings = []
+        for _ in range(repeats):
+            began = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - began)
+        return min(timings) * 1000
+    
+    recent = stream[-1][3] - 7 * SECONDS_PER_DAY
+    word = stream[-1][0]
+    print(f'{entries} entries over {words} words, {log.max_raw_entries} kept raw: {log.stats()}')
+    print(f'append {append_us:.2f} us/entry; memory {log_bytes / 2**20:.1f} MiB (naive tuples held raw: '
+          f'{naive_bytes / 2**20:.1f} MiB); stored {len(text) / 2**10:.0f} KiB')
+    print(f"{'query':<28}{'log ms':>9}{'scan ms':>9}")
+    queries = [
+        ('one word, all raw', lambda: log.for_word(word),
+         lambda: [e for e in naive[-log.max_raw_entries:] if e[0] == word]),
+        ('one word, last 7 days', lambda: log.for_word(word, recent),
+         lambda: [e for e in naive if e[0] == word and e[1] >= recent]),
+        ('all words, last 7 days', lambda: log.between(recent),
+         lambda: [e for e in naive if e[1] >= recent]),
+        ('counts for one word, all', lambda: log.counts(word),
+         lambda: sum(1 for e in naive if e[0] == word))
+    ]
+    for label, fast, scan in queries:
+        print(f'{label:<28}{best(fast):>9.3f}{best(scan):>9.1f}')
+    if log.counts(word).total != sum(1 for e in naive if e[0] == word):
+        raise AssertionError('rolled-up counts do not match the entries appended')
+    if restored.between(recent) != log.between(recent) or restored.counts(word) != log.counts(word):
+        raise AssertionError('stored log does not round-trip')
+
+if __name__ == '__main__':
+    _benchmark()
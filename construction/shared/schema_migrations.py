@@ -0,0 +1,50 @@
+"""
+Ordered, versioned migration steps for stored records
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+MigrationStep = Callable[[dict], dict]
+
+class MigrationChain:
+    """Upgrades records from any stored schema version to the current one.
+
+    Steps are registered as ``(version, step)``; a step upgrades a record
+    from ``version - 1`` to ``version``. Stores keep a version marker so the
+    chain only runs for data written before the latest step, and only for the
+    records actually touched.
+    """
+    
+    def __init__(self, steps: List[Tuple[int, MigrationStep]], base_version: int = 1):
+        self._steps = sorted(steps, key=lambda step: step[0])
+        self.base_version = base_version
+        self.current_version = self._steps[-1][0] if self._steps else base_version
+    
+    def needs_upgrade(self, version: int) -> bool:
+        return version < self.current_version
+    
+    def upgrade(self, record: dict, from_version: int) -> dict:
+        """Apply every step newer than ``from_version`` to a record in place"""
+        for version, step in self._steps:
+            if version > from_version:
+                record = step(record)
+        return record
+    
+    def upgrade_all(self, records: Dict[str, dict], from_version: int) -> Dict[str, dict]:
+        if not self.needs_upgrade(from_version):
+            return records
+        for key, record in records.items():
+            records[key] = self.upgrade(record, from_version)
+        return records
+    
+    def parse_version(self, marker: Optional[str], has_data: bool) -> int:
+        """Interpret a stored version marker.
+
+        A missing marker means legacy data (base version) when records exist,
+        or a fresh store that can start at the current version.
+        """
+        if marker is None:
+            return self.base_version if has_data else self.current_version
+        try:
+            return int(float(marker))
+        except (TypeError, ValueError):
+            return self.base_version
@@ -0,0 +1,214 @@
+"""
+JSON serialization backends and generated record codecs
+
+dumps/loads use the fastest JSON library installed (orjson, then msgspec,
+then the standard library). Whatever the backend, dumps returns the same
+text as json.dumps(value, separators=(',', ':')) for strings, integers,
+booleans and null: ASCII-only, compact, key order kept. Values a fast
+backend cannot encode (non-string keys, integers beyond 64 bits) fall back
+to the standard library. Floats parse back to the same value but may be
+spelled differently (1e16 vs 1e+16), and fast backends write NaN and
+Infinity as null; progress records hold no floats.
+
+compile_record_codec generates straight-line to_dict/from_dict functions
+for a dataclass, replacing hand-written dict literals and .get chains.
+"""
+import json
+import re
+from dataclasses import MISSING, fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class JsonBackend:
+    """Standard library backend; the reference output for all others"""
+    name = 'json'
+    
+    def __init__(self):
+        self._encoder = json.JSONEncoder(separators=(',', ':'))
+    
+    def dumps(self, value: Any) -> str:
+        return self._encoder.encode(value)
+    
+    def loads(self, text) -> Any:
+        return json.loads(text)
+
+# Characters json.dumps escapes with ensure_ascii that fast encoders write raw
+_NOT_ASCII_PRINTABLE = re.compile(r'[^\x00-\x7e]')
+
+def _escape_char(match) -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f'\\u{code:04x}'
+    code -= 0x10000
+    return f'\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}'
+
+class _FastJsonBackend(JsonBackend):
+    """Encodes with a native library, then escapes what it writes raw but
+    the standard library escapes (anything outside printable ASCII)"""
+    
+    def __init__(self, encode: Callable[[Any], bytes], decode: Callable[[Any], Any],
+                 errors: Tuple[type, ...]):
+        super().__init__()
+        self._encode = encode
+        self._decode = decode
+        self._errors = errors
+    
+    def dumps(self, value: Any) -> str:
+        try:
+            text = self._encode(value).decode('utf-8')
+        except self._errors:
+            return super().dumps(value)
+        if not text.isascii() or '\x7f' in text:
+            text = _NOT_ASCII_PRINTABLE.sub(_escape_char, text)
+        return text
+    
+    def loads(self, text) -> Any:
+        try:
+            return self._decode(text)
+        except ValueError:
+            # NaN, huge integers and similar that only the stdlib accepts
+            return json.loads(text)
+
+class OrjsonBackend(_FastJsonBackend):
+    name = 'orjson'
+    
+    def __init__(self):
+        import orjson
+        super().__init__(orjson.dumps, orjson.loads, (TypeError,))
+
+class MsgspecBackend(_FastJsonBackend):
+    name = 'msgspec'
+    
+    def __init__(self):
+        import msgspec
+        super().__init__(msgspec.json.encode, msgspec.json.decode, (TypeError, OverflowError))
+
+BACKEND_PREFERENCE = (OrjsonBackend, MsgspecBackend, JsonBackend)
+
+def available_backends() -> List[JsonBackend]:
+    """Every backend that can be constructed here, fastest first"""
+    backends = []
+    for backend_class in BACKEND_PREFERENCE:
+        try:
+            backends.append(backend_class())
+        except ImportError:
+            continue
+    return backends
+
+_backend: JsonBackend = available_backends()[0]
+
+def get_backend() -> JsonBackend:
+    return _backend
+
+def set_backend(name: str) -> JsonBackend:
+    """Switch the process-wide backend, e.g. to 'json' to compare"""
+    global _backend
+    for backend in available_backends():
+        if backend.name == name:
+            _backend = backend
+            return backend
+    raise ValueError(f"Serialization backend '{name}' is not available")
+
+def dumps(value: Any) -> str:
+    return _backend.dumps(value)
+
+def loads(text) -> Any:
+    return _backend.loads(text)
+
+def camel_case(name: str) -> str:
+    head, *rest = name.split('_')
+    return head + ''.join(part.capitalize() for part in rest)
+
+class RecordCodec:
+    """Generated converters between a dataclass and its stored dict.
+
+    ``encode(obj)`` returns the stored dict. ``decode(data)`` builds an
+    instance, or ``decode(key, data)`` when the record's ``key_attr`` comes
+    from the map key instead of the dict. ``decode_map`` does the latter for
+    a whole ``{key: data}`` map in one generated loop.
+    """
+    
+    def __init__(self, cls: type, source: str, namespace: Dict[str, Any]):
+        self.cls = cls
+        self.source = source
+        exec(source, namespace)
+        self.encode: Callable[[Any], dict] = namespace['encode']
+        self.decode: Callable[..., Any] = namespace['decode']
+        self.decode_map: Optional[Callable[[Dict[str, dict]], Dict[str, Any]]] = namespace.get('decode_map')
+
+def compile_record_codec(cls: type, rename: Callable[[str], str] = lambda name: name,
+                         key_attr: Optional[str] = None,
+                         converters: Optional[Dict[str, Tuple[Callable, Callable]]] = None) -> RecordCodec:
+    """Generate a RecordCodec for dataclass ``cls``.
+
+    Stored keys are ``rename(attribute)``. Missing keys take the dataclass
+    default (calling a default factory only when needed); fields without a
+    default are required. ``converters`` maps an attribute to
+    ``(to_stored, from_stored)`` callables, applied only to present values.
+    """
+    if not is_dataclass(cls):
+        raise TypeError(f'{cls.__name__} is not a dataclass')
+    converters = converters or {}
+    namespace: Dict[str, Any] = {'_cls': cls, '_new': object.__new__}
+    record_fields = [field for field in fields(cls) if field.init]
+    # Instances are built by filling __dict__ directly when __init__ does
+    # nothing beyond assigning fields
+    direct = (len(record_fields) == len(fields(cls))
+              and not hasattr(cls, '__post_init__') and not hasattr(cls, '__slots__'))
+    
+    encode_items, decode_items = [], []
+    for field in record_fields:
+        attr, key = field.name, rename(field.name)
+        source = f'd[{attr!r}]' if direct else f'obj.{attr}'
+        if attr in converters:
+            namespace[f'_to_{attr}'], namespace[f'_from_{attr}'] = converters[attr]
+            source = f'_to_{attr}({source})'
+        encode_items.append(f'{key!r}: {source}')
+        
+        if attr == key_attr:
+            value = 'key'
+        elif attr in converters:
+            present = f'_from_{attr}(data[{key!r}])'
+            value = present if field.default is MISSING and field.default_factory is MISSING \
+                else f'({present} if {key!r} in data else {_default(namespace, field)})'
+        elif field.default is not MISSING:
+            namespace[f'_default_{attr}'] = field.default
+            value = f'get({key!r}, _default_{attr})'
+        elif field.default_factory is not MISSING:
+            value = f'(data[{key!r}] if {key!r} in data else {_default(namespace, field)})'
+        else:
+            value = f'data[{key!r}]'
+        decode_items.append((attr, value))
+    
+    if direct:
+        build = ['obj = _new(_cls)', 'obj.__dict__ = {' + ', '.join(f'{attr!r}: {value}' for attr, value in decode_items) + '}']
+    else:
+        build = ['obj = _cls(' + ', '.join(f'{attr}={value}' for attr, value in decode_items) + ')']
+    source = [
+        'def encode(obj):',
+        *(['    d = obj.__dict__'] if direct else []),
+        '    return {' + ', '.join(encode_items) + '}',
+        '',
+        f"def decode({'key, ' if key_attr else ''}data):",
+        '    get = data.get',
+        *(f'    {line}' for line in build),
+        '    return obj'
+    ]
+    if key_attr:
+        source += [
+            '',
+            'def decode_map(items):',
+            '    result = {}',
+            '    for key, data in items.items():',
+            '        get = data.get',
+            *(f'        {line}' for line in build),
+            '        result[key] = obj',
+            '    return result'
+        ]
+    return RecordCodec(cls, '\n'.join(source) + '\n', namespace)
+
+def _default(namespace: Dict[str, Any], field) -> str:
+    if field.default is not MISSING:
+        namespace[f'_default_{field.name}'] = field.default
+        return f'_default_{field.name}'
+    namespace[f'_factory_{field.name}'] = field.default_factory
+    return f'_factory_{field.name}()'
@@ -0,0 +1,131 @@
+"""
+Sharded on-disk layout for per-user data
+
+Each learner's files go under ``<root>/<aa>/`` where ``aa`` are the first
+hex digits of a stable hash of the user key. Learners spread evenly over
+the 256 shards, so a directory holds about 1/256th of them (another level,
+``levels=2``, for millions of learners) and lookups, listings and backups
+do not degrade with one huge directory. Files from the old flat layout (``<root>/<user>.json``)
+are still found and can be moved into their shards with ``migrate_flat``.
+"""
+import hashlib
+import os
+from typing import Iterator, Optional
+
+class ShardedLayout:
+    """Maps user keys to sharded paths below ``root``"""
+    
+    def __init__(self, root: str, levels: int = 1, width: int = 2):
+        if levels < 1 or width < 1 or levels * width > 16:
+            raise ValueError('levels * width must be between 1 and 16 hex digits')
+        self.root = root
+        self.levels = levels
+        self.width = width
+        os.makedirs(root, exist_ok=True)
+    
+    def shard_of(self, user_key: str) -> str:
+        """Relative shard directory, e.g. '3f'; stable across processes"""
+        digest = hashlib.blake2b(user_key.encode('utf-8'), digest_size=8).hexdigest()
+        return os.path.join(*(digest[i * self.width:(i + 1) * self.width] for i in range(self.levels)))
+    
+    def shard_dir(self, user_key: str, create: bool = False) -> str:
+        path = os.path.join(self.root, self.shard_of(user_key))
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+    
+    def user_path(self, user_key: str, suffix: str = '.json', create: bool = False) -> str:
+        """File holding one user's data, e.g. a serialized store"""
+        return os.path.join(self.shard_dir(user_key, create), user_key + suffix)
+    
+    def legacy_path(self, user_key: str, suffix: str = '.json') -> str:
+        return os.path.join(self.root, user_key + suffix)
+    
+    def existing_path(self, user_key: str, suffix: str = '.json') -> Optional[str]:
+        """Sharded file if present, else a legacy flat file, else None"""
+        path = self.user_path(user_key, suffix)
+        if os.path.exists(path):
+            return path
+        legacy = self.legacy_path(user_key, suffix)
+        return legacy if os.path.exists(legacy) else None
+    
+    def users(self, suffix: str = '.json') -> Iterator[str]:
+        """User keys with a file in the layout (sharded or legacy), each once.
+
+        A learner can have both files if a save was interrupted between
+        writing the sharded file and removing the legacy one;
+        ``existing_path`` then picks the sharded file.
+        """
+        seen = set()
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(suffix):
+                    user_key = name[:-len(suffix)]
+                    if user_key not in seen:
+                        seen.add(user_key)
+                        yield user_key
+    
+    def migrate_flat(self, suffix: str = '.json') -> int:
+        """Move legacy flat files into their shards; returns how many moved"""
+        moved = 0
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    user_key = entry.name[:-len(suffix)]
+                    os.replace(entry.path, self.user_path(user_key, suffix, create=True))
+                    moved += 1
+        return moved
+
+def _benchmark(counts=(1000, 10000, 100000), operations: int = 2000):
+    """Per-user read + atomic rewrite latency as the number of learners grows,
+    flat directory vs sharded layout"""
+    import random
+    import tempfile
+    import time
+    
+    payload = '{"learningProgress":"{}","learningProgressVersion":"3"}'
+    
+    def write(path: str):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    
+    def read(path: str):
+        with open(path, 'r', encoding='utf-8') as f:
+            f.read()
+    
+    print(f"{'learners':>9}  {'layout':<8}{'p50 us':>9}{'p99 us':>9}{'list ms':>10}{'max entries/dir':>17}")
+    for count in counts:
+        users = [f'user{i}' for i in range(count)]
+        with tempfile.TemporaryDirectory() as directory:
+            flat_root = os.path.join(directory, 'flat')
+            os.makedirs(flat_root)
+            layout = ShardedLayout(os.path.join(directory, 'sharded'))
+            paths = {
+                'flat': lambda user_key: os.path.join(flat_root, user_key + '.json'),
+                'sharded': lambda user_key: layout.user_path(user_key, create=True)
+            }
+            for name, path_of in paths.items():
+                for user_key in users:
+                    write(path_of(user_key))
+                
+                rng = random.Random(1)
+                timings = []
+                for _ in range(operations):
+                    path = path_of(rng.choice(users))
+                    started = time.perf_counter()
+                    read(path)
+                    write(path)
+                    timings.append(time.perf_counter() - started)
+                timings.sort()
+                
+                root = flat_root if name == 'flat' else layout.root
+                started = time.perf_counter()
+                widest = max(len(files) + len(dirs) for _, dirs, files in os.walk(root))
+                list_ms = (time.perf_counter() - started) * 1000
+                print(f'{count:>9}  {name:<8}{timings[len(timings) // 2] * 1e6:>9.0f}'
+                      f'{timings[int(len(timings) * 0.99)] * 1e6:>9.0f}{list_ms:>10.1f}{widest:>17}')
+
+if __name__ == '__main__':
+    _benchmark()
@@ -0,0 +1,454 @@
+"""
+Storage codecs for large JSON blobs kept in localStorage
+
+An encoded value starts with a header naming its codec, e.g. ``@columnar1:``
+or ``@zlib1:``, and readers dispatch on it. A value without a header is
+plain JSON, which is what every blob written before codecs existed looks
+like, so old data keeps loading. JSON text can never start with ``@``.
+
+Codecs:
+    json        plain compact JSON, no header (the legacy layout)
+    columnar1   map of records stored as columns; field names written once,
+                repetitive strings dictionary-encoded, ISO timestamps split
+                into a shared date part and a time suffix, booleans as bits
+    zlib1       any inner codec deflated with a trained preset dictionary
+                (checked in as zlib1_default.dict), base64 text so it fits a
+                string-only store
+
+Benchmark every codec from the construction directory with:
+    python -m shared.storage_codec [--records 40 3000 100000]
+"""
+import argparse
+import base64
+import binascii
+import os
+import re
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .lazy_record_map import LazyRecordMap
+from .serialization import dumps, loads
+
+HEADER_MARK = '@'
+
+class CodecError(ValueError):
+    """An encoded value could not be decoded"""
+
+class StorageCodec(ABC):
+    """Turns a JSON-compatible value into a string and back.
+
+    Subclasses implement ``_encode_body`` and ``_decode_body``; the header
+    is added and checked here.
+    """
+    name = ''
+    
+    def encode(self, value: Any) -> str:
+        if isinstance(value, LazyRecordMap):
+            value = dict(value.items())
+        return f'{HEADER_MARK}{self.name}:{self._encode_body(value)}'
+    
+    def decode(self, text: str) -> Any:
+        name, body = split_header(text)
+        if name != self.name:
+            raise CodecError(f"Value was written by codec '{name}', not '{self.name}'")
+        return self._decode_body(body)
+    
+    @abstractmethod
+    def _encode_body(self, value: Any) -> str:
+        ...
+    
+    @abstractmethod
+    def _decode_body(self, body: str) -> Any:
+        ...
+
+class PlainJsonCodec(StorageCodec):
+    """Compact JSON without a header, readable by code that predates codecs"""
+    name = 'json'
+    
+    def encode(self, value: Any) -> str:
+        if isinstance(value, LazyRecordMap):
+            # Splices pending changes into the text it was opened from
+            return value.dumps()
+        return dumps(value)
+    
+    def decode(self, text: str) -> Any:
+        return loads(text)
+    
+    def _encode_body(self, value: Any) -> str:
+        return dumps(value)
+    
+    def _decode_body(self, body: str) -> Any:
+        return loads(body)
+
+class ColumnarJsonCodec(StorageCodec):
+    """Stores a map (or list) of flat records as one JSON object of columns.
+
+    Layout: ``{"n": keys, "f": fields, "c": columns, "a": absent}`` where
+    ``n`` is omitted for a list and ``a`` maps a field index to the rows
+    that lack that field. A list of records without any fields stores its
+    length as ``r``. A column is either a plain list or a tagged dict:
+        {"k": "d", "d": distinct values, "i": index per row}
+        {"k": "t", "d": distinct dates, "i": date index, "s": time suffixes}
+        {"k": "b", "v": "0110..."}
+    Values that are not collections of records are stored as ``{"v": value}``.
+    """
+    name = 'columnar1'
+    
+    # A string column is dictionary-encoded when distinct values are at most
+    # this share of the rows
+    DICTIONARY_RATIO = 0.5
+    
+    _TIMESTAMP = re.compile(r'\d{4}-\d{2}-\d{2}T')
+    
+    def _encode_body(self, value: Any) -> str:
+        return dumps(self.to_columns(value))
+    
+    def _decode_body(self, body: str) -> Any:
+        return self.from_columns(loads(body))
+    
+    def to_columns(self, value: Any) -> dict:
+        if isinstance(value, dict) and value and all(type(record) is dict for record in value.values()):
+            keys, records = list(value), list(value.values())
+        elif isinstance(value, list) and value and all(type(record) is dict for record in value):
+            keys, records = None, value
+        else:
+            return {'v': value}
+        
+        fields: Dict[str, int] = {}
+        for record in records:
+            for field_name in record:
+                if field_name not in fields:
+                    fields[field_name] = len(fields)
+        
+        columns, absent = [], {}
+        for field_name, index in fields.items():
+            missing = [row for row, record in enumerate(records) if field_name not in record]
+            if missing:
+                absent[str(index)] = missing
+            columns.append(self._encode_column([record.get(field_name) for record in records]))
+        
+        layout = {'f': list(fields), 'c': columns}
+        if keys is not None:
+            layout['n'] = keys
+        elif not fields:
+            layout['r'] = len(records)
+        if absent:
+            layout['a'] = absent
+        return layout
+    
+    def from_columns(self, layout: dict) -> Any:
+        if 'v' in layout:
+            return layout['v']
+        fields = layout['f']
+        columns = [self._decode_column(column) for column in layout['c']]
+        if columns:
+            records = [dict(zip(fields, row)) for row in zip(*columns)]
+        else:
+            # Only empty records: the row count comes from the keys
+            count = len(layout['n']) if 'n' in layout else layout.get('r', 0)
+            records = [{} for _ in range(count)]
+        for index, missing in layout.get('a', {}).items():
+            field_name = fields[int(index)]
+            for row in missing:
+                del records[row][field_name]
+        if 'n' in layout:
+            return dict(zip(layout['n'], records))
+        return records
+    
+    def _encode_column(self, values: List[Any]):
+        kinds = {type(value) for value in values}
+        if kinds == {bool}:
+            return {'k': 'b', 'v': ''.join('1' if value else '0' for value in values)}
+        if not kinds <= {str, type(None)}:
+            return values
+        
+        strings = [value for value in values if value is not None]
+        if strings and len(strings) == len(values) and all(self._TIMESTAMP.match(value) for value in strings):
+            dates: Dict[str, int] = {}
+            indexes, suffixes = [], []
+            for value in strings:
+                indexes.append(dates.setdefault(value[:10], len(dates)))
+                suffixes.append(value[10:])
+            if len(dates) <= len(values) * self.DICTIONARY_RATIO:
+                return {'k': 't', 'd': list(dates), 'i': indexes, 's': suffixes}
+        
+        distinct: Dict[Any, int] = {}
+        indexes = [distinct.setdefault(value, len(distinct)) for value in values]
+        if len(distinct) <= len(values) * self.DICTIONARY_RATIO:
+            return {'k': 'd', 'd': list(distinct), 'i': indexes}
+        return values
+    
+    @staticmethod
+    def _decode_column(column) -> List[Any]:
+        if isinstance(column, list):
+            return column
+        kind = column['k']
+        if kind == 'b':
+            return [flag == '1' for flag in column['v']]
+        if kind == 'd':
+            distinct = column['d']
+            return [distinct[index] for index in column['i']]
+        if kind == 't':
+            dates = column['d']
+            return [dates[index] + suffix for index, suffix in zip(column['i'], column['s'])]
+        raise CodecError(f"Unknown column kind '{kind}'")
+
+class ZlibCodec(StorageCodec):
+    """Deflates the output of ``inner`` using an optional preset dictionary.
+
+    Body: ``<dictionary id>:<base64 deflate stream>``. The id is the CRC32
+    of the dictionary (empty when none is used) and must be registered with
+    ``register_dictionary`` wherever the value is decoded; the default
+    dictionary registers itself the first time it is needed. ``dictionary``
+    may be a function returning the bytes, called on first encode, so
+    building it costs nothing at import.
+    """
+    
+    def __init__(self, inner: Optional[StorageCodec] = None,
+                 dictionary: Union[bytes, Callable[[], bytes], None] = None,
+                 level: int = 6, name: str = 'zlib1'):
+        self.name = name
+        self.inner = inner or PlainJsonCodec()
+        self._dictionary = dictionary
+        self._dictionary_id: Optional[str] = None
+        self.level = level
+    
+    @property
+    def dictionary(self) -> Optional[bytes]:
+        if callable(self._dictionary):
+            self._dictionary = self._dictionary()
+        return self._dictionary
+    
+    @property
+    def dictionary_id(self) -> str:
+        if self._dictionary_id is None:
+            dictionary = self.dictionary
+            self._dictionary_id = register_dictionary(dictionary) if dictionary else ''
+        return self._dictionary_id
+    
+    def _encode_body(self, value: Any) -> str:
+        if self.dictionary:
+            compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(self.level)
+        data = compressor.compress(self.inner.encode(value).encode('utf-8')) + compressor.flush()
+        return f"{self.dictionary_id}:{base64.b64encode(data).decode('ascii')}"
+    
+    def _decode_body(self, body: str) -> Any:
+        dictionary_id, _, payload = body.partition(':')
+        try:
+            data = base64.b64decode(payload, validate=True)
+            if dictionary_id:
+                if dictionary_id not in _DICTIONARIES:
+                    # Values written with the default dictionary before this
+                    # process loaded it
+                    default_dictionary()
+                if dictionary_id not in _DICTIONARIES:
+                    raise CodecError(f"Unknown zlib dictionary '{dictionary_id}'")
+                decompressor = zlib.decompressobj(zdict=_DICTIONARIES[dictionary_id])
+            else:
+                decompressor = zlib.decompressobj()
+            text = (decompressor.decompress(data) + decompressor.flush()).decode('utf-8')
+        except (binascii.Error, zlib.error, UnicodeDecodeError) as error:
+            raise CodecError(f'Corrupt zlib payload: {error}') from error
+        # The inner value carries its own header (or none, for plain JSON)
+        return decode(text)
+
+_DICTIONARIES: Dict[str, bytes] = {}
+
+def register_dictionary(dictionary: bytes) -> str:
+    """Make a preset dictionary available to decoders; returns its id"""
+    dictionary_id = f'{zlib.crc32(dictionary):08x}'
+    _DICTIONARIES[dictionary_id] = dictionary
+    return dictionary_id
+
+_TOKEN = re.compile(r'"[^"]{0,40}"\s*:?|-?\d+(?:\.\d+)?|true|false|null|[{}\[\],]')
+
+def train_dictionary(samples: Iterable[str], size: int = 16 * 1024, max_run: int = 4) -> bytes:
+    """Build a preset dictionary from representative encoded values.
+
+    Counts runs of up to ``max_run`` consecutive JSON tokens, scores each by
+    occurrences x length and packs the best runs until ``size`` bytes,
+    highest scoring last (deflate reaches the end of the dictionary with the
+    shortest distances).
+    """
+    counts: Counter = Counter()
+    for sample in samples:
+        tokens = _TOKEN.findall(sample)
+        for run in range(1, max_run + 1):
+            for start in range(len(tokens) - run + 1):
+                counts[''.join(tokens[start:start + run])] += 1
+    
+    scored = sorted(
+        ((count * len(segment), segment) for segment, count in counts.items()
+         if count > 1 and len(segment) > 3),
+        reverse=True
+    )
+    chosen: List[str] = []
+    used = 0
+    for _, segment in scored:
+        if used + len(segment) > size:
+            continue
+        if any(segment in other for other in chosen):
+            continue
+        chosen.append(segment)
+        used += len(segment)
+    return ''.join(reversed(chosen)).encode('utf-8')
+
+def _dictionary_samples() -> List[str]:
+    """Deterministic progress maps in the unit 1 and unit 4 record shapes,
+    the samples the checked-in default dictionary was trained on"""
+    categories = ['daily life', 'travel', 'business', 'academic', 'emotions', 'food', 'technology', 'nature']
+    statuses = ['new', 'learning', 'reviewing', 'mastered']
+    camel, snake = {}, {}
+    for i in range(400):
+        day = f'2025-{1 + i % 12:02d}-{1 + i % 28:02d}'
+        camel[f'word{i}'] = {
+            'word': f'word{i}', 'category': categories[i % 8], 'isLearned': i % 3 == 0,
+            'status': statuses[i % 4], 'createdDate': f'{day}T{i % 24:02d}:{i % 60:02d}:00.000000',
+            'exposuresToday': i % 4, 'lastExposureTime': f'{day}T09:{i % 60:02d}:12.345678',
+            'nextAllowedTime': f'{day}T10:{i % 60:02d}:12.345678', 'reviewCount': i % 12,
+            'nextReviewDate': day, 'lastPlayedDate': day if i % 2 else None,
+            'isMastered': i % 7 == 0, 'retired': i % 11 == 0
+        }
+        snake[f'word{i}'] = {
+            'word': f'word{i}', 'category': categories[i % 8], 'is_learned': i % 3 == 0,
+            'review_count': i % 12, 'last_played_date': day, 'status': statuses[i % 4],
+            'next_review_date': day, 'created_date': f'{day}T08:00:00', 'type': None,
+            'retired_date': None
+        }
+    return [dumps(camel), dumps(snake)]
+
+# The default dictionary is checked in rather than trained at run time: its
+# id is written into every zlib1 value, so its bytes must never change. A
+# retrained dictionary goes in a new file with a new id, and the old one
+# stays registered so existing values still decode.
+DEFAULT_DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zlib1_default.dict')
+DEFAULT_DICTIONARY_ID = 'c42de4f0'
+
+_DEFAULT_DICTIONARY: Optional[bytes] = None
+
+def default_dictionary() -> bytes:
+    global _DEFAULT_DICTIONARY
+    if _DEFAULT_DICTIONARY is None:
+        with open(DEFAULT_DICTIONARY_PATH, 'rb') as f:
+            dictionary = f.read()
+        dictionary_id = register_dictionary(dictionary)
+        if dictionary_id != DEFAULT_DICTIONARY_ID:
+            del _DICTIONARIES[dictionary_id]
+            raise CodecError(f"Default zlib dictionary has id '{dictionary_id}', "
+                             f"expected '{DEFAULT_DICTIONARY_ID}'")
+        _DEFAULT_DICTIONARY = dictionary
+    return _DEFAULT_DICTIONARY
+
+_CODECS: Dict[str, StorageCodec] = {}
+
+def register_codec(codec: StorageCodec):
+    _CODECS[codec.name] = codec
+
+def get_codec(name: str) -> StorageCodec:
+    if name not in _CODECS:
+        raise CodecError(f"Unknown storage codec '{name}'")
+    return _CODECS[name]
+
+def split_header(text: str) -> Tuple[str, str]:
+    """``('json', text)`` for legacy values, else the codec name and body"""
+    if not text.startswith(HEADER_MARK):
+        return PlainJsonCodec.name, text
+    name, separator, body = text[1:].partition(':')
+    if not separator:
+        raise CodecError('Truncated codec header')
+    return name, body
+
+def encode(value: Any, codec: str = PlainJsonCodec.name) -> str:
+    return get_codec(codec).encode(value)
+
+def decode(text: str) -> Any:
+    """Decode a stored value with whichever codec its header names"""
+    name, _ = split_header(text)
+    return get_codec(name).decode(text)
+
+def open_records(text: str) -> LazyRecordMap:
+    """Lazy view of a stored map of records.
+
+    Plain JSON is indexed in place, so only the records read are decoded;
+    other codecs have to decode the whole value first.
+    """
+    name, _ = split_header(text)
+    if name == PlainJsonCodec.name:
+        return LazyRecordMap(text)
+    records = decode(text)
+    if not isinstance(records, dict):
+        raise CodecError('Stored value is not a map of records')
+    return LazyRecordMap.from_records(records)
+
+register_codec(PlainJsonCodec())
+register_codec(ColumnarJsonCodec())
+# The default dictionary is read on first use, not at import
+register_codec(ZlibCodec(dictionary=default_dictionary))
+register_codec(ZlibCodec(ColumnarJsonCodec(), default_dictionary, name='zlib1-columnar'))
+
+def _progress_map(count: int) -> Dict[str, dict]:
+    """Unit 1 shaped records with realistic spread of dates and counters"""
+    categories = ['daily life', 'travel', 'business', 'academic', 'emotions', 'food', 'technology',
+                  'nature', 'health', 'sports', 'arts', 'science']
+    statuses = ['new', 'learning', 'reviewing', 'mastered']
+    records = {}
+    for i in range(count):
+        day = f'2025-{1 + (i * 7) % 12:02d}-{1 + (i * 13) % 28:02d}'
+        seconds = (i * 7919) % 86400
+        clock = f'{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.{(i * 104729) % 1000000:06d}'
+        records[f'vocab{i}'] = {
+            'word': f'vocab{i}', 'category': categories[i % len(categories)], 'isLearned': i % 3 != 0,
+            'status': statuses[(i * 5) % 4], 'createdDate': f'{day}T{clock}',
+            'exposuresToday': i % 4, 'lastExposureTime': f'{day}T{clock}',
+            'nextAllowedTime': f'{day}T{clock}', 'reviewCount': (i * 31) % 15,
+            'nextReviewDate': f'2025-{1 + (i * 11) % 12:02d}-{1 + (i * 3) % 28:02d}',
+            'lastPlayedDate': day if i % 4 else None, 'isMastered': i % 9 == 0,
+            'retired': i % 23 == 0
+        }
+    return records
+
+def _benchmark(record_counts: List[int], repeats: int = 3):
+    print(f"{'records':>8}  {'codec':<16}{'stored KiB':>12}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}")
+    for count in record_counts:
+        progress = _progress_map(count)
+        baseline = None
+        # Plain deflate shows what the trained dictionary adds
+        candidates = [(name, get_codec(name)) for name in _CODECS]
+        candidates.insert(2, ('zlib1 no dict', ZlibCodec()))
+        for name, codec in candidates:
+            encode_times, decode_times = [], []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                text = codec.encode(progress)
+                encode_times.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                decoded = decode(text)
+                decode_times.append(time.perf_counter() - started)
+            if decoded != progress:
+                raise AssertionError(f'{name} did not round-trip')
+            # localStorage quota counts UTF-16 code units
+            stored = len(text) * 2
+            baseline = baseline or stored
+            print(f'{count:>8}  {name:<16}{stored / 1024:>12.1f}{baseline / stored:>7.1f}x'
+                  f'{min(encode_times) * 1000:>12.1f}{min(decode_times) * 1000:>12.1f}')
+        print()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare storage codecs on a progress map')
+    parser.add_argument('--records', type=int, nargs='+', default=[40, 3000, 100000])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--train-dictionary', metavar='PATH',
+                        help='write a dictionary retrained on the sample maps to PATH and exit')
+    args = parser.parse_args()
+    if args.train_dictionary:
+        trained = train_dictionary(_dictionary_samples())
+        with open(args.train_dictionary, 'wb') as f:
+            f.write(trained)
+        print(f'{len(trained)} bytes, id {zlib.crc32(trained):08x}')
+    else:
+        _benchmark(args.records, args.repeats)
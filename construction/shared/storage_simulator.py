@@ -1,70 +1,254 @@
 """
 Serverless localStorage simulation using in-memory dictionaries
-Matches browser localStorage behavior exactly
+Matches browser localStorage behavior exactly, including the per-origin quota
+
+Usage is counted the way browsers do: keys and values are UTF-16 strings, so
+an item costs 2 bytes per UTF-16 code unit of key + value.
+
+Values written with set_json go through a storage codec (plain JSON by
+default, see shared.storage_codec); get_json reads any codec's header and
+legacy plain JSON alike.
+
+Simulate two years of daily lists against the quota with:
+    python -m shared.storage_simulator
 """
-import json
-from typing import Dict, Optional, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-class LocalStorageSimulator:
-    """Simulates browser localStorage using in-memory dictionary"""
+from .lazy_record_map import LazyRecordMap
+from .storage_codec import PlainJsonCodec, decode, encode, open_records
+
+DEFAULT_QUOTA_BYTES = 5 * 1024 * 1024
+
+class QuotaExceededError(Exception):
+    """Raised like the browser's DOMException named "QuotaExceededError" """
     
-    def __init__(self):
-        self._storage: Dict[str, str] = {}
+    name = 'QuotaExceededError'
     
-    def get_item(self, key: str) -> Optional[str]:
-        return self._storage.get(key)
+    def __init__(self, key: str, requested: int, usage: int, quota: int):
+        super().__init__(
+            f"Setting '{key}' needs {requested} bytes but only "
+            f"{quota - usage} of {quota} bytes are free"
+        )
+        self.key = key
+        self.requested = requested
+        self.usage = usage
+        self.quota = quota
+
+@dataclass
+class EvictionPolicy:
+    """Which keys may be dropped to make room, and in what order.
+
+    ``strategy`` is 'oldest' (first written first) or 'lru' (least recently
+    read or written first). Only keys starting with one of ``prefixes`` are
+    ever evicted, so live state such as learningProgress is never touched.
+    """
+    prefixes: Tuple[str, ...] = ('todayList_',)
+    strategy: str = 'oldest'
     
-    def set_item(self, key: str, value: str):
-        self._storage[key] = value
+    def __post_init__(self):
+        if self.strategy not in ('oldest', 'lru'):
+            raise ValueError(f'Unknown eviction strategy: {self.strategy}')
+        self.prefixes = tuple(self.prefixes)
     
-    def remove_item(self, key: str):
-        self._storage.pop(key, None)
+    def is_evictable(self, key: str) -> bool:
+        return key.startswith(self.prefixes)
+
+def item_size(key: str, value: str) -> int:
+    """Bytes an item occupies against the quota (UTF-16, key + value)"""
+    return len(key.encode('utf-16-le', 'surrogatepass')) + len(value.encode('utf-16-le', 'surrogatepass'))
+
+class WebStorageSimulator:
+    """Web Storage semantics shared by localStorage and sessionStorage.
+
+    Tracks the size of every item and the running total. A write that would
+    exceed ``quota_bytes`` first evicts historical keys when an eviction
+    policy is configured; if that cannot free enough space the write fails
+    with QuotaExceededError and storage is left unchanged.
+    """
     
-    def clear(self):
-        self._storage.clear()
+    def __init__(self, quota_bytes: Optional[int] = DEFAULT_QUOTA_BYTES,
+                 eviction: Optional[EvictionPolicy] = None,
+                 on_evict: Optional[Callable[[str], None]] = None,
+                 codec: str = PlainJsonCodec.name, key_codecs: Optional[Dict[str, str]] = None,
+                 items: Optional[Dict[str, str]] = None):
+        self._storage: Dict[str, str] = {}
+        self._sizes: Dict[str, int] = {}
+        # Write order (oldest policy) or access order (lru policy)
+        self._order: 'OrderedDict[str, None]' = OrderedDict()
+        self._usage = 0
+        # Restored items are taken as they are, even if already over quota
+        for key, value in (items or {}).items():
+            self._storage[key] = value
+            self._sizes[key] = item_size(key, value)
+            self._usage += self._sizes[key]
+            self._order[key] = None
+        self.quota_bytes = quota_bytes
+        self.eviction = eviction
+        self.on_evict = on_evict
+        self.evicted_count = 0
+        # Codec for set_json, optionally overridden for large blobs by key
+        self.codec = codec
+        self.key_codecs = dict(key_codecs or {})
     
-    def get_json(self, key: str, default=None) -> Any:
-        value = self.get_item(key)
-        if value is None:
-            return default
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return default
+    @property
+    def length(self) -> int:
+        return len(self._storage)
     
-    def set_json(self, key: str, value: Any):
-        self.set_item(key, json.dumps(value))
-
-class SessionStorageSimulator:
-    """Simulates browser sessionStorage using in-memory dictionary"""
+    def key(self, index: int) -> Optional[str]:
+        keys = list(self._storage)
+        return keys[index] if 0 <= index < len(keys) else None
     
-    def __init__(self):
-        self._storage: Dict[str, str] = {}
+    def keys(self) -> List[str]:
+        return list(self._storage)
+    
+    def items(self) -> Dict[str, str]:
+        """Copy of every stored key/value (for persisting a whole store)"""
+        return dict(self._storage)
     
     def get_item(self, key: str) -> Optional[str]:
-        return self._storage.get(key)
+        value = self._storage.get(key)
+        if value is not None and self.eviction is not None and self.eviction.strategy == 'lru':
+            self._order.move_to_end(key)
+        return value
     
     def set_item(self, key: str, value: str):
+        value = str(value)
+        size = item_size(key, value)
+        growth = size - self._sizes.get(key, 0)
+        if self.quota_bytes is not None and self._usage + growth > self.quota_bytes:
+            self._make_room(key, size, growth)
+        
         self._storage[key] = value
+        self._usage += growth
+        self._sizes[key] = size
+        if key not in self._order:
+            self._order[key] = None
+        elif self.eviction is not None and self.eviction.strategy == 'lru':
+            self._order.move_to_end(key)
     
     def remove_item(self, key: str):
-        self._storage.pop(key, None)
+        if key in self._storage:
+            del self._storage[key]
+            self._usage -= self._sizes.pop(key)
+            self._order.pop(key, None)
     
     def clear(self):
         self._storage.clear()
+        self._sizes.clear()
+        self._order.clear()
+        self._usage = 0
+    
+    def get_usage(self, key: Optional[str] = None) -> int:
+        """Bytes used by one key, or by the whole store when ``key`` is None"""
+        if key is None:
+            return self._usage
+        return self._sizes.get(key, 0)
+    
+    def get_remaining(self) -> Optional[int]:
+        if self.quota_bytes is None:
+            return None
+        return self.quota_bytes - self._usage
+    
+    def usage_by_prefix(self, separator: str = '_') -> Dict[str, int]:
+        """Usage grouped by key family, e.g. every ``todayList_*`` together"""
+        usage: Dict[str, int] = {}
+        for key, size in self._sizes.items():
+            family = key.split(separator, 1)[0] + separator if separator in key else key
+            usage[family] = usage.get(family, 0) + size
+        return usage
     
     def get_json(self, key: str, default=None) -> Any:
         value = self.get_item(key)
         if value is None:
             return default
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
+            return decode(value)
+        except ValueError:
             return default
     
     def set_json(self, key: str, value: Any):
-        self.set_item(key, json.dumps(value))
+        self.set_item(key, encode(value, self.key_codecs.get(key, self.codec)))
+    
+    def get_json_records(self, key: str) -> Optional[LazyRecordMap]:
+        """Lazy view of a stored map of records; pass it back to set_json to
+        write only what changed. None if the key is missing or unreadable."""
+        value = self.get_item(key)
+        if value is None:
+            return None
+        try:
+            return open_records(value)
+        except ValueError:
+            return None
+    
+    def _make_room(self, key: str, size: int, growth: int):
+        needed = self._usage + growth - self.quota_bytes
+        victims = []
+        if self.eviction is not None:
+            freed = 0
+            for candidate in self._order:
+                if freed >= needed:
+                    break
+                if candidate != key and self.eviction.is_evictable(candidate):
+                    victims.append(candidate)
+                    freed += self._sizes[candidate]
+            if freed < needed:
+                victims = []
+        if not victims:
+            raise QuotaExceededError(key, size, self._usage - self._sizes.get(key, 0), self.quota_bytes)
+        
+        for victim in victims:
+            self.remove_item(victim)
+            self.evicted_count += 1
+            if self.on_evict is not None:
+                self.on_evict(victim)
+
+class LocalStorageSimulator(WebStorageSimulator):
+    """Simulates browser localStorage using in-memory dictionary"""
+
+class SessionStorageSimulator(WebStorageSimulator):
+    """Simulates browser sessionStorage using in-memory dictionary"""
 
 # Global instances (serverless, in-memory only)
 local_storage = LocalStorageSimulator()
-session_storage = SessionStorageSimulator()
\ No newline at end of file
+session_storage = SessionStorageSimulator()
+
+def _simulate_daily_lists(days: int = 730, words_per_day: int = 40):
+    """Write one todayList_<date> per day, as the Unit 2 design does"""
+    from datetime import date, timedelta
+    
+    progress = {
+        f'word{i}': {'word': f'word{i}', 'category': 'topic vocab', 'reviewCount': i % 12,
+                     'nextReviewDate': '2025-01-15', 'isMastered': False, 'retired': False}
+        for i in range(3000)
+    }
+    start = date(2025, 1, 1)
+    for label, policy in (('no eviction', None), ('oldest-first eviction', EvictionPolicy())):
+        storage = LocalStorageSimulator(eviction=policy)
+        storage.set_json('learningProgress', progress)
+        failed_on = None
+        for day in range(days):
+            generation_date = (start + timedelta(days=day)).isoformat()
+            selection = {
+                'newWords': [dict(progress[f'word{(day * words_per_day + i) % 3000}'])
+                             for i in range(words_per_day)],
+                'reviewWords': [],
+                'persistenceInfo': {'generationDate': generation_date, 'severity': 'moderate'}
+            }
+            try:
+                storage.set_json(f'todayList_{generation_date}', selection)
+                storage.set_item('lastSelectionDate', generation_date)
+            except QuotaExceededError as error:
+                failed_on = generation_date
+                print(f'{label}: {error.name} on {generation_date}: {error}')
+                break
+        usage = storage.get_usage()
+        print(f'{label}: {"failed on " + failed_on if failed_on else "ok after " + str(days) + " days"}, '
+              f'{usage / 1024:.0f} KiB used of {storage.quota_bytes / 1024:.0f} KiB, '
+              f'{storage.evicted_count} lists evicted')
+        for family, size in sorted(storage.usage_by_prefix().items(), key=lambda item: -item[1]):
+            print(f'    {family:<24}{size / 1024:>10.1f} KiB')
+
+if __name__ == '__main__':
+    _simulate_daily_lists()
@@ -0,0 +1,190 @@
+"""
+LRU cache of per-user stores with write-back on eviction
+"""
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CacheStats:
+    """``size`` is the open-store count; rates are per lookup (hits + misses)"""
+    size: int
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+    pinned: int
+    hit_rate: float
+    eviction_rate: float
+
+class _CacheEntry:
+    def __init__(self):
+        self.value: Any = None
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.error: BaseException = None
+        self.pins = 0
+
+class UserStoreCache:
+    """Keeps the most recently used user stores loaded.
+
+    ``load(user_key)`` builds a store on a miss; ``save(user_key, store)`` is
+    called when a store is evicted or flushed and is expected to skip clean
+    stores. ``checkout`` holds a per-user lock, so requests for one learner run
+    one at a time while different learners proceed in parallel. Stores that
+    are checked out are never evicted, and a user whose store is still being
+    written back is not reloaded until the write has finished. A store whose
+    write-back fails on eviction is logged and kept, to be retried on the
+    next eviction, rather than failing the request that triggered it.
+    """
+    
+    def __init__(self, load: Callable[[str], Any], save: Callable[[str, Any], None],
+                 capacity: int = 128):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self._load = load
+        self._save = save
+        self.capacity = capacity
+        self._entries: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._writing: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, user_key: str) -> bool:
+        return user_key in self._entries
+    
+    @contextmanager
+    def checkout(self, user_key: str) -> Iterator[Any]:
+        """Yield the user's store with exclusive access for the block"""
+        entry = self._pin(user_key)
+        try:
+            with entry.lock:
+                yield entry.value
+        finally:
+            self._unpin(user_key, entry)
+    
+    def flush(self) -> int:
+        """Write back every loaded store without evicting it"""
+        with self._lock:
+            entries = list(self._entries.items())
+        for user_key, entry in entries:
+            if entry.ready.is_set() and entry.error is None:
+                with entry.lock:
+                    self._save(user_key, entry.value)
+        return len(entries)
+    
+    def close(self):
+        """Write back and drop every store"""
+        self.flush()
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> CacheStats:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return CacheStats(
+                size=len(self._entries),
+                capacity=self.capacity,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                pinned=sum(1 for entry in self._entries.values() if entry.pins),
+                hit_rate=self._hits / lookups if lookups else 0.0,
+                eviction_rate=self._evictions / lookups if lookups else 0.0
+            )
+    
+    def _pin(self, user_key: str) -> _CacheEntry:
+        with self._lock:
+            while True:
+                entry = self._entries.get(user_key)
+                if entry is not None:
+                    break
+                writing = self._writing.get(user_key)
+                if writing is None:
+                    break
+                self._lock.release()
+                try:
+                    writing.wait()
+                finally:
+                    self._lock.acquire()
+            
+            if entry is not None:
+                self._hits += 1
+                self._entries.move_to_end(user_key)
+                entry.pins += 1
+                loader = False
+            else:
+                self._misses += 1
+                entry = _CacheEntry()
+                entry.pins = 1
+                self._entries[user_key] = entry
+                loader = True
+        
+        if loader:
+            try:
+                entry.value = self._load(user_key)
+            except BaseException as error:
+                entry.error = error
+                with self._lock:
+                    self._entries.pop(user_key, None)
+                raise
+            finally:
+                entry.ready.set()
+            self._evict_over_capacity()
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                with self._lock:
+                    entry.pins -= 1
+                raise entry.error
+        return entry
+    
+    def _unpin(self, user_key: str, entry: _CacheEntry):
+        with self._lock:
+            entry.pins -= 1
+        self._evict_over_capacity()
+    
+    def _evict_over_capacity(self):
+        victims: List[Tuple[str, _CacheEntry, threading.Event]] = []
+        with self._lock:
+            excess = len(self._entries) - self.capacity
+            if excess <= 0:
+                return
+            for user_key, entry in self._entries.items():
+                if len(victims) >= excess:
+                    break
+                # Pinned stores are in use (or still loading); skip them
+                if entry.pins == 0:
+                    victims.append((user_key, entry, threading.Event()))
+            for user_key, entry, done in victims:
+                del self._entries[user_key]
+                self._writing[user_key] = done
+                self._evictions += 1
+        
+        for user_key, entry, done in victims:
+            try:
+                with entry.lock:
+                    self._save(user_key, entry.value)
+                saved = True
+            except Exception:
+                # Eviction runs inside some other user's request; keep the
+                # unsaved store instead of losing it or failing that request
+                logger.exception('Write-back of store %r failed; keeping it loaded', user_key)
+                saved = False
+            with self._lock:
+                if not saved:
+                    self._entries[user_key] = entry
+                    self._entries.move_to_end(user_key, last=False)
+                    self._evictions -= 1
+                self._writing.pop(user_key, None)
+            done.set()
@@ -0,0 +1,327 @@
+"""
+Prebuilt binary vocabulary bundle with memory-mapped loading
+
+Build the bundle from the construction directory with:
+    python -m shared.vocabulary_bundle [--source PATH] [--output PATH]
+
+Bundle layout (little-endian, all sections 4-byte aligned):
+    header      magic, format version, counts, source fingerprint, CRC32
+    strings     offsets (u32, count + 1) and UTF-8 data; entry i owns strings
+                4*i .. 4*i+3 (word, meaning, example, translation), followed
+                by one string per category name
+    counts      i32 per entry
+    categories  u16 category index per entry
+    members     u32 offsets per category (count + 1) and u32 word IDs
+    hash table  u32 slots holding word_id + 1 (0 = empty), linear probing
+"""
+import argparse
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import Iterator, List, Optional, Union
+
+from .vocabulary_catalog import (
+    DEFAULT_JSON_PATH, VocabularyCatalog, VocabularyEntry
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUNDLE_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'storage', 'defaultVocabulary.bundle'
+))
+
+MAGIC = b'LVBUNDLE'
+FORMAT_VERSION = 1
+
+# magic, version, entry count, category count, string count, hash slots,
+# source size, source mtime (ns), source sha256, payload crc32, then eight
+# section offsets relative to the start of the payload
+_HEADER = struct.Struct('<8sIIIIIQQ32sI8I')
+_FIELDS_PER_ENTRY = 4
+
+class BundleError(Exception):
+    """Raised when a bundle is missing, corrupt, or built from other data"""
+
+def build_bundle(source_path: str = DEFAULT_JSON_PATH,
+                 output_path: str = DEFAULT_BUNDLE_PATH) -> VocabularyCatalog:
+    """Compile a vocabulary file into a binary bundle and return the parsed catalog"""
+    catalog = VocabularyCatalog.from_file(source_path)
+    entry_count = len(catalog)
+    categories = catalog.categories
+    
+    strings: List[bytes] = []
+    for entry in catalog:
+        strings.extend((
+            entry.word.encode('utf-8'),
+            entry.meaning.encode('utf-8'),
+            entry.example.encode('utf-8'),
+            entry.translation.encode('utf-8')
+        ))
+    strings.extend(name.encode('utf-8') for name in categories)
+    
+    string_offsets = array('I', [0])
+    for value in strings:
+        string_offsets.append(string_offsets[-1] + len(value))
+    string_data = b''.join(strings)
+    
+    counts = array('i', (entry.count for entry in catalog))
+    category_of = {name: index for index, name in enumerate(categories)}
+    category_ids = array('H', (category_of[catalog.category_of(i)] for i in range(entry_count)))
+    
+    member_offsets = array('I', [0])
+    members = array('I')
+    for name in categories:
+        members.extend(catalog.ids_in_category(name))
+        member_offsets.append(len(members))
+    
+    slot_count = _slot_count(entry_count)
+    slots = array('I', bytes(4 * slot_count))
+    for word_id in range(entry_count):
+        key = catalog.word_key(word_id)
+        if catalog.id_for(key) != word_id:
+            continue
+        slot = _hash(key) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = word_id + 1
+    
+    sections = [string_offsets, string_data, counts, category_ids,
+                member_offsets, members, slots]
+    if sys.byteorder != 'little':
+        for section in sections:
+            if isinstance(section, array):
+                section.byteswap()
+    
+    payload = bytearray()
+    offsets = []
+    for section in sections:
+        offsets.append(len(payload))
+        payload += section.tobytes() if isinstance(section, array) else section
+        payload += bytes(-len(payload) % 4)
+    offsets.append(len(payload))
+    
+    stat = os.stat(source_path)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, entry_count, len(categories), len(strings), slot_count,
+        stat.st_size, stat.st_mtime_ns, _file_digest(source_path),
+        zlib.crc32(payload), *offsets
+    )
+    
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    temp_path = f'{output_path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    # Replace atomically so processes that already mapped the old bundle keep a valid view
+    os.replace(temp_path, output_path)
+    return catalog
+
+class MappedVocabularyCatalog:
+    """VocabularyCatalog-compatible view over a memory-mapped bundle.
+
+    Nothing is decoded up front: entries, strings and category members are
+    read from the mapping on access, so opening the bundle costs one header
+    read and the pages are shared between processes through the page cache.
+    """
+    
+    def __init__(self, bundle_path: str = DEFAULT_BUNDLE_PATH,
+                 source_path: Optional[str] = DEFAULT_JSON_PATH, verify: bool = True):
+        if sys.byteorder != 'little':
+            raise BundleError('Bundles can only be mapped on little-endian hosts')
+        try:
+            with open(bundle_path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise BundleError(f'Cannot open bundle {bundle_path}: {e}') from e
+        
+        try:
+            self._load_header(source_path, verify)
+        except BundleError:
+            self._mmap.close()
+            raise
+    
+    def _load_header(self, source_path: Optional[str], verify: bool):
+        if len(self._mmap) < _HEADER.size:
+            raise BundleError('Bundle is truncated')
+        (magic, version, entry_count, category_count, string_count, slot_count,
+         source_size, source_mtime_ns, source_digest, payload_crc,
+         *offsets) = _HEADER.unpack_from(self._mmap, 0)
+        
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise BundleError('Bundle format is not supported')
+        if len(self._mmap) - _HEADER.size != offsets[-1]:
+            raise BundleError('Bundle is truncated')
+        if source_path is not None and not _source_matches(
+                source_path, source_size, source_mtime_ns, source_digest):
+            raise BundleError('Bundle is stale relative to its source')
+        payload = memoryview(self._mmap)[_HEADER.size:]
+        if verify and zlib.crc32(payload) != payload_crc:
+            payload.release()
+            raise BundleError('Bundle checksum mismatch')
+        
+        def section(index: int, fmt: str) -> memoryview:
+            return payload[offsets[index]:offsets[index + 1]].cast(fmt)
+        
+        self._entry_count = entry_count
+        self._category_count = category_count
+        self._string_offsets = section(0, 'I')[:string_count + 1]
+        self._string_data = payload[offsets[1]:offsets[2]]
+        self._counts = section(2, 'i')[:entry_count]
+        self._category_ids = section(3, 'H')[:entry_count]
+        self._member_offsets = section(4, 'I')[:category_count + 1]
+        self._members = section(5, 'I')
+        self._slots = section(6, 'I')[:slot_count]
+        self._categories = [
+            self._string(_FIELDS_PER_ENTRY * entry_count + i) for i in range(category_count)
+        ]
+        self._category_index = {name: i for i, name in enumerate(self._categories)}
+    
+    def close(self):
+        for view in (self._string_offsets, self._string_data, self._counts,
+                     self._category_ids, self._member_offsets, self._members, self._slots):
+            view.release()
+        self._mmap.close()
+    
+    def __len__(self) -> int:
+        return self._entry_count
+    
+    def __contains__(self, word_key: str) -> bool:
+        return self.id_for(word_key) is not None
+    
+    def __iter__(self) -> Iterator[VocabularyEntry]:
+        for word_id in range(self._entry_count):
+            yield self.entry(word_id)
+    
+    @property
+    def categories(self) -> List[str]:
+        return list(self._categories)
+    
+    def id_for(self, word_key: str) -> Optional[int]:
+        slots = self._slots
+        mask = len(slots) - 1
+        slot = _hash(word_key) & mask
+        while slots[slot]:
+            word_id = slots[slot] - 1
+            if self._string(_FIELDS_PER_ENTRY * word_id) == word_key:
+                return word_id
+            slot = (slot + 1) & mask
+        return None
+    
+    def word_key(self, word_id: int) -> str:
+        return self._string(_FIELDS_PER_ENTRY * self._check_id(word_id))
+    
+    def category_of(self, word_id: int) -> str:
+        return self._categories[self._category_ids[self._check_id(word_id)]]
+    
+    def entry(self, word_id: int) -> VocabularyEntry:
+        base = _FIELDS_PER_ENTRY * self._check_id(word_id)
+        return VocabularyEntry(
+            word_id=word_id,
+            word=self._string(base),
+            category=self._categories[self._category_ids[word_id]],
+            meaning=self._string(base + 1),
+            example=self._string(base + 2),
+            translation=self._string(base + 3),
+            count=self._counts[word_id]
+        )
+    
+    def get(self, word_key: str) -> Optional[VocabularyEntry]:
+        word_id = self.id_for(word_key)
+        return self.entry(word_id) if word_id is not None else None
+    
+    def ids_in_category(self, category: str) -> memoryview:
+        index = self._category_index.get(category)
+        if index is None:
+            return memoryview(array('I'))
+        return self._members[self._member_offsets[index]:self._member_offsets[index + 1]]
+    
+    def keys_in_category(self, category: str) -> List[str]:
+        return [self.word_key(word_id) for word_id in self.ids_in_category(category)]
+    
+    def _check_id(self, word_id: int) -> int:
+        if not 0 <= word_id < self._entry_count:
+            raise IndexError(f'word id {word_id} out of range')
+        return word_id
+    
+    def _string(self, index: int) -> str:
+        start = self._string_offsets[index]
+        end = self._string_offsets[index + 1]
+        return str(self._string_data[start:end], 'utf-8')
+
+def load_catalog(source_path: str = DEFAULT_JSON_PATH,
+                 bundle_path: str = DEFAULT_BUNDLE_PATH,
+                 rebuild: bool = False) -> Union[MappedVocabularyCatalog, VocabularyCatalog]:
+    """Map the bundle if it is valid for ``source_path``, else parse the source.
+
+    With ``rebuild=True`` a missing or stale bundle is recompiled so the next
+    start can map it.
+    """
+    try:
+        return MappedVocabularyCatalog(bundle_path, source_path)
+    except BundleError as e:
+        # No bundle built yet is the normal case; a bad one is worth a warning
+        log = logger.warning if os.path.exists(bundle_path) else logger.debug
+        log('Vocabulary bundle unavailable (%s), loading %s', e, source_path)
+    if rebuild:
+        try:
+            return build_bundle(source_path, bundle_path)
+        except OSError as e:
+            logger.warning('Could not rebuild vocabulary bundle: %s', e)
+    return VocabularyCatalog.from_file(source_path)
+
+def _source_matches(source_path: str, size: int, mtime_ns: int, digest: bytes) -> bool:
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        # Source not shipped alongside the bundle; trust the bundle
+        return True
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime_ns == mtime_ns:
+        return True
+    # Touched but possibly unchanged (e.g. fresh checkout): compare contents
+    return _file_digest(source_path) == digest
+
+def _file_digest(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def _hash(word_key: str) -> int:
+    return zlib.crc32(word_key.encode('utf-8'))
+
+def _slot_count(entry_count: int) -> int:
+    slots = 8
+    while slots < 2 * entry_count:
+        slots *= 2
+    return slots
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the binary vocabulary bundle')
+    parser.add_argument('--source', default=DEFAULT_JSON_PATH, help='JSON or CSV vocabulary file')
+    parser.add_argument('--output', default=DEFAULT_BUNDLE_PATH, help='bundle file to write')
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    catalog = build_bundle(args.source, args.output)
+    build_ms = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    mapped = MappedVocabularyCatalog(args.output, args.source)
+    open_ms = (time.perf_counter() - start) * 1000
+    mapped.close()
+    
+    print(f'Built {args.output}: {len(catalog)} entries, '
+          f'{len(catalog.categories)} categories, {os.path.getsize(args.output)} bytes')
+    print(f'Build: {build_ms:.1f} ms, open with verification: {open_ms:.2f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Vocabulary catalog loaded once from the bundled default vocabulary
+Supports the category-keyed JSON file and the flat CSV export
+"""
+import csv
+import json
+import os
+import sys
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PUBLIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'public')
+DEFAULT_JSON_PATH = os.path.normpath(os.path.join(PUBLIC_DIR, 'defaultVocabulary.json'))
+DEFAULT_CSV_PATH = os.path.normpath(os.path.join(PUBLIC_DIR, 'defaultVocabulary4.csv'))
+
+_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = ' \t\n\r'
+
+@dataclass(frozen=True)
+class VocabularyEntry:
+    """A single vocabulary entry as stored in the default vocabulary files"""
+    word_id: int
+    word: str
+    category: str
+    meaning: str = ""
+    example: str = ""
+    translation: str = ""
+    count: int = 0
+
+class VocabularyCatalog:
+    """Read-only vocabulary catalog with dense integer word IDs.
+
+    Entries are stored column-wise; word IDs are positions in those columns.
+    Category names are interned and each category keeps an array of its IDs.
+    A word key that appears in several categories resolves to its first entry.
+    """
+    
+    def __init__(self):
+        self._words: List[str] = []
+        self._meanings: List[str] = []
+        self._examples: List[str] = []
+        self._translations: List[str] = []
+        self._counts = array('l')
+        self._category_ids = array('H')
+        self._categories: List[str] = []
+        self._category_index: Dict[str, int] = {}
+        self._category_members: List[array] = []
+        self._ids_by_key: Dict[str, int] = {}
+    
+    @classmethod
+    def from_json(cls, path: str = DEFAULT_JSON_PATH) -> 'VocabularyCatalog':
+        """Stream-parse the category-keyed JSON vocabulary file"""
+        catalog = cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            for category, item in _iter_json_entries(f):
+                catalog._add(category, item)
+        return catalog
+    
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_CSV_PATH) -> 'VocabularyCatalog':
+        """Stream-parse the flat CSV vocabulary export"""
+        catalog = cls()
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                catalog._add(row.get('category', ''), row)
+        return catalog
+    
+    @classmethod
+    def from_file(cls, path: str) -> 'VocabularyCatalog':
+        """Load a catalog, picking the parser from the file extension"""
+        if path.lower().endswith('.csv'):
+            return cls.from_csv(path)
+        return cls.from_json(path)
+    
+    def __len__(self) -> int:
+        return len(self._words)
+    
+    def __contains__(self, word_key: str) -> bool:
+        return word_key in self._ids_by_key
+    
+    def __iter__(self) -> Iterator[VocabularyEntry]:
+        for word_id in range(len(self._words)):
+            yield self.entry(word_id)
+    
+    @property
+    def categories(self) -> List[str]:
+        return list(self._categories)
+    
+    def id_for(self, word_key: str) -> Optional[int]:
+        """Word ID for a word key, or None if the key is unknown"""
+        return self._ids_by_key.get(word_key)
+    
+    def word_key(self, word_id: int) -> str:
+        return self._words[word_id]
+    
+    def category_of(self, word_id: int) -> str:
+        return self._categories[self._category_ids[word_id]]
+    
+    def entry(self, word_id: int) -> VocabularyEntry:
+        return VocabularyEntry(
+            word_id=word_id,
+            word=self._words[word_id],
+            category=self._categories[self._category_ids[word_id]],
+            meaning=self._meanings[word_id],
+            example=self._examples[word_id],
+            translation=self._translations[word_id],
+            count=self._counts[word_id]
+        )
+    
+    def get(self, word_key: str) -> Optional[VocabularyEntry]:
+        word_id = self._ids_by_key.get(word_key)
+        return self.entry(word_id) if word_id is not None else None
+    
+    def ids_in_category(self, category: str) -> array:
+        """Word IDs in a category, in file order (empty if unknown)"""
+        index = self._category_index.get(category)
+        if index is None:
+            return array('I')
+        return self._category_members[index]
+    
+    def keys_in_category(self, category: str) -> List[str]:
+        return [self._words[word_id] for word_id in self.ids_in_category(category)]
+    
+    def _add(self, category: str, item: dict) -> int:
+        word_id = len(self._words)
+        word = item.get('word') or ''
+        category_index = self._intern_category(category or '')
+        
+        self._words.append(word)
+        self._meanings.append(item.get('meaning') or '')
+        self._examples.append(item.get('example') or '')
+        self._translations.append(item.get('translation') or '')
+        self._counts.append(_to_int(item.get('count')))
+        self._category_ids.append(category_index)
+        self._category_members[category_index].append(word_id)
+        self._ids_by_key.setdefault(word, word_id)
+        return word_id
+    
+    def _intern_category(self, category: str) -> int:
+        index = self._category_index.get(category)
+        if index is None:
+            index = len(self._categories)
+            category = sys.intern(category)
+            self._categories.append(category)
+            self._category_index[category] = index
+            self._category_members.append(array('I'))
+        return index
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+def _iter_json_entries(f, chunk_size: int = _CHUNK_SIZE) -> Iterator[Tuple[str, dict]]:
+    """Yield (category, entry) pairs from ``{"category": [{...}, ...], ...}``.
+
+    Reads the file in chunks and decodes one entry object at a time, so the
+    whole document is never materialised as a single Python object.
+    """
+    decoder = json.JSONDecoder()
+    reader = _ChunkReader(f, chunk_size)
+    
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        category = reader.decode(decoder)
+        reader.expect(':')
+        reader.expect('[')
+        if reader.peek() == ']':
+            reader.advance()
+        else:
+            while True:
+                item = reader.decode(decoder)
+                if isinstance(item, dict):
+                    yield category, item
+                if reader.next_char() == ']':
+                    break
+        if reader.next_char() == '}':
+            return
+
+class _ChunkReader:
+    """Minimal buffered cursor used by the streaming JSON parser"""
+    
+    def __init__(self, f, chunk_size: int):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+    
+    def _fill(self) -> bool:
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+    
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of vocabulary JSON')
+    
+    def advance(self):
+        self._pos += 1
+    
+    def next_char(self) -> str:
+        char = self.peek()
+        self._pos += 1
+        return char
+    
+    def expect(self, char: str):
+        found = self.next_char()
+        if found != char:
+            raise ValueError(f'Expected {char!r} in vocabulary JSON, found {found!r}')
+    
+    def decode(self, decoder: json.JSONDecoder):
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A value that ends exactly at the buffer edge may be truncated
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+_default_catalog: Optional[VocabularyCatalog] = None
+_default_catalog_lock = threading.Lock()
+
+def get_default_catalog() -> VocabularyCatalog:
+    """Shared catalog instance, mapped from the prebuilt bundle when it is
+    current and parsed from the default JSON otherwise"""
+    global _default_catalog
+    if _default_catalog is None:
+        with _default_catalog_lock:
+            # Threads that lost the race reuse the winner's catalog
+            if _default_catalog is None:
+                from .vocabulary_bundle import load_catalog
+                _default_catalog = load_catalog(DEFAULT_JSON_PATH)
+    return _default_catalog
@@ -0,0 +1,269 @@
+"""
+Full-text and fuzzy search over the vocabulary catalog
+
+Run a build/query benchmark from the construction directory with:
+    python -m shared.vocabulary_search
+"""
+import bisect
+import heapq
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .vocabulary_catalog import VocabularyEntry, get_default_catalog
+
+# Field weights; a word matching several fields keeps its best weight
+FIELD_WEIGHTS = {
+    'word': 8,
+    'meaning': 3,
+    'translation': 3,
+    'example': 1
+}
+
+EXACT_WORD_BONUS = 20
+WORD_PREFIX_BONUS = 10
+FUZZY_PENALTY = 0.5
+# A short prefix expands to at most this many tokens, the ones found in the
+# most entries
+MAX_PREFIX_EXPANSIONS = 32
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+# Letters that NFKD does not decompose into base letter + combining mark
+_EXTRA_FOLDS = str.maketrans({'đ': 'd', 'Đ': 'd', 'ø': 'o', 'Ø': 'o', 'ł': 'l', 'Ł': 'l'})
+
+def fold_text(text: str) -> str:
+    """Casefold and strip diacritics ("Bị quản thúc" -> "bi quan thuc")"""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text.translate(_EXTRA_FOLDS))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.casefold()
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(fold_text(text))
+
+@dataclass
+class SearchResult:
+    entry: VocabularyEntry
+    score: float
+
+@dataclass
+class SearchIndexStats:
+    entry_count: int
+    token_count: int
+    posting_count: int
+    trigram_count: int
+    approx_bytes: int
+    build_seconds: float
+
+class VocabularySearchIndex:
+    """Inverted index with prefix and typo-tolerant lookup.
+
+    Tokens from every field are diacritic-folded and casefolded. Each token
+    maps to ``{word_id: weight}``; a sorted token list answers prefix queries
+    and a trigram index over tokens supplies candidates for fuzzy matching,
+    which are then confirmed with a bounded edit distance.
+    """
+    
+    def __init__(self, catalog=None):
+        start = time.perf_counter()
+        self.catalog = catalog if catalog is not None else get_default_catalog()
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._folded_words: List[str] = []
+        
+        for entry in self.catalog:
+            self._folded_words.append(' '.join(tokenize(entry.word)))
+            for field_name, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(getattr(entry, field_name)):
+                    posting = self._postings.get(token)
+                    if posting is None:
+                        posting = self._postings[token] = {}
+                    if posting.get(entry.word_id, 0) < weight:
+                        posting[entry.word_id] = weight
+        
+        self._sorted_tokens = sorted(self._postings)
+        self._sorted_words = sorted(
+            (folded, word_id) for word_id, folded in enumerate(self._folded_words)
+        )
+        self._trigrams: Dict[str, List[str]] = {}
+        for token in self._sorted_tokens:
+            for gram in _trigrams(token):
+                self._trigrams.setdefault(gram, []).append(token)
+        
+        self._build_seconds = time.perf_counter() - start
+    
+    def search(self, query: str, limit: int = 20, fuzzy: bool = True) -> List[SearchResult]:
+        """Return entries matching every query token, best matches first.
+
+        The last token also matches as a prefix (search-as-you-type). A token
+        with no exact or prefix match falls back to fuzzy matching.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        
+        scores: Optional[Dict[int, float]] = None
+        for position, token in enumerate(tokens):
+            token_scores = self._score_token(
+                token, prefix=position == len(tokens) - 1, fuzzy=fuzzy
+            )
+            if not token_scores:
+                return []
+            if scores is None:
+                scores = token_scores
+            else:
+                if len(token_scores) < len(scores):
+                    scores, token_scores = token_scores, scores
+                scores = {
+                    word_id: score + token_scores[word_id]
+                    for word_id, score in scores.items() if word_id in token_scores
+                }
+                if not scores:
+                    return []
+        
+        # Boost entries whose headword equals or starts with the query
+        folded_query = ' '.join(tokens)
+        sorted_words = self._sorted_words
+        i = bisect.bisect_left(sorted_words, (folded_query, -1))
+        while i < len(sorted_words) and sorted_words[i][0].startswith(folded_query):
+            folded_word, word_id = sorted_words[i]
+            i += 1
+            if word_id in scores:
+                bonus = EXACT_WORD_BONUS if folded_word == folded_query else WORD_PREFIX_BONUS
+                scores[word_id] += bonus
+        
+        top = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        return [
+            SearchResult(entry=self.catalog.entry(word_id), score=score)
+            for word_id, score in top
+        ]
+    
+    def prefix_tokens(self, prefix: str, limit: int = MAX_PREFIX_EXPANSIONS) -> List[str]:
+        """Indexed tokens starting with ``prefix`` (already folded); past
+        ``limit`` matches, the tokens found in the most entries"""
+        tokens = self._sorted_tokens
+        start = bisect.bisect_left(tokens, prefix)
+        end = bisect.bisect_left(tokens, prefix + '\U0010ffff', start)
+        if end - start <= limit:
+            return tokens[start:end]
+        postings = self._postings
+        return heapq.nlargest(limit, tokens[start:end], key=lambda token: len(postings[token]))
+    
+    def fuzzy_tokens(self, token: str, max_edits: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Indexed tokens within ``max_edits`` edits of ``token``"""
+        if max_edits is None:
+            max_edits = 1 if len(token) <= 7 else 2
+        grams = _trigrams(token)
+        # Each edit destroys at most three trigrams
+        needed = max(1, len(grams) - 3 * max_edits)
+        shared = Counter(chain.from_iterable(self._trigrams.get(gram, ()) for gram in grams))
+        
+        matches = []
+        for candidate, count in shared.items():
+            if count < needed or abs(len(candidate) - len(token)) > max_edits:
+                continue
+            distance = _bounded_edit_distance(token, candidate, max_edits)
+            if distance <= max_edits:
+                matches.append((candidate, distance))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+    
+    def stats(self) -> SearchIndexStats:
+        posting_count = sum(len(posting) for posting in self._postings.values())
+        approx_bytes = (
+            sys.getsizeof(self._postings)
+            + sum(sys.getsizeof(token) + sys.getsizeof(posting)
+                  for token, posting in self._postings.items())
+            + sys.getsizeof(self._sorted_tokens)
+            + sys.getsizeof(self._trigrams)
+            + sum(sys.getsizeof(gram) + sys.getsizeof(tokens)
+                  for gram, tokens in self._trigrams.items())
+            + sum(sys.getsizeof(word) for word in self._folded_words)
+        )
+        return SearchIndexStats(
+            entry_count=len(self._folded_words),
+            token_count=len(self._postings),
+            posting_count=posting_count,
+            trigram_count=len(self._trigrams),
+            approx_bytes=approx_bytes,
+            build_seconds=self._build_seconds
+        )
+    
+    def _score_token(self, token: str, prefix: bool, fuzzy: bool) -> Dict[int, float]:
+        # An entry matched through several expansions keeps its best weight
+        scores: Dict[int, float] = {}
+        if prefix:
+            for expansion in self.prefix_tokens(token):
+                _merge_best(scores, self._postings[expansion].items())
+        _merge_best(scores, self._postings.get(token, {}).items())
+        if not scores and fuzzy and len(token) >= 3:
+            for candidate, distance in self.fuzzy_tokens(token):
+                factor = FUZZY_PENALTY ** distance
+                _merge_best(scores, (
+                    (word_id, weight * factor)
+                    for word_id, weight in self._postings[candidate].items()
+                ))
+        return scores
+
+def _merge_best(scores: Dict[int, float], weights: Iterable[Tuple[int, float]]):
+    if not scores:
+        scores.update(weights)
+        return
+    for word_id, weight in weights:
+        if weight > scores.get(word_id, 0):
+            scores[word_id] = weight
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f'${token}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, returning ``limit + 1`` once it is exceeded"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def _benchmark(queries: Iterable[str], repeat: int = 200):
+    index = VocabularySearchIndex()
+    stats = index.stats()
+    print(f'Index build: {stats.build_seconds * 1000:.1f} ms, '
+          f'{stats.entry_count} entries, {stats.token_count} tokens, '
+          f'{stats.posting_count} postings, {stats.trigram_count} trigrams, '
+          f'~{stats.approx_bytes / 1024:.0f} KiB')
+    print(f'{"query":<28}{"hits":>6}{"avg us":>10}  top result')
+    for query in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = index.search(query)
+        avg_us = (time.perf_counter() - start) / repeat * 1e6
+        top = results[0].entry.word if results else '-'
+        print(f'{query:<28}{len(results):>6}{avg_us:>10.1f}  {top}')
+
+if __name__ == '__main__':
+    _benchmark([
+        'knuckle down',
+        'house arrest',
+        'bị quản thúc',
+        'quan thuc',
+        'knukle',
+        'midnigt oil',
+        'cook the bo',
+        'gian lan so sach',
+        'to'
+    ])
@@ -0,0 +1,130 @@
+"""
+Warm-start snapshots of decoded service state
+
+A service that rebuilds its in-memory state from stored JSON on every start
+can save that state here on shutdown and load it on the next start instead
+of reparsing. A snapshot is only used while storage is exactly as it was
+when the snapshot was taken: it records the storage generation (a token
+every storage write changes) and the layout of the classes it holds, and
+anything else - a missing or stale file, a changed model, a corrupt or
+truncated file - makes ``load`` return None so the caller starts cold.
+
+Snapshots are pickles, so keep them in a directory only this application
+writes to, as with any other local cache.
+
+The gain is modest. Unit 1 starts about 2x faster at 3k words (18 -> 9 ms)
+but only about 1.4x at 100k (1.8 -> 1.3 s): building the snapshot store
+still dominates either way. The prototype gains 2.4x and 1.9x. Measure with
+warm_start_benchmark.py before turning it on.
+"""
+import dataclasses
+import itertools
+import operator
+import os
+import pickle
+import struct
+import tempfile
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+MAGIC = b'WSNP'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('>4sH')
+
+def schema_of(*classes) -> str:
+    """Layout of the classes a snapshot holds; any field change invalidates it"""
+    parts = []
+    for cls in classes:
+        fields = ','.join(f.name for f in dataclasses.fields(cls)) if dataclasses.is_dataclass(cls) else ''
+        parts.append(f'{cls.__module__}.{cls.__qualname__}({fields})')
+    return ';'.join(parts)
+
+def pack_records(records: Dict[str, Any], cls) -> Tuple[List[str], List[tuple]]:
+    """Dataclass records as (keys, field-value rows): plain tuples unpickle
+    several times faster than the instances themselves"""
+    names = [f.name for f in dataclasses.fields(cls)]
+    getter = operator.attrgetter(*names)
+    rows = [getter(record) for record in records.values()] if len(names) > 1 \
+        else [(getter(record),) for record in records.values()]
+    return list(records), rows
+
+def unpack_records(packed: Tuple[List[str], List[tuple]], cls) -> Dict[str, Any]:
+    """Rebuild records from pack_records"""
+    keys, rows = packed
+    fields = dataclasses.fields(cls)
+    if all(f.init for f in fields) and not hasattr(cls, '__post_init__'):
+        # Every field is an __init__ argument: the generated __init__ is the fastest path
+        return dict(zip(keys, itertools.starmap(cls, rows)))
+    names = [f.name for f in fields]
+    new = object.__new__
+    records = {}
+    for key, row in zip(keys, rows):
+        record = new(cls)
+        record.__dict__.update(zip(names, row))
+        records[key] = record
+    return records
+
+class WarmStartCache:
+    """One snapshot file for one piece of state (e.g. one learner's progress)"""
+    
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.schema = schema
+        # Why the last load fell back to a cold start (None after a hit)
+        self.last_miss: Optional[str] = None
+    
+    def load(self, generation: Optional[Hashable]) -> Optional[Any]:
+        """State saved at ``generation``, or None if there is no usable snapshot"""
+        self.last_miss = None
+        if generation is None:
+            return self._miss('storage has no generation')
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return self._miss('no snapshot')
+        except OSError as error:
+            return self._miss(f'unreadable: {error}')
+        
+        if len(data) < _HEADER.size:
+            return self._miss('truncated')
+        magic, version = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return self._miss('different snapshot format')
+        try:
+            schema, saved_generation, state = pickle.loads(data[_HEADER.size:])
+        except Exception as error:
+            return self._miss(f'corrupt: {type(error).__name__}')
+        if schema != self.schema:
+            return self._miss('model changed')
+        if saved_generation != generation:
+            return self._miss('stale')
+        return state
+    
+    def save(self, generation: Optional[Hashable], state: Any):
+        """Write a snapshot atomically; without a generation nothing could
+        validate it later, so any old snapshot is removed instead"""
+        if generation is None:
+            self.invalidate()
+            return
+        payload = pickle.dumps((self.schema, generation, state), protocol=pickle.HIGHEST_PROTOCOL)
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def invalidate(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+    
+    def _miss(self, reason: str) -> None:
+        self.last_miss = reason
+        return None
@@ -7,12 +7,16 @@ from typing import Literal
 # Severity levels for daily selection
 SeverityLevel = Literal['light', 'moderate', 'intensive']
 
+# Daily selection size per severity (design ranges: 15-25, 30-50, 50-100)
+DAILY_SELECTION_SIZES = {'light': 20, 'moderate': 40, 'intensive': 75}
+
 # Word status types
 WordStatus = Literal['due', 'not_due', 'new']
 
 # Review intervals (days) for spaced repetition
 REVIEW_INTERVALS = [1, 2, 3, 5, 7, 10, 14, 21, 28, 35]  # reviews 1-10
 MASTER_INTERVAL = 60  # days from review 11 onward
+RETIREMENT_INTERVAL = 100  # days a retired word stays out of rotation
 
 # Exposure delays (minutes) for intra-day timing
 EXPOSURE_DELAYS = [0, 5, 7, 10, 15, 30, 60, 90, 120]
\ No newline at end of file
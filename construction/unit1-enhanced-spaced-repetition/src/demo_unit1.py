@@ -7,6 +7,9 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from enhanced_learning_progress_service import EnhancedLearningProgressService
+from storage_simulator import LocalStorageSimulator
+from event_bus import EventBus
+from services.progress_replica import ProgressReplica
 
 def demo_unit1():
     """Demonstrate Unit 1 functionality"""
@@ -64,6 +67,31 @@ def demo_unit1():
     due_words = service.get_due_words()
     print(f"   Words due for review: {due_words}")
     
+    print("\n7. Testing eligibility index...")
+    print(f"   Next eligible word: {service.get_next_eligible_word()}")
+    print(f"   Minutes until next eligible: {service.minutes_until_next_eligible()}")
+    print(f"   Eligible within 10 minutes: {service.get_words_eligible_within(10)}")
+    
+    print("\n8. Testing multi-device merge (CRDT deltas)...")
+    phone = EnhancedLearningProgressService(LocalStorageSimulator(), EventBus())
+    laptop = EnhancedLearningProgressService(LocalStorageSimulator(), EventBus())
+    phone_replica = ProgressReplica(phone.repository, "phone")
+    laptop_replica = ProgressReplica(laptop.repository, "laptop")
+    
+    # Both devices review "fig" offline; the laptop also retires it
+    phone.handle_implicit_review("fig")
+    phone.handle_implicit_review("fig")
+    laptop.handle_implicit_review("fig")
+    laptop.retire_word("fig")
+    phone_replica.record_local(["fig"])
+    laptop_replica.record_local(["fig"])
+    
+    phone.merge_remote_progress(phone_replica, laptop_replica.take_outbox())
+    laptop.merge_remote_progress(laptop_replica, phone_replica.take_outbox())
+    for name, device in (("phone", phone), ("laptop", laptop)):
+        progress = device.repository.get_progress("fig")
+        print(f"   {name}: review_count={progress.review_count}, retired={progress.retired}")
+    
     print("\n=== Unit 1 Demo Complete ===")
     print("✓ Exposure tracking working")
     print("✓ FR3.1: Review interval calculation working")
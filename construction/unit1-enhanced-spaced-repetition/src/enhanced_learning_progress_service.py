@@ -1,37 +1,91 @@
 """
 Enhanced Learning Progress Service - Main orchestrator for Unit 1
 """
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from copy import copy
 from datetime import datetime
+from typing import Optional
 from event_bus import event_bus, Event
 from repositories.learning_progress_repository import LearningProgressRepository
+from repositories.review_log_repository import ReviewLogRepository
+from repositories.vocabulary_manifest_repository import VocabularyManifestRepository
 from services.timing_calculator import TimingCalculator
 from services.review_interval_calculator import ReviewIntervalCalculator
+from services.eligibility_index import EligibilityIndex
+from services.vocabulary_importer import VocabularyImporter, VocabularyDiff
 from models.learning_progress import EnhancedLearningProgress
+from shared.reactivation_calendar import ReactivationCalendar, day_of
+from shared.review_log import ReviewLog
+from shared.snapshot_store import Snapshot, SnapshotStore
+from shared.warm_start import WarmStartCache, pack_records, schema_of, unpack_records
 
 class EnhancedLearningProgressService:
     """Main service for enhanced learning progress with FR3 features"""
     
-    def __init__(self):
-        self.repository = LearningProgressRepository()
+    # Review log entries held in memory before they are written to storage
+    REVIEW_LOG_FLUSH_EVERY = 64
+    
+    def __init__(self, storage=None, bus=None, warm_start_path: Optional[str] = None):
+        # Storage and event bus default to the process-wide instances; inject
+        # per-user ones to serve several learners from one process
+        self.event_bus = bus or event_bus
+        self.repository = LearningProgressRepository(storage)
+        self.review_log_repository = ReviewLogRepository(self.repository.storage)
+        self._review_log: Optional[ReviewLog] = None
         self.timing_calculator = TimingCalculator()
         self.review_calculator = ReviewIntervalCalculator()
         
         # Subscribe to events
-        event_bus.subscribe('word_reviewed', self._handle_word_reviewed)
-        event_bus.subscribe('playback_completed', self._handle_playback_completed)
-        event_bus.subscribe('date_changed', self._handle_date_changed)
+        self.event_bus.subscribe('word_reviewed', self._handle_word_reviewed)
+        self.event_bus.subscribe('playback_completed', self._handle_playback_completed)
+        self.event_bus.subscribe('date_changed', self._handle_date_changed)
         
         # Migrate existing data on initialization
         self.repository.migrate_existing_data()
+        
+        # Build exposure eligibility index, reactivation calendar and the published snapshot
+        # from stored progress, or restore them from a warm-start snapshot taken at this
+        # storage generation
+        self.eligibility_index = EligibilityIndex()
+        self.reactivation_calendar = ReactivationCalendar()
+        self.snapshots = SnapshotStore()
+        self.warm_start = (WarmStartCache(warm_start_path, schema_of(EnhancedLearningProgress))
+                           if warm_start_path else None)
+        self.warm_started = self._load_warm_start()
+        if not self.warm_started:
+            self._rebuild_eligibility_index()
     
     def get_progress(self, word_key: str) -> EnhancedLearningProgress:
         """Get or create progress for a word"""
         progress = self.repository.get_progress(word_key)
         if progress is None:
             progress = EnhancedLearningProgress(word=word_key)
-            self.repository.save_progress(word_key, progress)
+            self._save(word_key, progress)
+            self._index_progress(word_key, progress)
         return progress
     
+    @property
+    def review_log(self) -> ReviewLog:
+        """Every exposure and review of the learner's words, read from storage on first use"""
+        if self._review_log is None:
+            self._review_log = self.review_log_repository.load()
+        return self._review_log
+    
+    def save_review_log(self):
+        """Write entries appended since the last save. Appends are written
+        every REVIEW_LOG_FLUSH_EVERY entries and at the service's batch
+        saves; call it before persisting storage to keep the rest."""
+        if self._review_log is not None and self._review_log.unsaved:
+            self.review_log_repository.save(self._review_log)
+    
+    def snapshot(self) -> Snapshot:
+        """Consistent read-only view of every word's progress, taken without
+        locking; bulk updates become visible in it all at once"""
+        return self.snapshots.current()
+    
     def update_word_exposure(self, word_key: str):
         """Update word exposure and timing (existing functionality)"""
         progress = self.get_progress(word_key)
@@ -44,10 +98,12 @@ class EnhancedLearningProgressService:
             progress.exposures_today, now
         )
         
-        self.repository.save_progress(word_key, progress)
+        self._save(word_key, progress)
+        self._index_progress(word_key, progress)
+        self._log_review(word_key, None, 'exposure')
         
         # Publish exposure event
-        event_bus.publish(Event('word_exposed', {
+        self.event_bus.publish(Event('word_exposed', {
             'word_key': word_key,
             'exposures_today': progress.exposures_today
         }))
@@ -70,15 +126,16 @@ class EnhancedLearningProgressService:
             progress.next_review_date = self.review_calculator.calculate_mastery_review_date()
             
             # Publish mastery event
-            event_bus.publish(Event('word_mastered', {
+            self.event_bus.publish(Event('word_mastered', {
                 'word_key': word_key,
                 'review_count': progress.review_count
             }))
         
-        self.repository.save_progress(word_key, progress)
+        self._save(word_key, progress)
+        self._log_review(word_key, True, 'review')
         
         # Publish review completed event
-        event_bus.publish(Event('review_completed', {
+        self.event_bus.publish(Event('review_completed', {
             'word_key': word_key,
             'review_count': progress.review_count,
             'is_mastered': progress.is_mastered
@@ -88,21 +145,29 @@ class EnhancedLearningProgressService:
         """Retire a word (FR3.2)"""
         progress = self.get_progress(word_key)
         
-        # FR3.2: Reset progress when retiring
+        # FR3.2: Reset progress when retiring; the word returns after its hiatus
         progress.retired = True
         progress.is_mastered = False
         progress.review_count = 0
-        progress.next_review_date = None
+        progress.next_review_date = self.review_calculator.calculate_retirement_return_date()
         
-        self.repository.save_progress(word_key, progress)
+        self._save(word_key, progress)
+        self.eligibility_index.remove(word_key)
         
         # Publish retirement event
-        event_bus.publish(Event('word_retired', {
+        self.event_bus.publish(Event('word_retired', {
             'word_key': word_key
         }))
     
     def is_word_eligible_for_play(self, word_key: str) -> bool:
         """Check if word is eligible for play (timing + retirement)"""
+        eligible_minute = self.eligibility_index.eligible_minute(word_key)
+        now_minute = self.timing_calculator.current_epoch_minute()
+        if eligible_minute is not None and eligible_minute != now_minute:
+            return eligible_minute < now_minute
+        
+        # Not indexed, or due within the current minute: the index only keeps
+        # whole minutes, so check the exact time
         progress = self.get_progress(word_key)
         
         # FR3.2: Exclude retired words
@@ -112,9 +177,22 @@ class EnhancedLearningProgressService:
         # Check timing eligibility
         return self.timing_calculator.is_time_elapsed(progress.next_allowed_time)
     
+    def get_next_eligible_word(self) -> Optional[str]:
+        """Get the playable word that has been eligible the longest, if any"""
+        return self.eligibility_index.next_eligible(self.timing_calculator.current_epoch_minute())
+    
+    def minutes_until_next_eligible(self) -> Optional[int]:
+        """Minutes until any playable word becomes eligible (None if no words)"""
+        return self.eligibility_index.minutes_until_next(self.timing_calculator.current_epoch_minute())
+    
+    def get_words_eligible_within(self, minutes: int = 0) -> list[str]:
+        """Get playable words that become eligible within the next N minutes"""
+        now_minute = self.timing_calculator.current_epoch_minute()
+        return self.eligibility_index.eligible_within(now_minute + minutes)
+    
     def get_due_words(self) -> list[str]:
         """Get words due for review"""
-        all_progress = self.repository.get_all_progress()
+        all_progress = self.snapshot().records
         due_words = []
         
         for word_key, progress in all_progress.items():
@@ -126,18 +204,223 @@ class EnhancedLearningProgressService:
         
         return due_words
     
+    def get_stats(self) -> dict:
+        """Summary counts over the learner's stored progress"""
+        stats = {
+            'total_words': 0,
+            'learned_words': 0,
+            'mastered_words': 0,
+            'retired_words': 0,
+            'due_words': 0
+        }
+        for progress in self.snapshot().records.values():
+            stats['total_words'] += 1
+            if progress.retired:
+                stats['retired_words'] += 1
+                continue
+            if progress.review_count > 0:
+                stats['learned_words'] += 1
+            if progress.is_mastered:
+                stats['mastered_words'] += 1
+            elif self.review_calculator.is_due_for_review(progress.next_review_date):
+                stats['due_words'] += 1
+        return stats
+    
     def reset_daily_exposures(self):
         """Reset daily exposure counts"""
-        all_progress = self.repository.get_all_progress()
+        now = datetime.now().isoformat()
+        with self.snapshots.transaction():
+            updates = {}
+            for word_key, progress in self.repository.get_all_progress().items():
+                progress.exposures_today = 0
+                progress.last_exposure_time = ""
+                progress.next_allowed_time = now
+                updates[word_key] = progress
+                self._index_progress(word_key, progress)
+            
+            # One storage write, and readers switch to the reset state in one step
+            self.repository.apply_changes(updates)
+            self.snapshots.replace(updates)
+        self.save_review_log()
+        
+        # Publish reset event
+        self.event_bus.publish(Event('exposure_count_reset', {}))
+    
+    def reactivate_due_words(self, today: Optional[str] = None) -> list[str]:
+        """Return mastered and retired words whose hiatus ends by today to the
+        review rotation (FR3.2/FR3.4). Only the calendar buckets that have
+        come due are touched, not every stored word."""
+        today = today or datetime.now().isoformat().split('T')[0]
+        with self.snapshots.transaction():
+            records = self.snapshot().records
+            updates = {}
+            for word_key in self.reactivation_calendar.sweep(today):
+                progress = records.get(word_key)
+                if progress is None:
+                    continue
+                progress = copy(progress)
+                progress.is_mastered = False
+                progress.retired = False
+                updates[word_key] = progress
+                self._index_progress(word_key, progress)
+            if updates:
+                self.repository.apply_changes(updates)
+                self.snapshots.publish(updates)
+        self.save_review_log()
+        
+        if updates:
+            # One event for the day's batch, however many words came back
+            self.event_bus.publish(Event('words_reactivated', {
+                'word_keys': list(updates),
+                'date': today
+            }))
+        return list(updates)
+    
+    def import_vocabulary(self, catalog, prune_removed: bool = False) -> VocabularyDiff:
+        """Merge an updated vocabulary catalog into stored progress"""
+        importer = VocabularyImporter(
+            self.repository, VocabularyManifestRepository(self.repository.storage)
+        )
+        with self.snapshots.transaction():
+            result = importer.import_catalog(catalog, prune_removed)
+            
+            # Follow renamed and pruned keys in the eligibility index and calendar
+            for old_key, new_key in result.renamed.items():
+                self.eligibility_index.remove(old_key)
+                self.reactivation_calendar.cancel(old_key)
+                progress = self.repository.get_progress(new_key)
+                if progress is not None:
+                    self._index_progress(new_key, progress)
+                    self._schedule_reactivation(new_key, progress)
+            if prune_removed:
+                for word_key in result.removed:
+                    self.eligibility_index.remove(word_key)
+                    self.reactivation_calendar.cancel(word_key)
+            if result.has_changes:
+                self.snapshots.replace(dict(self.repository.get_all_progress().items()))
+        
+        self.event_bus.publish(Event('vocabulary_imported', result.summary()))
+        return result
+    
+    def sync_progress(self, sync_engine):
+        """Run a delta sync and refresh the eligibility index for pulled records"""
+        # The round trip runs without the snapshot lock so saves are not held
+        # up by the network; pulled records are republished afterwards
+        report = sync_engine.sync()
+        if report.pulled_keys:
+            with self.snapshots.transaction() as snapshot_records:
+                self._refresh_stored(report.pulled_keys, snapshot_records)
         
+        self.event_bus.publish(Event('progress_synced', {
+            'pushed': report.pushed,
+            'pulled': report.pulled,
+            'conflicts': report.conflicts
+        }))
+        return report
+    
+    def merge_remote_progress(self, replica, deltas: dict) -> list[str]:
+        """Fold another device's CRDT deltas in through ``replica`` (a
+        ProgressReplica over this service's repository), then refresh the
+        snapshot, eligibility index and reactivation calendar for the merged
+        records; returns the words that changed"""
+        with self.snapshots.transaction() as snapshot_records:
+            changed = replica.apply_remote(deltas)
+            self._refresh_stored(changed, snapshot_records)
+        return changed
+    
+    def save_warm_start(self):
+        """Snapshot the decoded progress, eligibility index and reactivation
+        calendar so the next start at the same storage generation skips
+        parsing (call on shutdown)"""
+        if self.warm_start is not None:
+            self.warm_start.save(self._storage_generation(), {
+                'records': pack_records(dict(self.snapshot().records.items()), EnhancedLearningProgress),
+                'minutes': self.eligibility_index.minutes(),
+                'calendar': self.reactivation_calendar.entries()
+            })
+    
+    def _load_warm_start(self) -> bool:
+        if self.warm_start is None:
+            return False
+        state = self.warm_start.load(self._storage_generation())
+        if state is None:
+            return False
+        records = unpack_records(state['records'], EnhancedLearningProgress)
+        self.eligibility_index.load(*state['minutes'])
+        if 'calendar' in state:
+            self.reactivation_calendar.load(*state['calendar'])
+        else:
+            # Snapshot from before the calendar existed
+            for word_key, progress in records.items():
+                self._schedule_reactivation(word_key, progress)
+        self.snapshots.replace(records)
+        return True
+    
+    def _storage_generation(self) -> Optional[str]:
+        get_generation = getattr(self.repository.storage, 'get_generation', None)
+        return get_generation() if get_generation is not None else None
+    
+    def _rebuild_eligibility_index(self):
+        """Rebuild the eligibility index, the reactivation calendar and the
+        published snapshot from storage"""
+        self.eligibility_index.clear()
+        self.reactivation_calendar.clear()
+        all_progress = dict(self.repository.get_all_progress().items())
         for word_key, progress in all_progress.items():
-            progress.exposures_today = 0
-            progress.last_exposure_time = ""
-            progress.next_allowed_time = datetime.now().isoformat()
+            self._index_progress(word_key, progress)
+            self._schedule_reactivation(word_key, progress)
+        self.snapshots.replace(all_progress)
+    
+    def _refresh_stored(self, word_keys, snapshot_records):
+        """Re-read words written to storage behind the service's back (sync
+        pulls, replica merges) into the snapshot, index and calendar"""
+        if not word_keys:
+            return
+        records = self.repository.get_records(word_keys)
+        for word_key in word_keys:
+            if word_key in records:
+                progress = EnhancedLearningProgress.from_dict(word_key, records[word_key])
+                snapshot_records[word_key] = progress
+                self._index_progress(word_key, progress)
+                self._schedule_reactivation(word_key, progress)
+            else:
+                snapshot_records.pop(word_key, None)
+                self.eligibility_index.remove(word_key)
+                self.reactivation_calendar.cancel(word_key)
+    
+    def _log_review(self, word_key: str, outcome: Optional[bool], action: str):
+        log = self.review_log
+        log.append(word_key, outcome, action)
+        if log.unsaved >= self.REVIEW_LOG_FLUSH_EVERY:
+            self.save_review_log()
+    
+    def _save(self, word_key: str, progress: EnhancedLearningProgress):
+        """Store a word's progress and publish it to snapshot readers. The
+        caller keeps mutating its object, so snapshots get a copy."""
+        with self.snapshots.transaction() as records:
             self.repository.save_progress(word_key, progress)
-        
-        # Publish reset event
-        event_bus.publish(Event('exposure_count_reset', {}))
+            records[word_key] = copy(progress)
+        self._schedule_reactivation(word_key, progress)
+    
+    def _index_progress(self, word_key: str, progress: EnhancedLearningProgress):
+        """Keep the eligibility index in sync with a word's stored progress"""
+        if progress.retired:
+            self.eligibility_index.remove(word_key)
+        else:
+            minute = self.timing_calculator.to_epoch_minute(progress.next_allowed_time)
+            self.eligibility_index.update(word_key, minute)
+    
+    def _schedule_reactivation(self, word_key: str, progress: EnhancedLearningProgress):
+        """Keep the reactivation calendar in sync with a word's stored progress"""
+        if progress.retired:
+            # Words retired before retirement had a return day stay retired
+            on_hiatus = bool(progress.next_review_date)
+        else:
+            on_hiatus = progress.is_mastered
+        if on_hiatus:
+            self.reactivation_calendar.schedule(word_key, day_of(progress.next_review_date))
+        else:
+            self.reactivation_calendar.cancel(word_key)
     
     def _handle_word_reviewed(self, event: Event):
         """Handle word review event"""
@@ -146,6 +429,9 @@ class EnhancedLearningProgressService:
         
         if is_correct:
             self.handle_implicit_review(word_key)
+        else:
+            # Progress only advances on recall, but misses belong in the history
+            self._log_review(word_key, False, 'review')
     
     def _handle_playback_completed(self, event: Event):
         """Handle playback completion event"""
@@ -154,5 +440,7 @@ class EnhancedLearningProgressService:
         self.handle_implicit_review(word_key)
     
     def _handle_date_changed(self, event: Event):
-        """Handle date change event"""
-        self.reset_daily_exposures()
\ No newline at end of file
+        """Handle date change event: reset exposures and bring back words
+        whose hiatus has ended (as the nightly batch does)"""
+        self.reset_daily_exposures()
+        self.reactivate_due_words(event.data.get('current_date'))
\ No newline at end of file
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Lazy load measurement - open a stored progress map and update one word
+
+The baseline is the previous repository path: parse the whole map, change
+one record, serialize the whole map. The lazy path is a fresh
+LearningProgressRepository doing get_progress + save_progress, so every
+repeat pays the cold open. Both must leave byte-identical text in storage.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+
+from repositories.learning_progress_repository import MIGRATIONS, LearningProgressRepository
+from serialization_benchmark import _best, _records
+from shared.serialization import dumps, loads
+from storage_simulator import LocalStorageSimulator
+
+def _touch(data: dict) -> dict:
+    data['reviewCount'] += 1
+    data['lastPlayedDate'] = '2026-01-02'
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description='Time a one-word update against a full parse')
+    parser.add_argument('--words', type=int, nargs='+', default=[3000, 100000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    key = LearningProgressRepository.STORAGE_KEY
+    print(f"{'words':>7}  {'full parse ms':>14}{'lazy ms':>10}{'speedup':>9}")
+    for count in args.words:
+        stored = dumps({word: p.to_dict() for word, p in _records(count).items()})
+        word = f'vocab{count // 2 + 1}'
+        
+        def full():
+            all_progress = loads(stored)
+            _touch(all_progress[word])
+            return dumps(all_progress)
+        
+        def lazy():
+            # 100k-word maps are far over the browser quota; no quota here
+            storage = LocalStorageSimulator({
+                key: stored,
+                LearningProgressRepository.VERSION_KEY: str(MIGRATIONS.current_version)
+            }, quota_bytes=None)
+            repository = LearningProgressRepository(storage=storage)
+            progress = repository.get_progress(word)
+            progress.review_count += 1
+            progress.last_played_date = '2026-01-02'
+            repository.save_progress(word, progress)
+            return storage.get_item(key)
+        
+        if lazy() != full():
+            raise AssertionError('lazy update wrote different text')
+        full_ms, lazy_ms = _best(full, args.repeats), _best(lazy, args.repeats)
+        print(f'{count:>7}  {full_ms:>14.2f}{lazy_ms:>10.2f}{full_ms / lazy_ms:>8.1f}x')
+
+if __name__ == '__main__':
+    main()
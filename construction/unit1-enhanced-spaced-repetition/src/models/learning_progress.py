@@ -1,9 +1,15 @@
 """
 Enhanced Learning Progress domain model
 """
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+
+from shared.serialization import camel_case, compile_record_codec
 
 @dataclass
 class EnhancedLearningProgress:
@@ -30,37 +36,17 @@ class EnhancedLearningProgress:
     
     def to_dict(self) -> dict:
         """Convert to dictionary for localStorage storage"""
-        return {
-            'word': self.word,
-            'category': self.category,
-            'isLearned': self.is_learned,
-            'status': self.status,
-            'createdDate': self.created_date,
-            'exposuresToday': self.exposures_today,
-            'lastExposureTime': self.last_exposure_time,
-            'nextAllowedTime': self.next_allowed_time,
-            'reviewCount': self.review_count,
-            'nextReviewDate': self.next_review_date,
-            'lastPlayedDate': self.last_played_date,
-            'isMastered': self.is_mastered,
-            'retired': self.retired
-        }
+        return _CODEC.encode(self)
     
     @classmethod
     def from_dict(cls, word_key: str, data: dict) -> 'EnhancedLearningProgress':
         """Create from dictionary (localStorage format)"""
-        return cls(
-            word=word_key,
-            category=data.get('category', ''),
-            is_learned=data.get('isLearned', False),
-            status=data.get('status', 'new'),
-            created_date=data.get('createdDate', datetime.now().isoformat().split('T')[0]),
-            exposures_today=data.get('exposuresToday', 0),
-            last_exposure_time=data.get('lastExposureTime', ''),
-            next_allowed_time=data.get('nextAllowedTime', datetime.now().isoformat()),
-            review_count=data.get('reviewCount', 0),
-            next_review_date=data.get('nextReviewDate'),
-            last_played_date=data.get('lastPlayedDate'),
-            is_mastered=data.get('isMastered', False),
-            retired=data.get('retired', False)
-        )
\ No newline at end of file
+        return _CODEC.decode(word_key, data)
+    
+    @classmethod
+    def from_map(cls, records: Dict[str, dict]) -> Dict[str, 'EnhancedLearningProgress']:
+        """Decode a whole ``{word_key: data}`` map in one pass"""
+        return _CODEC.decode_map(records)
+
+# camelCase keys, the word taken from the map key, dataclass defaults for missing keys
+_CODEC = compile_record_codec(EnhancedLearningProgress, camel_case, key_attr='word')
@@ -0,0 +1,285 @@
+"""
+Mergeable (CRDT) learning progress - per-field state that converges across devices
+"""
+import time
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from models.learning_progress import EnhancedLearningProgress
+
+# (wall clock ms, logical counter, node id) - compared as a tuple
+Timestamp = Tuple[int, int, str]
+
+ZERO_TIMESTAMP: Timestamp = (0, 0, '')
+
+# Fields merged as last-writer-wins registers
+LWW_FIELDS = (
+    'category',
+    'is_learned',
+    'status',
+    'created_date',
+    'last_exposure_time',
+    'next_allowed_time',
+    'next_review_date',
+    'last_played_date',
+    'is_mastered'
+)
+
+class HybridLogicalClock:
+    """Timestamps that follow wall time but never run backwards, and that
+    move past any remote timestamp this node has observed"""
+    
+    def __init__(self, node_id: str, wall_clock=None):
+        self.node_id = node_id
+        self._wall_clock = wall_clock or (lambda: int(time.time() * 1000))
+        self._last: Tuple[int, int] = (0, 0)
+    
+    @property
+    def last(self) -> Tuple[int, int]:
+        return self._last
+    
+    def now(self) -> Timestamp:
+        wall = self._wall_clock()
+        last_wall, last_counter = self._last
+        if wall > last_wall:
+            self._last = (wall, 0)
+        else:
+            self._last = (last_wall, last_counter + 1)
+        return (*self._last, self.node_id)
+    
+    def observe(self, timestamp: Timestamp):
+        remote_wall, remote_counter = timestamp[0], timestamp[1]
+        wall = max(self._wall_clock(), self._last[0], remote_wall)
+        counter = 0
+        if wall == self._last[0]:
+            counter = max(counter, self._last[1] + 1)
+        if wall == remote_wall:
+            counter = max(counter, remote_counter + 1)
+        self._last = (wall, counter)
+
+class GCounter:
+    """Grow-only counter: one monotonic count per node, merged by max"""
+    
+    def __init__(self, counts: Optional[Dict[str, int]] = None):
+        self.counts: Dict[str, int] = dict(counts or {})
+    
+    @property
+    def value(self) -> int:
+        return sum(self.counts.values())
+    
+    def increment(self, node_id: str, amount: int = 1):
+        if amount < 0:
+            raise ValueError('GCounter cannot decrease')
+        self.counts[node_id] = self.counts.get(node_id, 0) + amount
+    
+    def merge(self, counts: Dict[str, int]) -> bool:
+        changed = False
+        for node_id, count in counts.items():
+            if count > self.counts.get(node_id, 0):
+                self.counts[node_id] = count
+                changed = True
+        return changed
+
+@dataclass
+class LWWRegister:
+    value: Any = None
+    timestamp: Timestamp = ZERO_TIMESTAMP
+    
+    def set(self, value: Any, timestamp: Timestamp):
+        self.merge(value, timestamp)
+    
+    def merge(self, value: Any, timestamp: Timestamp) -> bool:
+        if tuple(timestamp) > tuple(self.timestamp):
+            self.value = value
+            self.timestamp = tuple(timestamp)
+            return True
+        return False
+
+@dataclass
+class AddWinsFlag:
+    """Observed-remove flag: enabling adds a unique tag, disabling removes
+    only the tags seen so far, so a concurrent enable survives a disable"""
+    adds: Set[str] = field(default_factory=set)
+    removes: Set[str] = field(default_factory=set)
+    
+    @property
+    def value(self) -> bool:
+        return bool(self.adds - self.removes)
+    
+    def enable(self, tag: str):
+        self.adds.add(tag)
+    
+    def disable(self):
+        self.removes |= self.adds
+    
+    def merge(self, adds, removes) -> bool:
+        before = (len(self.adds), len(self.removes))
+        self.adds |= set(adds)
+        self.removes |= set(removes)
+        return before != (len(self.adds), len(self.removes))
+
+class MergeableProgress:
+    """CRDT form of EnhancedLearningProgress.
+
+    - review_count: GCounter minus an LWW "reset base" (retirement resets
+      the visible count without shrinking the counter)
+    - exposures_today: GCounter for the most recent exposure day
+    - retired: add-wins flag
+    - everything else: LWW registers stamped by a hybrid logical clock
+
+    ``merge_delta`` is commutative, associative and idempotent; a full state
+    is just a delta that mentions every field.
+    """
+    
+    def __init__(self, word: str):
+        self.word = word
+        self.reviews = GCounter()
+        self.review_base = LWWRegister(0)
+        self.exposure_day = ''
+        self.exposures = GCounter()
+        self.retired = AddWinsFlag()
+        self.registers: Dict[str, LWWRegister] = {name: LWWRegister() for name in LWW_FIELDS}
+    
+    @property
+    def review_count(self) -> int:
+        return max(0, self.reviews.value - self.review_base.value)
+    
+    def record_local(self, progress: EnhancedLearningProgress, clock: HybridLogicalClock) -> dict:
+        """Turn a locally edited record into field operations; returns the delta"""
+        node_id = clock.node_id
+        delta: Dict[str, Any] = {}
+        current = self.to_progress()
+        
+        if progress.review_count > current.review_count:
+            self.reviews.increment(node_id, progress.review_count - current.review_count)
+            delta['reviews'] = {node_id: self.reviews.counts[node_id]}
+        elif progress.review_count < current.review_count:
+            # A reset (retirement): hide reviews counted so far
+            timestamp = clock.now()
+            self.review_base.set(self.reviews.value - progress.review_count, timestamp)
+            delta['reviewBase'] = [self.review_base.value, list(timestamp)]
+        
+        day = (progress.last_exposure_time or '').split('T')[0]
+        if day and day > self.exposure_day:
+            self.exposure_day, self.exposures = day, GCounter()
+        if day == self.exposure_day and progress.exposures_today > self.exposures.value:
+            self.exposures.increment(node_id, progress.exposures_today - self.exposures.value)
+            delta['exposures'] = {'day': day, 'counts': {node_id: self.exposures.counts[node_id]}}
+        
+        if progress.retired != current.retired:
+            if progress.retired:
+                timestamp = clock.now()
+                self.retired.enable(f'{node_id}:{timestamp[0]}:{timestamp[1]}')
+            else:
+                self.retired.disable()
+            delta['retired'] = {'adds': sorted(self.retired.adds), 'removes': sorted(self.retired.removes)}
+        
+        changed = {}
+        for name in LWW_FIELDS:
+            value = getattr(progress, name)
+            if value != getattr(current, name) or self.registers[name].timestamp == ZERO_TIMESTAMP:
+                timestamp = clock.now()
+                self.registers[name].set(value, timestamp)
+                changed[name] = [value, list(timestamp)]
+        if changed:
+            delta['lww'] = changed
+        return delta
+    
+    def merge_delta(self, delta: dict, clock: Optional[HybridLogicalClock] = None) -> bool:
+        """Fold a remote delta (or full state) in; returns True if anything changed"""
+        changed = False
+        if 'reviews' in delta:
+            changed |= self.reviews.merge(delta['reviews'])
+        if 'reviewBase' in delta:
+            value, timestamp = delta['reviewBase']
+            changed |= self.review_base.merge(value, tuple(timestamp))
+            self._observe(clock, timestamp)
+        if 'exposures' in delta:
+            day = delta['exposures']['day']
+            if day > self.exposure_day:
+                self.exposure_day, self.exposures = day, GCounter()
+                changed = True
+            if day == self.exposure_day:
+                changed |= self.exposures.merge(delta['exposures']['counts'])
+        if 'retired' in delta:
+            changed |= self.retired.merge(delta['retired']['adds'], delta['retired']['removes'])
+        for name, (value, timestamp) in delta.get('lww', {}).items():
+            if name in self.registers:
+                changed |= self.registers[name].merge(value, tuple(timestamp))
+                self._observe(clock, timestamp)
+        return changed
+    
+    def merge(self, other: 'MergeableProgress', clock: Optional[HybridLogicalClock] = None) -> bool:
+        return self.merge_delta(other.to_dict(), clock)
+    
+    def to_progress(self) -> EnhancedLearningProgress:
+        progress = EnhancedLearningProgress(word=self.word)
+        for name, register in self.registers.items():
+            if register.timestamp != ZERO_TIMESTAMP:
+                setattr(progress, name, register.value)
+        progress.review_count = self.review_count
+        # Exposure counts are per day; an older day's count no longer applies
+        today = datetime.now().isoformat().split('T')[0]
+        progress.exposures_today = self.exposures.value if self.exposure_day == today else 0
+        progress.retired = self.retired.value
+        return progress
+    
+    def to_dict(self) -> dict:
+        return {
+            'reviews': dict(self.reviews.counts),
+            'reviewBase': [self.review_base.value, list(self.review_base.timestamp)],
+            'exposures': {'day': self.exposure_day, 'counts': dict(self.exposures.counts)},
+            'retired': {'adds': sorted(self.retired.adds), 'removes': sorted(self.retired.removes)},
+            'lww': {
+                name: [register.value, list(register.timestamp)]
+                for name, register in self.registers.items()
+                if register.timestamp != ZERO_TIMESTAMP
+            }
+        }
+    
+    @classmethod
+    def from_dict(cls, word: str, data: dict) -> 'MergeableProgress':
+        state = cls(word)
+        state.merge_delta(data)
+        return state
+    
+    @staticmethod
+    def _observe(clock: Optional[HybridLogicalClock], timestamp: List):
+        if clock is not None:
+            clock.observe(tuple(timestamp))
+
+def combine_deltas(first: dict, second: dict) -> dict:
+    """Fold two deltas for the same record into one (as if both were sent)"""
+    combined = dict(first)
+    if 'reviews' in second:
+        reviews = dict(combined.get('reviews', {}))
+        for node_id, count in second['reviews'].items():
+            reviews[node_id] = max(count, reviews.get(node_id, 0))
+        combined['reviews'] = reviews
+    if 'reviewBase' in second:
+        if 'reviewBase' not in combined or second['reviewBase'][1] > combined['reviewBase'][1]:
+            combined['reviewBase'] = second['reviewBase']
+    if 'exposures' in second:
+        previous = combined.get('exposures')
+        current = second['exposures']
+        if previous is None or current['day'] > previous['day']:
+            combined['exposures'] = current
+        elif current['day'] == previous['day']:
+            counts = dict(previous['counts'])
+            for node_id, count in current['counts'].items():
+                counts[node_id] = max(count, counts.get(node_id, 0))
+            combined['exposures'] = {'day': current['day'], 'counts': counts}
+    if 'retired' in second:
+        previous = combined.get('retired', {'adds': [], 'removes': []})
+        combined['retired'] = {
+            'adds': sorted(set(previous['adds']) | set(second['retired']['adds'])),
+            'removes': sorted(set(previous['removes']) | set(second['retired']['removes']))
+        }
+    if 'lww' in second:
+        registers = dict(combined.get('lww', {}))
+        for name, (value, timestamp) in second['lww'].items():
+            if name not in registers or timestamp > registers[name][1]:
+                registers[name] = [value, timestamp]
+        combined['lww'] = registers
+    return combined
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Nightly batch job - rolls every stored learner over to the new day
+
+    python nightly_batch.py --data-dir users --workers 8 --chunk-size 200 --severity moderate
+
+For each learner under the progress API's data directory: reset daily
+exposures, return mastered and retired words whose hiatus has ended to the
+rotation, and precompute today's daily selection, so the first request of
+the day finds everything ready. Learners are processed in chunks across a
+process pool. Completed chunks are recorded in a checkpoint file and each
+learner is stamped with the date it was rolled over, so an interrupted run
+picks up where it stopped when started again the same day.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+import json
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional, Set
+
+from common_types import DAILY_SELECTION_SIZES, SeverityLevel
+from progress_api_server import UserSession, UserStoreDirectory
+from shared.sharded_layout import ShardedLayout
+
+LAST_ROLLOVER_KEY = 'lastRolloverDate'
+
+@dataclass
+class ChunkResult:
+    """Outcome of one chunk, returned from a worker process"""
+    chunk_id: str
+    users: int = 0
+    skipped: int = 0
+    words_reset: int = 0
+    reactivated: int = 0
+    selections: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+def roll_over_user(session: UserSession, today: str, severity: SeverityLevel) -> Optional[ChunkResult]:
+    """Run the day's rollover for one learner; None if already done today"""
+    storage = session.storage
+    if storage.get_item(LAST_ROLLOVER_KEY) == today:
+        return None
+    result = ChunkResult(chunk_id='')
+    progress_service = session.progress_service
+    
+    progress_service.reset_daily_exposures()
+    result.words_reset = len(progress_service.snapshot().records)
+    result.reactivated = len(progress_service.reactivate_due_words(today))
+    session.selection_service.get_daily_selection(severity)
+    result.selections = 1
+    
+    storage.set_item(LAST_ROLLOVER_KEY, today)
+    return result
+
+def process_chunk(data_dir: str, chunk_id: str, user_keys: List[str], today: str,
+                  severity: SeverityLevel) -> ChunkResult:
+    """Worker entry point: roll over and write back each learner in the chunk"""
+    started = time.perf_counter()
+    store = UserStoreDirectory(data_dir)
+    result = ChunkResult(chunk_id=chunk_id)
+    for user_key in user_keys:
+        try:
+            session = store.load(user_key)
+            outcome = roll_over_user(session, today, severity)
+            if outcome is None:
+                result.skipped += 1
+                continue
+            store.save(user_key, session)
+        except Exception as error:
+            result.errors.append(f'{user_key}: {type(error).__name__}: {error}')
+            continue
+        result.users += 1
+        result.words_reset += outcome.words_reset
+        result.reactivated += outcome.reactivated
+        result.selections += outcome.selections
+    result.seconds = time.perf_counter() - started
+    return result
+
+def chunked(user_keys: List[str], chunk_size: int) -> Iterator[List[str]]:
+    for start in range(0, len(user_keys), chunk_size):
+        yield user_keys[start:start + chunk_size]
+
+class Checkpoint:
+    """Chunks finished for one day, persisted after every chunk.
+
+    A chunk is identified by its first user key, which stays stable while the
+    sorted learner list does; learners that move to another chunk between runs
+    are caught by their rollover stamp instead.
+    """
+    
+    def __init__(self, path: str, today: str):
+        self.path = path
+        self.today = today
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('date') == today:
+                self.done = set(data.get('done', []))
+    
+    def mark_done(self, chunk_id: str):
+        self.done.add(chunk_id)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'date': self.today, 'done': sorted(self.done)}, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+def run_batch(data_dir: str, severity: SeverityLevel = 'moderate', workers: Optional[int] = None,
+              chunk_size: int = 200, checkpoint_path: Optional[str] = None,
+              restart: bool = False, report_every: float = 1.0) -> ChunkResult:
+    today = datetime.now().strftime('%Y-%m-%d')
+    user_keys = sorted(ShardedLayout(data_dir).users())
+    checkpoint_path = checkpoint_path or os.path.join(data_dir, f'.nightly-{today}.checkpoint')
+    if restart and os.path.exists(checkpoint_path):
+        os.unlink(checkpoint_path)
+    checkpoint = Checkpoint(checkpoint_path, today)
+    
+    chunks = [chunk for chunk in chunked(user_keys, chunk_size) if chunk[0] not in checkpoint.done]
+    pending_users = sum(len(chunk) for chunk in chunks)
+    print(f'Nightly rollover for {today}: {len(user_keys)} learners, '
+          f'{len(chunks)} chunks of up to {chunk_size} to run '
+          f'({len(checkpoint.done)} already done), severity {severity}')
+    
+    totals = ChunkResult(chunk_id='total')
+    started = time.perf_counter()
+    last_report = started
+    finished_chunks = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        running = {
+            executor.submit(process_chunk, data_dir, chunk[0], chunk, today, severity)
+            for chunk in chunks
+        }
+        while running:
+            done, running = wait(running, timeout=report_every, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                finished_chunks += 1
+                for name in ('users', 'skipped', 'words_reset', 'reactivated', 'selections'):
+                    setattr(totals, name, getattr(totals, name) + getattr(result, name))
+                totals.errors.extend(result.errors)
+                # Chunks with failures are retried by the next run
+                if not result.errors:
+                    checkpoint.mark_done(result.chunk_id)
+            
+            now = time.perf_counter()
+            if now - last_report >= report_every or not running:
+                last_report = now
+                handled = totals.users + totals.skipped + len(totals.errors)
+                rate = handled / (now - started) if now > started else 0.0
+                eta = (pending_users - handled) / rate if rate else 0.0
+                print(f'  [{finished_chunks:>{len(str(len(chunks)))}}/{len(chunks)} chunks] '
+                      f'{handled}/{pending_users} learners, {rate:.0f} learners/s, eta {eta:.0f}s',
+                      file=sys.stderr)
+    totals.seconds = time.perf_counter() - started
+    return totals
+
+def print_report(totals: ChunkResult):
+    handled = totals.users + totals.skipped
+    rate = handled / totals.seconds if totals.seconds else 0.0
+    print(f'{totals.users} learners rolled over, {totals.skipped} already done, '
+          f'{len(totals.errors)} errors in {totals.seconds:.2f}s -> {rate:.0f} learners/s')
+    print(f'  {totals.words_reset} words reset, {totals.reactivated} words reactivated, '
+          f'{totals.selections} daily selections precomputed')
+    for error in totals.errors[:5]:
+        print(f'  error: {error}')
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Roll every stored learner over to the new day')
+    parser.add_argument('--data-dir', default='users', help='progress API data directory')
+    parser.add_argument('--severity', choices=sorted(DAILY_SELECTION_SIZES), default='moderate')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=200, help='learners per task')
+    parser.add_argument('--checkpoint', help='checkpoint file (default: in the data directory)')
+    parser.add_argument('--restart', action='store_true', help='ignore the checkpoint of an earlier run today')
+    parser.add_argument('--json', action='store_true', help='print the totals as JSON')
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    
+    totals = run_batch(args.data_dir, args.severity, args.workers, args.chunk_size,
+                       args.checkpoint, args.restart)
+    if args.json:
+        print(json.dumps(asdict(totals)))
+    else:
+        print_report(totals)
+    return 1 if totals.errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
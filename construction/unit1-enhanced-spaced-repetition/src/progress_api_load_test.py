@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Load test for the multi-user progress API - reports requests/second and latency percentiles
+
+    python progress_api_load_test.py --users 500 --capacity 100 --concurrency 16 --requests 20000
+    python progress_api_load_test.py --url http://127.0.0.1:8080 ...   (against a running server)
+    python progress_api_load_test.py --sweep 1000 10000 100000 ...     (latency as learners grow)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import http.client
+import json
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+# (weight, method, endpoint) - roughly what a playback session sends
+REQUEST_MIX = [
+    (50, 'GET', 'due'),
+    (25, 'POST', 'reviews'),
+    (10, 'GET', 'daily-selection'),
+    (10, 'GET', 'stats'),
+    (5, 'POST', 'retire')
+]
+
+WORDS = [f'word{i}' for i in range(200)]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def _worker(host: str, port: int, users: int, count: int, seed: int,
+            latencies: Dict[str, List[float]], errors: List[str], lock: threading.Lock):
+    rng = random.Random(seed)
+    weights = [weight for weight, _, _ in REQUEST_MIX]
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    local_latencies = defaultdict(list)
+    local_errors = []
+    
+    for _ in range(count):
+        _, method, endpoint = rng.choices(REQUEST_MIX, weights)[0]
+        user_key = f'user{rng.randrange(users)}'
+        body = None
+        headers = {}
+        if method == 'POST':
+            body = json.dumps({'word_key': rng.choice(WORDS)})
+            headers['Content-Type'] = 'application/json'
+        
+        start = time.perf_counter()
+        try:
+            connection.request(method, f'/users/{user_key}/{endpoint}', body, headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                local_errors.append(f'{method} {endpoint}: HTTP {response.status}')
+        except (OSError, http.client.HTTPException) as error:
+            local_errors.append(f'{method} {endpoint}: {error}')
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        local_latencies[endpoint].append(time.perf_counter() - start)
+    
+    connection.close()
+    with lock:
+        for endpoint, values in local_latencies.items():
+            latencies[endpoint].extend(values)
+        errors.extend(local_errors)
+
+def run_load_test(host: str, port: int, users: int, concurrency: int, requests: int,
+                  seed: int = 1) -> Tuple[float, Dict[str, List[float]], List[str]]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: List[str] = []
+    lock = threading.Lock()
+    per_worker = requests // concurrency
+    threads = [
+        threading.Thread(target=_worker, args=(host, port, users, per_worker, seed + i,
+                                               latencies, errors, lock))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies, errors
+
+def print_report(elapsed: float, latencies: Dict[str, List[float]], errors: List[str]):
+    all_values = sorted(value for values in latencies.values() for value in values)
+    print(f'{len(all_values)} requests in {elapsed:.2f}s -> {len(all_values) / elapsed:.0f} req/s, '
+          f'{len(errors)} errors')
+    print(f'{"endpoint":<18}{"count":>8}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+    rows = sorted(latencies.items()) + [('all', all_values)]
+    for endpoint, values in rows:
+        values = sorted(values)
+        print(f'{endpoint:<18}{len(values):>8}'
+              f'{percentile(values, 0.50) * 1000:>10.2f}'
+              f'{percentile(values, 0.95) * 1000:>10.2f}'
+              f'{percentile(values, 0.99) * 1000:>10.2f}')
+    for error in errors[:5]:
+        print(f'  error: {error}')
+
+def _start_embedded_server(capacity: int):
+    from progress_api_server import ProgressApiServer
+    data_dir = tempfile.mkdtemp(prefix='progress-api-')
+    server = ProgressApiServer(('127.0.0.1', 0), data_dir, capacity)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, data_dir
+
+def _stop_embedded_server(server):
+    server.shutdown()
+    server.server_close()
+
+def _cache_report(server) -> str:
+    stats = server.cache.stats()
+    return (f'cache: {stats.size}/{stats.capacity} open, {stats.hits} hits, '
+            f'{stats.misses} misses, {stats.evictions} evictions '
+            f'(hit rate {stats.hit_rate:.1%}, eviction rate {stats.eviction_rate:.1%}), '
+            f'{server.store.writes} write-backs')
+
+def run_sweep(user_counts: List[int], capacity: int, concurrency: int, requests: int):
+    """Same request load against a fresh server per learner count; per-request
+    latency should not grow with the number of learners on disk"""
+    print(f'{"learners":>9}{"req/s":>8}{"p50 ms":>9}{"p99 ms":>9}{"hit rate":>10}{"evict rate":>12}')
+    for users in user_counts:
+        server, data_dir = _start_embedded_server(capacity)
+        # Every learner has been seen before, so the data dir holds `users` files
+        run_load_test('127.0.0.1', server.server_port, users, concurrency, max(requests, users))
+        server.cache.flush()
+        warm_hits, warm_misses = server.cache.stats().hits, server.cache.stats().misses
+        elapsed, latencies, errors = run_load_test('127.0.0.1', server.server_port, users,
+                                                   concurrency, requests, seed=1000)
+        stats = server.cache.stats()
+        lookups = stats.hits + stats.misses - warm_hits - warm_misses
+        values = sorted(value for values in latencies.values() for value in values)
+        print(f'{users:>9}{len(values) / elapsed:>8.0f}'
+              f'{percentile(values, 0.50) * 1000:>9.2f}{percentile(values, 0.99) * 1000:>9.2f}'
+              f'{(stats.hits - warm_hits) / lookups:>10.1%}{stats.eviction_rate:>12.1%}'
+              f'{"  " + str(len(errors)) + " errors" if errors else ""}')
+        _stop_embedded_server(server)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the progress API')
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--capacity', type=int, default=100, help='cache capacity of the embedded server')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--sweep', type=int, nargs='+', metavar='USERS',
+                        help='run once per learner count on a fresh embedded server')
+    args = parser.parse_args(argv)
+    
+    if args.sweep:
+        run_sweep(args.sweep, args.capacity, args.concurrency, args.requests)
+        return
+    
+    server = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        server, data_dir = _start_embedded_server(args.capacity)
+        host, port = '127.0.0.1', server.server_port
+        print(f'Embedded server on port {port}, data in {data_dir}, capacity {args.capacity}')
+    
+    elapsed, latencies, errors = run_load_test(host, port, args.users, args.concurrency, args.requests)
+    print_report(elapsed, latencies, errors)
+    
+    if server is not None:
+        print(_cache_report(server))
+        _stop_embedded_server(server)
+
+if __name__ == '__main__':
+    main()
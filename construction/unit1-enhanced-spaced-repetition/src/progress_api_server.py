@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Multi-user progress API - serves Unit 1 scheduling to many learners from one process
+
+    python progress_api_server.py --port 8080 --data-dir users --capacity 256
+
+Endpoints (JSON):
+    GET  /users/<user>/due
+    POST /users/<user>/reviews           {"word_key": "..."}
+    POST /users/<user>/retire            {"word_key": "..."}
+    GET  /users/<user>/daily-selection   ?severity=light|moderate|intensive
+    GET  /users/<user>/stats
+    GET  /health
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+import json
+import re
+import tempfile
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from storage_simulator import LocalStorageSimulator, content_generation
+from event_bus import EventBus
+from enhanced_learning_progress_service import EnhancedLearningProgressService
+from services.daily_selection_service import DailySelectionService
+from shared.sharded_layout import ShardedLayout
+from shared.user_store_cache import UserStoreCache
+
+USER_KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+MAX_BODY_BYTES = 64 * 1024
+
+class TrackingLocalStorage(LocalStorageSimulator):
+    """localStorage simulator that remembers whether it has unsaved writes"""
+    
+    def __init__(self, items=None, generation=None):
+        super().__init__(items, generation=generation)
+        self.dirty = False
+    
+    def set_item(self, key: str, value: str):
+        super().set_item(key, value)
+        self.dirty = True
+    
+    def remove_item(self, key: str):
+        super().remove_item(key)
+        self.dirty = True
+    
+    def clear(self):
+        super().clear()
+        self.dirty = True
+
+class UserSession:
+    """One learner's isolated storage, event bus and services"""
+    
+    def __init__(self, storage: TrackingLocalStorage, warm_start_path: Optional[str] = None):
+        self.storage = storage
+        self.event_bus = EventBus()
+        self.progress_service = EnhancedLearningProgressService(storage, self.event_bus, warm_start_path)
+        self.selection_service = DailySelectionService(self.progress_service)
+        # Storage generation the learner's warm-start snapshot was taken at
+        self.snapshot_generation = storage.get_generation() if self.progress_service.warm_started else None
+
+class UserStoreDirectory:
+    """Persists each learner's localStorage as ``<data_dir>/<shard>/<user>.json``.
+
+    Files written by the old flat layout (``<data_dir>/<user>.json``) are
+    still read and are removed once the learner has been saved to a shard.
+    With ``warm_start`` each learner also gets a ``<user>.warm`` snapshot of
+    decoded progress, written back with the store and used on the next load
+    while it matches the stored data: a loaded store takes the
+    ``content_generation`` of its file, and a saved one adopts that of the
+    text just written.
+    """
+    
+    def __init__(self, data_dir: str, warm_start: bool = False):
+        self.data_dir = data_dir
+        self.layout = ShardedLayout(data_dir)
+        self.warm_start = warm_start
+        self.loads = 0
+        self.writes = 0
+        self.warm_loads = 0
+    
+    def load(self, user_key: str) -> UserSession:
+        self.loads += 1
+        items = {}
+        generation = None
+        path = self.layout.existing_path(user_key)
+        if path is not None:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            items = json.loads(text)
+            if self.warm_start:
+                generation = content_generation(text)
+        warm_start_path = self.layout.user_path(user_key, '.warm') if self.warm_start else None
+        session = UserSession(TrackingLocalStorage(items, generation), warm_start_path)
+        if session.progress_service.warm_started:
+            self.warm_loads += 1
+        return session
+    
+    def save(self, user_key: str, session: UserSession):
+        session.progress_service.save_review_log()
+        self._write_items(user_key, session)
+        generation = session.storage.get_generation()
+        if self.warm_start and session.snapshot_generation != generation:
+            session.progress_service.save_warm_start()
+            session.snapshot_generation = generation
+    
+    def _write_items(self, user_key: str, session: UserSession):
+        if not session.storage.dirty:
+            return
+        path = self.layout.user_path(user_key, create=True)
+        text = json.dumps(session.storage.items())
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        if self.warm_start:
+            session.storage.set_generation(content_generation(text))
+        legacy_path = self.layout.legacy_path(user_key)
+        if os.path.exists(legacy_path):
+            os.unlink(legacy_path)
+        session.storage.dirty = False
+        self.writes += 1
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+class ProgressApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], data_dir: str, capacity: int = 128,
+                 quiet: bool = True, warm_start: bool = False):
+        self.store = UserStoreDirectory(data_dir, warm_start)
+        self.cache = UserStoreCache(self.store.load, self.store.save, capacity)
+        self.quiet = quiet
+        super().__init__(address, ProgressApiHandler)
+    
+    def server_close(self):
+        super().server_close()
+        # Write back every learner still held in memory
+        self.cache.close()
+
+class ProgressApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response waits on the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        self._dispatch('GET')
+    
+    def do_POST(self):
+        self._dispatch('POST')
+    
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+    
+    def _dispatch(self, method: str):
+        try:
+            url = urlsplit(self.path)
+            body = self._read_body() if method == 'POST' else {}
+            status, payload = self._route(method, url.path.strip('/').split('/'), parse_qs(url.query), body)
+        except ApiError as error:
+            status, payload = error.status, {'error': str(error)}
+        except Exception as error:
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f'{type(error).__name__}: {error}'}
+        self._send(status, payload)
+    
+    def _route(self, method: str, parts: list, query: dict, body: dict):
+        if parts == ['health'] and method == 'GET':
+            return HTTPStatus.OK, {
+                'cache': asdict(self.server.cache.stats()),
+                'loads': self.server.store.loads,
+                'warm_loads': self.server.store.warm_loads,
+                'writes': self.server.store.writes
+            }
+        if len(parts) != 3 or parts[0] != 'users':
+            raise ApiError(HTTPStatus.NOT_FOUND, f'No route for {self.path}')
+        
+        user_key, action = parts[1], parts[2]
+        if not USER_KEY_PATTERN.match(user_key):
+            raise ApiError(HTTPStatus.BAD_REQUEST, 'Invalid user key')
+        
+        route = (method, action)
+        if route not in ROUTES:
+            raise ApiError(HTTPStatus.NOT_FOUND, f'No route for {method} {self.path}')
+        with self.server.cache.checkout(user_key) as session:
+            return HTTPStatus.OK, ROUTES[route](session, query, body)
+    
+    def _read_body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'Request body too large')
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, 'Request body is not valid JSON')
+        if not isinstance(body, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, 'Request body must be a JSON object')
+        return body
+    
+    def _send(self, status: HTTPStatus, payload: dict):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def _word_key(body: dict) -> str:
+    word_key = body.get('word_key')
+    if not isinstance(word_key, str) or not word_key:
+        raise ApiError(HTTPStatus.BAD_REQUEST, 'word_key is required')
+    return word_key
+
+def _get_due(session: UserSession, query: dict, body: dict) -> dict:
+    return {'words': session.progress_service.get_due_words()}
+
+def _record_review(session: UserSession, query: dict, body: dict) -> dict:
+    word_key = _word_key(body)
+    session.progress_service.handle_implicit_review(word_key)
+    return session.progress_service.get_progress(word_key).to_dict()
+
+def _retire(session: UserSession, query: dict, body: dict) -> dict:
+    word_key = _word_key(body)
+    session.progress_service.retire_word(word_key)
+    return session.progress_service.get_progress(word_key).to_dict()
+
+def _daily_selection(session: UserSession, query: dict, body: dict) -> dict:
+    severity = query.get('severity', ['moderate'])[0]
+    try:
+        return session.selection_service.get_daily_selection(severity)
+    except ValueError as error:
+        raise ApiError(HTTPStatus.BAD_REQUEST, str(error))
+
+def _stats(session: UserSession, query: dict, body: dict) -> dict:
+    return session.progress_service.get_stats()
+
+ROUTES = {
+    ('GET', 'due'): _get_due,
+    ('POST', 'reviews'): _record_review,
+    ('POST', 'retire'): _retire,
+    ('GET', 'daily-selection'): _daily_selection,
+    ('GET', 'stats'): _stats
+}
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description='Serve the progress API for many learners')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--data-dir', default='users', help='directory holding one JSON file per learner')
+    parser.add_argument('--capacity', type=int, default=128, help='learner stores kept in memory')
+    parser.add_argument('--warm-start', action='store_true',
+                        help='keep decoded-progress snapshots next to each learner file')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+    
+    server = ProgressApiServer((args.host, args.port), args.data_dir, args.capacity,
+                               quiet=not args.verbose, warm_start=args.warm_start)
+    print(f'Serving progress API on http://{args.host}:{server.server_port} '
+          f'(data: {args.data_dir}, capacity: {args.capacity})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print('Flushed learner stores, server stopped')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Delta sync measurement - payload size and round trips against a 3k-word store
+
+Two devices of one learner sync through an in-memory SQLite server stand-in;
+every request and response is JSON-encoded so byte counts match the wire.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from storage_simulator import LocalStorageSimulator
+from event_bus import EventBus
+from enhanced_learning_progress_service import EnhancedLearningProgressService
+from models.learning_progress import EnhancedLearningProgress
+from repositories.learning_progress_repository import LearningProgressRepository
+from services.progress_sync_engine import ProgressSyncEngine, SyncReport
+from shared.progress_sync_server import LoopbackTransport, SqliteProgressServer
+from shared.vocabulary_catalog import get_default_catalog
+
+USER_KEY = 'learner-1'
+
+def _device(transport: LoopbackTransport):
+    service = EnhancedLearningProgressService(LocalStorageSimulator(), EventBus())
+    return service, ProgressSyncEngine(service.repository, transport, USER_KEY)
+
+def _seed(repository: LearningProgressRepository, word_count: int) -> int:
+    updates = {}
+    for entry in get_default_catalog():
+        if len(updates) >= word_count:
+            break
+        updates.setdefault(entry.word, EnhancedLearningProgress(word=entry.word, category=entry.category))
+    repository.apply_changes(updates)
+    return len(updates)
+
+def _row(label: str, report: SyncReport):
+    print(f'{label:<38}{report.pushed:>7}{report.pulled:>7}{report.conflicts:>6}'
+          f'{report.round_trips:>5}{report.bytes_sent:>11,}{report.bytes_received:>11,}')
+
+def main(word_count: int = 3000):
+    server = SqliteProgressServer()
+    transport = LoopbackTransport(server)
+    
+    device_a, engine_a = _device(transport)
+    stored = _seed(device_a.repository, word_count)
+    device_b, engine_b = _device(transport)
+    full_blob = len(device_a.repository.storage.get_item(LearningProgressRepository.STORAGE_KEY).encode('utf-8'))
+    
+    print(f'{stored} words, full learningProgress blob: {full_blob:,} bytes')
+    print(f'{"step":<38}{"pushed":>7}{"pulled":>7}{"conf":>6}{"RT":>5}{"sent B":>11}{"recv B":>11}')
+    _row('A: initial upload', device_a.sync_progress(engine_a))
+    _row('B: initial download', device_b.sync_progress(engine_b))
+    
+    word_key = next(iter(engine_a.tracker.server_versions))
+    device_a.handle_implicit_review(word_key)
+    one_word = device_a.sync_progress(engine_a)
+    _row('A: push one reviewed word', one_word)
+    _row('B: pull one reviewed word', device_b.sync_progress(engine_b))
+    _row('A: no changes', device_a.sync_progress(engine_a))
+    
+    # Both devices review the same word before syncing
+    device_a.handle_implicit_review(word_key)
+    device_b.handle_implicit_review(word_key)
+    device_b.handle_implicit_review(word_key)
+    _row('A: push concurrent edit', device_a.sync_progress(engine_a))
+    _row('B: conflicting edit (B more reviewed)', device_b.sync_progress(engine_b))
+    _row('A: pull resolved record', device_a.sync_progress(engine_a))
+    
+    a_record = device_a.repository.get_records([word_key])[word_key]
+    b_record = device_b.repository.get_records([word_key])[word_key]
+    print(f'\nConverged on {word_key!r}: {a_record == b_record} '
+          f'(reviewCount {a_record["reviewCount"]})')
+    one_word_bytes = one_word.bytes_sent + one_word.bytes_received
+    print(f'One-word sync: {one_word_bytes:,} bytes in {one_word.round_trips} round trips '
+          f'vs {full_blob:,} bytes for the whole map ({full_blob / one_word_bytes:.0f}x less)')
+    server.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Regression checks for Unit 1 storage and sync paths
+
+Each check builds its own in-memory storage and fails with an
+AssertionError when the behavior it covers breaks. Run them all with:
+    python regression_checks.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import tempfile
+from datetime import date, timedelta
+
+from enhanced_learning_progress_service import EnhancedLearningProgressService
+from storage_simulator import LocalStorageSimulator, QuotaExceededError
+from event_bus import Event, EventBus
+from models.learning_progress import EnhancedLearningProgress
+from repositories.learning_progress_repository import LearningProgressRepository
+from repositories.progress_change_tracker import ProgressChangeTracker
+from repositories.review_log_repository import ReviewLogRepository
+from services.daily_selection_service import DailySelectionService
+from services.progress_replica import ProgressReplica
+from services.progress_sync_engine import ProgressSyncEngine
+from shared.local_storage_simulator import LocalStorageSimulator as FileStorageSimulator
+from shared.progress_sync_server import LoopbackTransport, SqliteProgressServer
+from shared.review_log import SEGMENT_SIZE, ReviewLog
+from shared.sharded_layout import ShardedLayout
+from shared.storage_codec import decode
+from shared.vocabulary_catalog import VocabularyCatalog
+
+def _catalog(entries):
+    catalog = VocabularyCatalog()
+    for word, meaning in entries:
+        catalog._add('topic vocab', {'word': word, 'meaning': meaning})
+    return catalog
+
+def check_rename_onto_existing_progress():
+    """Renaming onto a key with progress keeps both words tracked"""
+    service = EnhancedLearningProgressService(LocalStorageSimulator(), EventBus())
+    service.import_vocabulary(_catalog([('colour', 'a hue')]))
+    service.update_word_exposure('colour')
+    service.update_word_exposure('color')
+    
+    result = service.import_vocabulary(_catalog([('color', 'a hue')]))
+    assert result.renamed == {}, result.renamed
+    assert result.removed == ['colour'] and result.added == ['color'], result.summary()
+    assert service.repository.get_progress('colour') is not None
+    for word_key in ('colour', 'color'):
+        assert word_key in service.eligibility_index, word_key
+        assert word_key in service.snapshot().records, word_key
+
+def check_replica_saves_touched_words():
+    """CRDT saves rewrite only the words they touch"""
+    storage = LocalStorageSimulator()
+    repository = LearningProgressRepository(storage)
+    words = [f'word{i}' for i in range(200)]
+    repository.apply_changes({word: EnhancedLearningProgress(word=word) for word in words})
+    replica = ProgressReplica(repository, 'phone')
+    replica.record_local(words)
+    replica.acknowledge(words)
+    
+    before = storage.get_item(ProgressReplica.STORAGE_KEY)
+    progress = repository.get_progress('word7')
+    progress.review_count += 1
+    repository.save_progress('word7', progress)
+    replica.record_local(['word7'])
+    after = storage.get_item(ProgressReplica.STORAGE_KEY)
+    # Every other record keeps its stored text
+    changed = before.index('"word7":')
+    assert after[:changed] == before[:changed]
+    assert after[-100:] == before[-100:]
+    
+    # Acknowledging only touches the outbox item
+    replica.acknowledge(['word7'])
+    assert storage.get_item(ProgressReplica.STORAGE_KEY) is after
+    
+    reopened = ProgressReplica(repository, 'phone')
+    assert reopened.state_of('word7').review_count == 1
+    assert reopened.take_outbox() == {}
+
+def check_quota_failure_leaves_storage_unchanged():
+    """A write over quota fails like the browser and changes nothing"""
+    storage = LocalStorageSimulator(quota_bytes=4096)
+    storage.set_item('learningProgress', 'x' * 1000)
+    usage, generation = storage.get_usage(), storage.get_generation()
+    try:
+        storage.set_item('learningProgress', 'x' * 3000)
+    except QuotaExceededError as error:
+        assert error.name == 'QuotaExceededError' and error.key == 'learningProgress'
+    else:
+        raise AssertionError('write over quota did not fail')
+    assert storage.get_item('learningProgress') == 'x' * 1000
+    assert storage.get_usage() == usage and storage.get_generation() == generation
+
+def check_daily_lists_evicted_for_live_state():
+    """Old daily lists are evicted, oldest first, to fit live state"""
+    storage = LocalStorageSimulator(quota_bytes=4096)
+    for day in range(1, 6):
+        storage.set_item(f'todayList_2026-01-0{day}', 'x' * 300)
+    storage.set_item('learningProgress', 'x' * 1000)
+    assert storage.evicted_count == 2, storage.evicted_count
+    assert storage.get_item('todayList_2026-01-01') is None
+    assert storage.get_item('todayList_2026-01-02') is None
+    assert storage.get_item('todayList_2026-01-03') is not None
+
+def check_daily_selection_keeps_recent_lists():
+    """Writing today's list removes lists past the history window"""
+    service = EnhancedLearningProgressService(LocalStorageSimulator(), EventBus())
+    selection = DailySelectionService(service, _catalog([('apple', 'a fruit')]))
+    today = date.today()
+    history = DailySelectionService.SELECTION_HISTORY_DAYS
+    old = [(today - timedelta(days=days)).isoformat() for days in (history + 5, history + 1)]
+    recent = [(today - timedelta(days=days)).isoformat() for days in (history, 1)]
+    for day in old + recent:
+        service.repository.storage.set_json(DailySelectionService.SELECTION_KEY_PREFIX + day, {})
+    
+    selection.get_daily_selection()
+    lists = {key for key in service.repository.storage.keys()
+             if key.startswith(DailySelectionService.SELECTION_KEY_PREFIX)}
+    assert lists == {DailySelectionService.SELECTION_KEY_PREFIX + day
+                     for day in recent + [today.isoformat()]}, sorted(lists)
+
+def check_one_word_sync_is_a_delta():
+    """Syncing one reviewed word of 3k costs two small round trips"""
+    server = SqliteProgressServer()
+    transport = LoopbackTransport(server)
+    devices = []
+    for _ in range(2):
+        service = EnhancedLearningProgressService(LocalStorageSimulator(), EventBus())
+        devices.append((service, ProgressSyncEngine(service.repository, transport, 'learner-1')))
+    (phone, phone_engine), (laptop, laptop_engine) = devices
+    phone.repository.apply_changes({f'word{i}': EnhancedLearningProgress(word=f'word{i}')
+                                    for i in range(3000)})
+    phone.sync_progress(phone_engine)
+    assert laptop.sync_progress(laptop_engine).pulled == 3000
+    
+    # A save only rewrites the dirty set, not the per-word server versions
+    synced = phone.repository.storage.get_item(ProgressChangeTracker.STORAGE_KEY)
+    phone.handle_implicit_review('word7')
+    assert phone.repository.storage.get_item(ProgressChangeTracker.STORAGE_KEY) is synced
+    
+    push = phone.sync_progress(phone_engine)
+    pull = laptop.sync_progress(laptop_engine)
+    assert (push.pushed, pull.pulled) == (1, 1), (push, pull)
+    assert push.round_trips == 2 and pull.round_trips == 1, (push, pull)
+    assert push.bytes_sent + push.bytes_received <= 1024, push
+    assert pull.bytes_sent + pull.bytes_received <= 1024, pull
+    assert (phone.repository.get_records(['word7']) ==
+            laptop.repository.get_records(['word7']))
+    
+    # Nothing left to send, and the sync state survives a reload
+    assert phone_engine.tracker.dirty == {}
+    reloaded = ProgressChangeTracker(phone.repository.storage)
+    assert reloaded.dirty == {} and reloaded.cursor == phone_engine.tracker.cursor
+    assert reloaded.server_versions == phone_engine.tracker.server_versions
+    server.close()
+
+def check_review_log_flush_writes_new_segments_only():
+    """A review log flush leaves segments already saved untouched"""
+    storage = LocalStorageSimulator()
+    repository = ReviewLogRepository(storage)
+    log = ReviewLog()
+    for i in range(2 * SEGMENT_SIZE + 10):
+        log.append(f'word{i % 50}', i % 3 == 0, timestamp=1_700_000_000 + i)
+    repository.save(log)
+    segments = [storage.get_item(f'reviewLog_{number}') for number in range(2)]
+    assert None not in segments and storage.get_item('reviewLog_2') is None
+    
+    log.append('word7', True, timestamp=1_700_100_000)
+    repository.save(log)
+    assert [storage.get_item(f'reviewLog_{number}') for number in range(2)] == segments
+    assert all(storage.get_item(f'reviewLog_{number}') is segment
+               for number, segment in enumerate(segments))
+    
+    reloaded = repository.load()
+    assert len(reloaded) == len(log) and reloaded.between() == log.between()
+    
+    # A log stored as one item by earlier versions is split on its next save
+    storage.set_item('reviewLog', log.dumps())
+    legacy = repository.load()
+    repository.save(legacy)
+    assert repository.load().between() == log.between()
+
+def check_date_change_reactivates_words():
+    """A date change brings back retired words whose hiatus has ended"""
+    bus = EventBus()
+    service = EnhancedLearningProgressService(LocalStorageSimulator(), bus)
+    service.update_word_exposure('apple')
+    service.retire_word('apple')
+    return_day = service.get_progress('apple').next_review_date.split('T')[0]
+    
+    bus.publish(Event('date_changed', {'current_date': return_day}))
+    progress = service.get_progress('apple')
+    assert not progress.retired and 'apple' in service.eligibility_index
+
+def check_stored_zlib_values_decode():
+    """Values written with the default zlib dictionary still decode"""
+    stored = '@zlib1:c42de4f0:eLuwoVQkq1ZKLCjIQYouKB/P0AIkumsBRnYULQ=='
+    assert decode(stored) == {'apple': {'word': 'apple', 'reviewCount': 3, 'retired': False}}
+
+def check_interrupted_shard_move_lists_learner_once():
+    """A learner with both a legacy and a sharded file is listed once"""
+    with tempfile.TemporaryDirectory() as directory:
+        layout = ShardedLayout(directory)
+        for path in (layout.user_path('learner-1', create=True), layout.legacy_path('learner-1')):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('{}')
+        assert list(layout.users()) == ['learner-1']
+        assert layout.existing_path('learner-1') == layout.user_path('learner-1')
+
+def check_same_size_rewrite_changes_item_version():
+    """A same-size rewrite with the old mtime still changes the version"""
+    with tempfile.TemporaryDirectory() as directory:
+        storage = FileStorageSimulator(directory)
+        storage.set_item('learningProgress', '{"apple":1}')
+        version = storage.get_item_version('learningProgress')
+        path = storage._get_file_path('learningProgress')
+        stat = os.stat(path)
+        with open(path, 'w') as f:
+            f.write('"{\\"apple\\":2}"')
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert os.path.getsize(path) == stat.st_size
+        assert storage.get_item_version('learningProgress') != version
+        assert storage.get_item('learningProgress') == '{"apple":2}'
+
+CHECKS = [
+    check_rename_onto_existing_progress,
+    check_replica_saves_touched_words,
+    check_quota_failure_leaves_storage_unchanged,
+    check_daily_lists_evicted_for_live_state,
+    check_daily_selection_keeps_recent_lists,
+    check_one_word_sync_is_a_delta,
+    check_review_log_flush_writes_new_segments_only,
+    check_date_change_reactivates_words,
+    check_stored_zlib_values_decode,
+    check_interrupted_shard_move_lists_learner_once,
+    check_same_size_rewrite_changes_item_version,
+]
+
+def main():
+    for check in CHECKS:
+        check()
+        print(f"✓ {check.__doc__.split(chr(10))[0]}")
+
+if __name__ == "__main__":
+    main()
@@ -4,60 +4,144 @@ Learning Progress Repository - localStorage simulation
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
 from storage_simulator import local_storage
 from models.learning_progress import EnhancedLearningProgress
-from typing import Dict, Optional
+from shared.lazy_record_map import DecodedRecordView, LazyRecordMap
+from shared.schema_migrations import MigrationChain
+from typing import Dict, Iterable, Mapping, Optional
+
+def _add_timing_and_review_fields(progress: dict) -> dict:
+    """v2: add exposure timing and FR3 review scheduling fields"""
+    # Add missing timing fields
+    progress.setdefault('exposuresToday', 0)
+    progress.setdefault('lastExposureTime', '')
+    progress.setdefault('nextAllowedTime', '')
+    
+    # Add missing FR3 fields
+    progress.setdefault('reviewCount', 0)
+    progress.setdefault('nextReviewDate', None)
+    progress.setdefault('lastPlayedDate', None)
+    progress.setdefault('isMastered', False)
+    progress.setdefault('retired', False)
+    return progress
+
+MIGRATIONS = MigrationChain([
+    (2, _add_timing_and_review_fields)
+])
 
 class LearningProgressRepository:
-    """Repository for learning progress using localStorage simulation"""
+    """Repository for learning progress using localStorage simulation.
+
+    The stored map is read through a lazy view: looking up or saving one
+    word decodes and re-encodes only that word. The view is reused for as
+    long as storage still holds the text it was opened on.
+    """
     
     STORAGE_KEY = 'learningProgress'
+    VERSION_KEY = 'learningProgressVersion'
+    
+    def __init__(self, storage=None, change_tracker=None):
+        self.storage = storage or local_storage
+        # Optional ProgressChangeTracker; when set, local writes are recorded for sync
+        self.change_tracker = change_tracker
+        self._schema_version: Optional[int] = None
+        self._view: Optional[LazyRecordMap] = None
+        self._view_text: Optional[str] = None
     
     def get_progress(self, word_key: str) -> Optional[EnhancedLearningProgress]:
         """Get progress for a specific word"""
-        all_progress = local_storage.get_json(self.STORAGE_KEY, {})
+        all_progress = self._records()
         if word_key not in all_progress:
             return None
-        return EnhancedLearningProgress.from_dict(word_key, all_progress[word_key])
+        return EnhancedLearningProgress.from_dict(word_key, self._upgrade(all_progress[word_key]))
     
     def save_progress(self, word_key: str, progress: EnhancedLearningProgress):
         """Save progress for a specific word"""
-        all_progress = local_storage.get_json(self.STORAGE_KEY, {})
+        all_progress = self._records()
         all_progress[word_key] = progress.to_dict()
-        local_storage.set_json(self.STORAGE_KEY, all_progress)
+        self._write_all(all_progress)
+        if self.change_tracker is not None:
+            self.change_tracker.mark_changed([word_key])
     
-    def get_all_progress(self) -> Dict[str, EnhancedLearningProgress]:
-        """Get all learning progress"""
-        all_progress = local_storage.get_json(self.STORAGE_KEY, {})
+    def get_records(self, word_keys: Iterable[str]) -> Dict[str, dict]:
+        """Stored dicts for the given keys (missing keys are omitted)"""
+        all_progress = self._records()
         return {
-            word_key: EnhancedLearningProgress.from_dict(word_key, data)
-            for word_key, data in all_progress.items()
+            word_key: self._upgrade(all_progress[word_key])
+            for word_key in word_keys if word_key in all_progress
         }
     
+    def get_all_progress(self) -> Mapping[str, EnhancedLearningProgress]:
+        """Get all learning progress (records are decoded as they are read)"""
+        return DecodedRecordView(
+            self._records(),
+            lambda word_key, data: EnhancedLearningProgress.from_dict(word_key, self._upgrade(data))
+        )
+    
+    def apply_changes(self, updates: Dict[str, EnhancedLearningProgress],
+                      removed_keys: Iterable[str] = (), track: bool = True):
+        """Upsert and delete several records with a single storage write.
+
+        Pass ``track=False`` for changes that came from the server, so they
+        are not pushed back.
+        """
+        removed_keys = list(removed_keys)
+        all_progress = self._records()
+        for word_key in removed_keys:
+            all_progress.pop(word_key, None)
+        for word_key, progress in updates.items():
+            all_progress[word_key] = progress.to_dict()
+        self._write_all(all_progress)
+        if track and self.change_tracker is not None:
+            self.change_tracker.mark_changed(updates)
+            self.change_tracker.mark_changed(removed_keys, deleted=True)
+    
     def migrate_existing_data(self):
-        """Migrate existing data to include new fields with defaults"""
-        all_progress = local_storage.get_json(self.STORAGE_KEY, {})
-        
-        for word_key, progress in all_progress.items():
-            # Add missing timing fields
-            if 'exposuresToday' not in progress:
-                progress['exposuresToday'] = 0
-            if 'lastExposureTime' not in progress:
-                progress['lastExposureTime'] = ''
-            if 'nextAllowedTime' not in progress:
-                progress['nextAllowedTime'] = ''
-            
-            # Add missing FR3 fields
-            if 'reviewCount' not in progress:
-                progress['reviewCount'] = 0
-            if 'nextReviewDate' not in progress:
-                progress['nextReviewDate'] = None
-            if 'lastPlayedDate' not in progress:
-                progress['lastPlayedDate'] = None
-            if 'isMastered' not in progress:
-                progress['isMastered'] = False
-            if 'retired' not in progress:
-                progress['retired'] = False
-        
-        local_storage.set_json(self.STORAGE_KEY, all_progress)
\ No newline at end of file
+        """Record the stored schema version.
+
+        Nothing is rewritten here: records written before the current schema
+        are upgraded when read, and the whole map is upgraded once, on the
+        next write, after which the version marker is bumped.
+        """
+        self.get_schema_version()
+    
+    def get_schema_version(self) -> int:
+        """Schema version of the stored progress map (read once per repository)"""
+        if self._schema_version is None:
+            marker = self.storage.get_item(self.VERSION_KEY)
+            has_data = self.storage.get_item(self.STORAGE_KEY) is not None
+            self._schema_version = MIGRATIONS.parse_version(marker, has_data)
+            if marker is None and not has_data:
+                self.storage.set_item(self.VERSION_KEY, str(self._schema_version))
+        return self._schema_version
+    
+    def _upgrade(self, data: dict) -> dict:
+        version = self.get_schema_version()
+        if MIGRATIONS.needs_upgrade(version):
+            return MIGRATIONS.upgrade(data, version)
+        return data
+    
+    def _records(self) -> LazyRecordMap:
+        text = self.storage.get_item(self.STORAGE_KEY)
+        if self._view is None or text is not self._view_text:
+            # Not `or`: truth-testing a view would index every record
+            view = self.storage.get_json_records(self.STORAGE_KEY)
+            self._view = view if view is not None else LazyRecordMap()
+            self._view_text = text
+        return self._view
+    
+    def _write_all(self, all_progress: LazyRecordMap):
+        version = self.get_schema_version()
+        if MIGRATIONS.needs_upgrade(version):
+            # The full map is being rewritten anyway; upgrade the remaining records
+            MIGRATIONS.upgrade_all(all_progress, version)
+        # Dropped first so a failed write cannot leave unsaved changes cached
+        self._view = None
+        self.storage.set_json(self.STORAGE_KEY, all_progress)
+        # The view now matches what was written, so it stays valid
+        self._view, self._view_text = all_progress, self.storage.get_item(self.STORAGE_KEY)
+        if version != MIGRATIONS.current_version:
+            self.storage.set_item(self.VERSION_KEY, str(MIGRATIONS.current_version))
+            self._schema_version = MIGRATIONS.current_version
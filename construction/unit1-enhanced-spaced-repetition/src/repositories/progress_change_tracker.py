@@ -0,0 +1,83 @@
+"""
+Progress Change Tracker - per-record version counters and dirty set for sync
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from storage_simulator import local_storage
+from typing import Dict, Iterable, Optional, Set
+
+class ProgressChangeTracker:
+    """Remembers which progress records changed since the last sync.
+
+    ``dirty`` maps a word key to its local version counter, bumped on every
+    change, so a push can tell whether a record changed again while it was in
+    flight. ``server_versions`` holds the server version each record was last
+    synced at (the base for conflict detection), and ``cursor`` is the server
+    change sequence already pulled.
+
+    The dirty set is written on every edit under its own key; the server
+    versions and cursor only change during a sync and are written by
+    ``save`` once it finishes.
+    """
+    
+    STORAGE_KEY = 'learningProgressSync'
+    DIRTY_KEY = 'learningProgressSyncDirty'
+    
+    def __init__(self, storage=None):
+        self.storage = storage or local_storage
+        state = self.storage.get_json(self.STORAGE_KEY, {})
+        pending = self.storage.get_json(self.DIRTY_KEY)
+        # No stored state: nothing has been synced from this device yet
+        self.is_new = not state and pending is None
+        if pending is None:
+            # Written before the dirty set had its own key
+            pending = state
+        self.dirty: Dict[str, int] = pending.get('dirty', {})
+        self.deleted: Set[str] = set(pending.get('deleted', []))
+        self.server_versions: Dict[str, int] = state.get('server', {})
+        self.cursor: int = state.get('cursor', 0)
+        self._next_version: int = pending.get('clock', 0)
+    
+    def has_changes(self) -> bool:
+        return bool(self.dirty)
+    
+    def mark_changed(self, word_keys: Iterable[str], deleted: bool = False):
+        """Record local edits (or deletions) of ``word_keys``"""
+        changed = False
+        for word_key in word_keys:
+            changed = True
+            self._next_version += 1
+            self.dirty[word_key] = self._next_version
+            if deleted:
+                self.deleted.add(word_key)
+            else:
+                self.deleted.discard(word_key)
+        if changed:
+            self._save_dirty()
+    
+    def local_version(self, word_key: str) -> Optional[int]:
+        return self.dirty.get(word_key)
+    
+    def mark_synced(self, word_key: str, local_version: Optional[int], server_version: int):
+        """Record a server ack; the record stays dirty if it changed since the push"""
+        self.server_versions[word_key] = server_version
+        if local_version is not None and self.dirty.get(word_key) == local_version:
+            del self.dirty[word_key]
+            self.deleted.discard(word_key)
+    
+    def save(self):
+        """Write the whole sync state (at the end of a sync)"""
+        self.storage.set_json(self.STORAGE_KEY, {
+            'server': self.server_versions,
+            'cursor': self.cursor
+        })
+        self._save_dirty()
+    
+    def _save_dirty(self):
+        self.storage.set_json(self.DIRTY_KEY, {
+            'dirty': self.dirty,
+            'deleted': sorted(self.deleted),
+            'clock': self._next_version
+        })
@@ -0,0 +1,25 @@
+"""
+Review Log Repository - the learner's append-only review history
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from storage_simulator import local_storage
+from shared.review_log import ReviewLog
+
+class ReviewLogRepository:
+    """Stores the ReviewLog in its compact columnar form: a head item under
+    STORAGE_KEY and each full segment under ``reviewLog_<number>``"""
+    
+    STORAGE_KEY = 'reviewLog'
+    
+    def __init__(self, storage=None):
+        self.storage = storage or local_storage
+    
+    def load(self) -> ReviewLog:
+        return ReviewLog.load(self.storage, self.STORAGE_KEY)
+    
+    def save(self, log: ReviewLog):
+        log.save(self.storage, self.STORAGE_KEY)
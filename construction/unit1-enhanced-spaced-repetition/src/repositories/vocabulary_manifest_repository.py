@@ -0,0 +1,23 @@
+"""
+Vocabulary Manifest Repository - content hashes of the last imported vocabulary
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from storage_simulator import local_storage
+from typing import Dict
+
+class VocabularyManifestRepository:
+    """Stores {word_key: {'hash', 'bodyHash', 'category'}} for the last import"""
+    
+    STORAGE_KEY = 'vocabularyManifest'
+    
+    def __init__(self, storage=None):
+        self.storage = storage or local_storage
+    
+    def get_manifest(self) -> Dict[str, dict]:
+        return self.storage.get_json(self.STORAGE_KEY, {})
+    
+    def save_manifest(self, manifest: Dict[str, dict]):
+        self.storage.set_json(self.STORAGE_KEY, manifest)
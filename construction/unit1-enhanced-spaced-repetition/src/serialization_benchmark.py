@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Serialization measurement - progress map save/load per backend at 3k and 100k words
+
+The baseline is the previous code path: stdlib json plus the hand-written
+to_dict dict literal and from_dict .get chain. Every backend is checked to
+write byte-identical text before it is timed.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+from models.learning_progress import EnhancedLearningProgress
+from shared.serialization import available_backends
+
+def _legacy_to_dict(progress: EnhancedLearningProgress) -> dict:
+    return {
+        'word': progress.word,
+        'category': progress.category,
+        'isLearned': progress.is_learned,
+        'status': progress.status,
+        'createdDate': progress.created_date,
+        'exposuresToday': progress.exposures_today,
+        'lastExposureTime': progress.last_exposure_time,
+        'nextAllowedTime': progress.next_allowed_time,
+        'reviewCount': progress.review_count,
+        'nextReviewDate': progress.next_review_date,
+        'lastPlayedDate': progress.last_played_date,
+        'isMastered': progress.is_mastered,
+        'retired': progress.retired
+    }
+
+def _legacy_from_dict(word_key: str, data: dict) -> EnhancedLearningProgress:
+    return EnhancedLearningProgress(
+        word=word_key,
+        category=data.get('category', ''),
+        is_learned=data.get('isLearned', False),
+        status=data.get('status', 'new'),
+        created_date=data.get('createdDate', datetime.now().isoformat().split('T')[0]),
+        exposures_today=data.get('exposuresToday', 0),
+        last_exposure_time=data.get('lastExposureTime', ''),
+        next_allowed_time=data.get('nextAllowedTime', datetime.now().isoformat()),
+        review_count=data.get('reviewCount', 0),
+        next_review_date=data.get('nextReviewDate'),
+        last_played_date=data.get('lastPlayedDate'),
+        is_mastered=data.get('isMastered', False),
+        retired=data.get('retired', False)
+    )
+
+def _records(count: int):
+    categories = ['daily life', 'travel', 'business', 'academic', 'emotions', 'food']
+    records = {}
+    for i in range(count):
+        day = f'2025-{1 + i % 12:02d}-{1 + i % 28:02d}'
+        word = f'vocab{i}' if i % 10 else f'vocáb{i}'
+        records[word] = EnhancedLearningProgress(
+            word=word, category=categories[i % 6], is_learned=i % 3 != 0,
+            status=('new', 'due', 'not_due')[i % 3], created_date=day,
+            exposures_today=i % 4, last_exposure_time=f'{day}T09:{i % 60:02d}:12.345678',
+            next_allowed_time=f'{day}T10:{i % 60:02d}:12.345678', review_count=i % 15,
+            next_review_date=day, last_played_date=day if i % 2 else None,
+            is_mastered=i % 9 == 0, retired=i % 23 == 0
+        )
+    return records
+
+def _best(fn, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare serialization backends on a progress map')
+    parser.add_argument('--words', type=int, nargs='+', default=[3000, 100000])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"{'words':>7}  {'path':<26}{'save ms':>10}{'load ms':>10}{'speedup':>9}")
+    for count in args.words:
+        records = _records(count)
+        reference = json.dumps({key: _legacy_to_dict(p) for key, p in records.items()}, separators=(',', ':'))
+        
+        def legacy_save():
+            return json.dumps({key: _legacy_to_dict(p) for key, p in records.items()}, separators=(',', ':'))
+        
+        def legacy_load():
+            return {key: _legacy_from_dict(key, data) for key, data in json.loads(reference).items()}
+        
+        save_ms, load_ms = _best(legacy_save, args.repeats), _best(legacy_load, args.repeats)
+        baseline = save_ms + load_ms
+        print(f'{count:>7}  {"stdlib + hand-written":<26}{save_ms:>10.1f}{load_ms:>10.1f}{1.0:>8.1f}x')
+        
+        for backend in available_backends():
+            def save():
+                return backend.dumps({key: p.to_dict() for key, p in records.items()})
+            
+            def load():
+                return EnhancedLearningProgress.from_map(backend.loads(reference))
+            
+            if save() != reference:
+                raise AssertionError(f'{backend.name} output differs from the stdlib layout')
+            if load() != legacy_load():
+                raise AssertionError(f'{backend.name} decoded different records')
+            save_ms, load_ms = _best(save, args.repeats), _best(load, args.repeats)
+            print(f'{count:>7}  {backend.name + " + generated":<26}{save_ms:>10.1f}{load_ms:>10.1f}'
+                  f'{baseline / (save_ms + load_ms):>8.1f}x')
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Daily Selection Service - today's review and new words with FR3 filtering
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from datetime import date, datetime, timedelta
+from typing import List
+
+from common_types import DAILY_SELECTION_SIZES, SeverityLevel
+from shared.vocabulary_catalog import get_default_catalog
+
+class DailySelectionService:
+    """Generates and persists the daily list for one learner (Unit 2 design)"""
+    
+    SELECTION_KEY_PREFIX = 'todayList_'
+    LAST_SELECTION_DATE_KEY = 'lastSelectionDate'
+    # Older lists are removed when a new day's list is written; storage
+    # also evicts lists oldest first if it runs out of quota before then
+    SELECTION_HISTORY_DAYS = 30
+    
+    def __init__(self, progress_service, catalog=None):
+        self.progress_service = progress_service
+        self.storage = progress_service.repository.storage
+        self._catalog = catalog
+    
+    @property
+    def catalog(self):
+        if self._catalog is None:
+            self._catalog = get_default_catalog()
+        return self._catalog
+    
+    def get_daily_selection(self, severity: SeverityLevel = 'moderate') -> dict:
+        """Return today's selection, generating it on the first request of the day"""
+        if severity not in DAILY_SELECTION_SIZES:
+            raise ValueError(f'Unknown severity: {severity}')
+        
+        today = datetime.now().isoformat().split('T')[0]
+        selection = self.storage.get_json(self.SELECTION_KEY_PREFIX + today)
+        if selection and selection.get('severity') == severity:
+            return selection
+        
+        selection = self._generate(today, severity)
+        self._prune_old_selections(today)
+        self.storage.set_json(self.SELECTION_KEY_PREFIX + today, selection)
+        self.storage.set_item(self.LAST_SELECTION_DATE_KEY, today)
+        return selection
+    
+    def _generate(self, today: str, severity: SeverityLevel) -> dict:
+        target = DAILY_SELECTION_SIZES[severity]
+        
+        # FR3.2/FR3.4: get_due_words already skips retired and mastered words
+        review_words = self.progress_service.get_due_words()[:target]
+        
+        known = self.progress_service.repository.get_all_progress()
+        new_words = []
+        for entry in self.catalog:
+            if len(review_words) + len(new_words) >= target:
+                break
+            if entry.word not in known and entry.word not in new_words:
+                new_words.append(entry.word)
+        
+        words = self._rearrange_by_category(review_words + new_words)
+        review_set = set(review_words)
+        return {
+            'newWords': [word for word in words if word not in review_set],
+            'reviewWords': [word for word in words if word in review_set],
+            'totalCount': len(words),
+            'generationDate': today,
+            'severity': severity
+        }
+    
+    def _prune_old_selections(self, today: str):
+        cutoff = (date.fromisoformat(today) - timedelta(days=self.SELECTION_HISTORY_DAYS)).isoformat()
+        prefix = self.SELECTION_KEY_PREFIX
+        for key in self.storage.keys():
+            if key.startswith(prefix) and key[len(prefix):] < cutoff:
+                self.storage.remove_item(key)
+    
+    def _rearrange_by_category(self, words: List[str]) -> List[str]:
+        """Break up runs of three or more consecutive same-category words"""
+        result = list(words)
+        categories = [self._category_of(word) for word in result]
+        for i in range(len(result) - 2):
+            if categories[i] == categories[i + 1] == categories[i + 2]:
+                for j in range(i + 3, len(result)):
+                    if categories[j] != categories[i]:
+                        result[i + 2], result[j] = result[j], result[i + 2]
+                        categories[i + 2], categories[j] = categories[j], categories[i + 2]
+                        break
+        return result
+    
+    def _category_of(self, word: str) -> str:
+        word_id = self.catalog.id_for(word)
+        return self.catalog.category_of(word_id) if word_id is not None else ''
@@ -0,0 +1,111 @@
+"""
+Eligibility Index - min-heap of words keyed on next allowed epoch minute
+"""
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+class EligibilityIndex:
+    """Tracks when each playable word next becomes eligible for exposure.
+
+    Entries are kept in a min-heap keyed on the epoch minute of
+    ``next_allowed_time``. Updates push a fresh entry and leave the old one in
+    place; stale entries are discarded lazily when they reach the top.
+    """
+    
+    def __init__(self):
+        self._heap: List[Tuple[int, int, str]] = []
+        self._minutes: Dict[str, Tuple[int, int]] = {}
+        self._counter = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._minutes)
+    
+    def __contains__(self, word_key: str) -> bool:
+        return word_key in self._minutes
+    
+    def update(self, word_key: str, eligible_minute: int):
+        """Insert or reschedule a word"""
+        entry = (eligible_minute, next(self._counter))
+        self._minutes[word_key] = entry
+        heapq.heappush(self._heap, (entry[0], entry[1], word_key))
+        self._compact_if_needed()
+    
+    def remove(self, word_key: str):
+        """Stop tracking a word (e.g. when it is retired)"""
+        self._minutes.pop(word_key, None)
+    
+    def clear(self):
+        self._heap.clear()
+        self._minutes.clear()
+    
+    def minutes(self) -> Tuple[List[str], List[int]]:
+        """Tracked words and their eligible minutes, in insertion order"""
+        entries = sorted(self._minutes.items(), key=lambda item: item[1][1])
+        return [word_key for word_key, _ in entries], [minute for _, (minute, _) in entries]
+    
+    def load(self, word_keys: List[str], minutes: List[int]):
+        """Replace the contents with the output of ``minutes()`` in one heapify"""
+        seqs = list(itertools.islice(self._counter, len(word_keys)))
+        self._minutes = dict(zip(word_keys, zip(minutes, seqs)))
+        self._heap = list(zip(minutes, seqs, word_keys))
+        heapq.heapify(self._heap)
+    
+    def eligible_minute(self, word_key: str) -> Optional[int]:
+        entry = self._minutes.get(word_key)
+        return entry[0] if entry else None
+    
+    def next_eligible(self, now_minute: int) -> Optional[str]:
+        """Return the word that has been eligible the longest, if any"""
+        top = self._peek()
+        if top is None or top[0] > now_minute:
+            return None
+        return top[2]
+    
+    def minutes_until_next(self, now_minute: int) -> Optional[int]:
+        """Minutes until any word becomes eligible (0 if one already is)"""
+        top = self._peek()
+        if top is None:
+            return None
+        return max(0, top[0] - now_minute)
+    
+    def eligible_within(self, until_minute: int) -> List[str]:
+        """All words eligible at or before ``until_minute``, earliest first.
+
+        Walks only the heap nodes at or below the bound, so the cost is
+        proportional to the number of matches rather than the index size.
+        """
+        self._peek()
+        heap = self._heap
+        matches = []
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            minute, seq, word_key = heap[i]
+            if minute > until_minute:
+                continue
+            if self._minutes.get(word_key) == (minute, seq):
+                matches.append((minute, seq, word_key))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    stack.append(child)
+        matches.sort()
+        return [word_key for _, _, word_key in matches]
+    
+    def _peek(self) -> Optional[Tuple[int, int, str]]:
+        heap = self._heap
+        while heap:
+            minute, seq, word_key = heap[0]
+            if self._minutes.get(word_key) == (minute, seq):
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+    
+    def _compact_if_needed(self):
+        # Rebuild once stale entries outnumber live ones so memory stays O(n)
+        if len(self._heap) > 2 * len(self._minutes) + 64:
+            self._heap = [
+                (minute, seq, word_key)
+                for word_key, (minute, seq) in self._minutes.items()
+            ]
+            heapq.heapify(self._heap)
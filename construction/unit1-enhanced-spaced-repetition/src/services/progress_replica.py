@@ -0,0 +1,159 @@
+"""
+Progress Replica - keeps CRDT state beside stored progress and exchanges field deltas
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from typing import Dict, Iterable, List, Set
+
+from models.progress_crdt import ZERO_TIMESTAMP, HybridLogicalClock, MergeableProgress, combine_deltas
+from repositories.learning_progress_repository import LearningProgressRepository
+from shared.lazy_record_map import LazyRecordMap
+
+class ProgressReplica:
+    """One device's mergeable copy of the learner's progress.
+
+    Call ``record_local`` after the service saves a word; the field-level
+    delta is queued in an outbox. Deltas from other devices are folded in
+    with ``apply_remote``, which writes the merged records back through the
+    repository; a running service merges them with
+    ``EnhancedLearningProgressService.merge_remote_progress`` so its
+    snapshot sees the result. Because every merge is commutative and idempotent, deltas can
+    be re-sent, reordered or relayed without coordination.
+    """
+    
+    # Per-word CRDT states, one flat record each so saves only re-encode
+    # the words they touch; the outbox and clock live in their own small item
+    STORAGE_KEY = 'learningProgressCrdt'
+    META_KEY = 'learningProgressCrdtMeta'
+    
+    def __init__(self, repository: LearningProgressRepository, node_id: str):
+        self.repository = repository
+        self.storage = repository.storage
+        self.clock = HybridLogicalClock(node_id)
+        self._states: Dict[str, MergeableProgress] = {}
+        self._dirty: Set[str] = set()
+        
+        meta = self.storage.get_json(self.META_KEY)
+        if meta is None and self.storage.get_item(self.STORAGE_KEY) is not None:
+            meta = self._upgrade_legacy_state()
+        meta = meta or {}
+        view = self.storage.get_json_records(self.STORAGE_KEY)
+        # Not `or`: truth-testing a view would index every record
+        self._view = view if view is not None else LazyRecordMap()
+        self.outbox: Dict[str, dict] = meta.get('outbox', {})
+        if meta.get('clock'):
+            self.clock.observe((*meta['clock'], node_id))
+    
+    @property
+    def node_id(self) -> str:
+        return self.clock.node_id
+    
+    def record_local(self, word_keys: Iterable[str]) -> Dict[str, dict]:
+        """Capture local edits of ``word_keys`` as deltas and queue them"""
+        deltas = {}
+        records = self.repository.get_all_progress()
+        for word_key in word_keys:
+            progress = records.get(word_key)
+            if progress is None:
+                continue
+            delta = self._state(word_key).record_local(progress, self.clock)
+            if delta:
+                deltas[word_key] = delta
+                self._dirty.add(word_key)
+                self.outbox[word_key] = combine_deltas(self.outbox.get(word_key, {}), delta)
+        if deltas:
+            self._save()
+        return deltas
+    
+    def take_outbox(self) -> Dict[str, dict]:
+        """Deltas not yet acknowledged by a peer or server"""
+        return dict(self.outbox)
+    
+    def acknowledge(self, word_keys: Iterable[str]):
+        for word_key in word_keys:
+            self.outbox.pop(word_key, None)
+        self._save_meta()
+    
+    def apply_remote(self, deltas: Dict[str, dict]) -> List[str]:
+        """Merge deltas from another replica; returns the words that changed"""
+        changed = {}
+        for word_key, delta in deltas.items():
+            state = self._state(word_key)
+            if state.merge_delta(delta, self.clock):
+                changed[word_key] = state.to_progress()
+                self._dirty.add(word_key)
+        if changed:
+            self.repository.apply_changes(changed, track=False)
+            self._save()
+        return list(changed)
+    
+    def state_of(self, word_key: str) -> MergeableProgress:
+        return self._state(word_key)
+    
+    def _state(self, word_key: str) -> MergeableProgress:
+        state = self._states.get(word_key)
+        if state is None:
+            record = self._view.get(word_key)
+            state = (MergeableProgress(word_key) if record is None
+                     else MergeableProgress.from_dict(word_key, _from_record(record)))
+            self._states[word_key] = state
+        return state
+    
+    def _save(self):
+        """Write the touched states (spliced into the stored map) and the meta item"""
+        if self._dirty:
+            for word_key in self._dirty:
+                self._view[word_key] = _to_record(self._states[word_key].to_dict())
+            self.storage.set_json(self.STORAGE_KEY, self._view)
+            self._dirty.clear()
+        self._save_meta()
+    
+    def _save_meta(self):
+        self.storage.set_json(self.META_KEY, {
+            'outbox': self.outbox,
+            'clock': list(self.clock.last)
+        })
+    
+    def _upgrade_legacy_state(self) -> dict:
+        """Split a state written as one {'records', 'outbox', 'clock'} item"""
+        legacy = self.storage.get_json(self.STORAGE_KEY, {})
+        records = {word_key: _to_record(data) for word_key, data in legacy.get('records', {}).items()}
+        meta = {'outbox': legacy.get('outbox', {}), 'clock': legacy.get('clock')}
+        self.storage.set_json(self.STORAGE_KEY, records)
+        self.storage.set_json(self.META_KEY, meta)
+        return meta
+
+def _to_record(state: dict) -> dict:
+    """MergeableProgress.to_dict() without nested objects, as LazyRecordMap
+    records must be; empty parts are left out"""
+    record = {}
+    if state['reviews']:
+        record['reviews'] = sorted(state['reviews'].items())
+    if state['reviewBase'][1] != list(ZERO_TIMESTAMP):
+        record['reviewBase'] = state['reviewBase']
+    if state['exposures']['day']:
+        record['exposureDay'] = state['exposures']['day']
+        record['exposures'] = sorted(state['exposures']['counts'].items())
+    if state['retired']['adds']:
+        record['retiredAdds'] = state['retired']['adds']
+        record['retiredRemoves'] = state['retired']['removes']
+    if state['lww']:
+        record['lww'] = [[name, value, timestamp] for name, (value, timestamp) in state['lww'].items()]
+    return record
+
+def _from_record(record: dict) -> dict:
+    """The delta form of a stored flat record"""
+    delta = {}
+    if 'reviews' in record:
+        delta['reviews'] = dict(record['reviews'])
+    if 'reviewBase' in record:
+        delta['reviewBase'] = record['reviewBase']
+    if 'exposureDay' in record:
+        delta['exposures'] = {'day': record['exposureDay'], 'counts': dict(record.get('exposures', []))}
+    if 'retiredAdds' in record:
+        delta['retired'] = {'adds': record['retiredAdds'], 'removes': record.get('retiredRemoves', [])}
+    if 'lww' in record:
+        delta['lww'] = {name: [value, timestamp] for name, value, timestamp in record['lww']}
+    return delta
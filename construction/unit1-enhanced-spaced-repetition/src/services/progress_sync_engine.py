@@ -0,0 +1,161 @@
+"""
+Progress Sync Engine - pushes and pulls only changed progress records
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from models.learning_progress import EnhancedLearningProgress
+from repositories.learning_progress_repository import LearningProgressRepository
+from repositories.progress_change_tracker import ProgressChangeTracker
+
+ConflictResolver = Callable[[Optional[dict], Optional[dict]], Optional[dict]]
+
+def prefer_more_reviewed(local: Optional[dict], remote: Optional[dict]) -> Optional[dict]:
+    """Default conflict policy: keep the record with more reviews (remote on ties)"""
+    if local is None or remote is None:
+        return remote
+    local_rank = (local.get('reviewCount', 0), local.get('lastPlayedDate') or '')
+    remote_rank = (remote.get('reviewCount', 0), remote.get('lastPlayedDate') or '')
+    return local if local_rank > remote_rank else remote
+
+@dataclass
+class SyncReport:
+    pushed: int = 0
+    pulled: int = 0
+    conflicts: int = 0
+    round_trips: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    pulled_keys: List[str] = field(default_factory=list)
+
+class ProgressSyncEngine:
+    """Delta sync between the local progress map and a server store.
+
+    Local writes are recorded by a ProgressChangeTracker on the repository.
+    ``sync`` pushes dirty records in batched upserts that carry the server
+    version they were based on, then pulls server changes after the stored
+    cursor. Records whose server version moved on are resolved with
+    ``resolve(local, remote)``; a local winner stays dirty and is pushed again
+    against the new base.
+    """
+    
+    def __init__(self, repository: LearningProgressRepository, transport, user_key: str,
+                 batch_size: int = 200, resolve: ConflictResolver = prefer_more_reviewed):
+        self.repository = repository
+        self.transport = transport
+        self.user_key = user_key
+        self.batch_size = batch_size
+        self.resolve = resolve
+        
+        if repository.change_tracker is None:
+            repository.change_tracker = ProgressChangeTracker(repository.storage)
+        self.tracker = repository.change_tracker
+        if self.tracker.is_new:
+            # First sync from this device uploads everything stored so far
+            self.tracker.mark_changed(repository.storage.get_json(repository.STORAGE_KEY, {}))
+            self.tracker.is_new = False
+    
+    def sync(self, max_push_rounds: int = 3) -> SyncReport:
+        report = SyncReport()
+        stats_before = (self.transport.stats.round_trips,
+                        self.transport.stats.bytes_sent,
+                        self.transport.stats.bytes_received)
+        
+        for _ in range(max_push_rounds):
+            if not self.tracker.has_changes() or not self._push(report):
+                break
+        self._pull(report)
+        self.tracker.save()
+        
+        report.round_trips = self.transport.stats.round_trips - stats_before[0]
+        report.bytes_sent = self.transport.stats.bytes_sent - stats_before[1]
+        report.bytes_received = self.transport.stats.bytes_received - stats_before[2]
+        return report
+    
+    def _push(self, report: SyncReport) -> bool:
+        """Push every dirty record once; returns True if conflicts left work to retry"""
+        dirty = dict(self.tracker.dirty)
+        records = self.repository.get_records(dirty)
+        retry = False
+        keys = list(dirty)
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start:start + self.batch_size]
+            changes = []
+            for word_key in batch:
+                deleted = word_key in self.tracker.deleted or word_key not in records
+                changes.append({
+                    'word_key': word_key,
+                    'base_version': self.tracker.server_versions.get(word_key, 0),
+                    'data': None if deleted else records[word_key],
+                    'deleted': deleted
+                })
+            response = self.transport.call('push', {'user_key': self.user_key, 'changes': changes})
+            if response['previous_seq'] == self.tracker.cursor:
+                # Nobody else wrote in between, so there is nothing new to pull
+                # up to this push; skip downloading our own records back
+                self.tracker.cursor = response['seq']
+            
+            for accepted in response['accepted']:
+                word_key = accepted['word_key']
+                self.tracker.mark_synced(word_key, dirty[word_key], accepted['version'])
+                report.pushed += 1
+            if response['conflicts']:
+                retry = self._apply_remote(response['conflicts'], report, dirty) or retry
+        return retry
+    
+    def _pull(self, report: SyncReport):
+        while True:
+            response = self.transport.call('pull', {
+                'user_key': self.user_key,
+                'since': self.tracker.cursor,
+                'limit': self.batch_size
+            })
+            # Our own pushes come back here too; skip versions we already hold
+            fresh = [
+                change for change in response['changes']
+                if change['version'] > self.tracker.server_versions.get(change['word_key'], 0)
+            ]
+            self._apply_remote(fresh, report, dict(self.tracker.dirty))
+            self.tracker.cursor = response['seq']
+            if not response['has_more']:
+                break
+    
+    def _apply_remote(self, changes: List[dict], report: SyncReport, dirty: Dict[str, int]) -> bool:
+        """Merge server records into local storage; returns True if a local
+        record won a conflict and must be pushed again"""
+        if not changes:
+            return False
+        local_records = self.repository.get_records(
+            change['word_key'] for change in changes if change['word_key'] in dirty
+        )
+        updates: Dict[str, EnhancedLearningProgress] = {}
+        removed: List[str] = []
+        repush = False
+        for change in changes:
+            word_key = change['word_key']
+            remote = None if change['deleted'] else change['data']
+            winner = remote
+            if word_key in dirty:
+                report.conflicts += 1
+                winner = self.resolve(local_records.get(word_key), remote)
+            if word_key in dirty and winner is not remote:
+                # Keep the local record dirty, rebased on the server version
+                self.tracker.server_versions[word_key] = change['version']
+                repush = True
+                continue
+            
+            self.tracker.mark_synced(word_key, dirty.get(word_key), change['version'])
+            if remote is None:
+                removed.append(word_key)
+            else:
+                updates[word_key] = EnhancedLearningProgress.from_dict(word_key, remote)
+            report.pulled += 1
+            report.pulled_keys.append(word_key)
+        
+        if updates or removed:
+            self.repository.apply_changes(updates, removed, track=False)
+        return repush
@@ -6,7 +6,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from datetime import datetime, timedelta
-from common_types import REVIEW_INTERVALS, MASTER_INTERVAL
+from common_types import REVIEW_INTERVALS, MASTER_INTERVAL, RETIREMENT_INTERVAL
 
 class ReviewIntervalCalculator:
     """Calculates review intervals for spaced repetition (FR3.1)"""
@@ -27,6 +27,11 @@ class ReviewIntervalCalculator:
         next_date = datetime.now() + timedelta(days=MASTER_INTERVAL)
         return next_date.isoformat().split('T')[0]
     
+    def calculate_retirement_return_date(self) -> str:
+        """Calculate the day a retired word returns to rotation (100 days)"""
+        next_date = datetime.now() + timedelta(days=RETIREMENT_INTERVAL)
+        return next_date.isoformat().split('T')[0]
+    
     def is_due_for_review(self, next_review_date: str) -> bool:
         """Check if word is due for review"""
         if not next_review_date:
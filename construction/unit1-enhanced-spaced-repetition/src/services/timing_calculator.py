@@ -5,6 +5,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+import math
 from datetime import datetime, timedelta
 from common_types import EXPOSURE_DELAYS
 
@@ -40,4 +41,19 @@ class TimingCalculator:
             allowed_time = datetime.fromisoformat(next_allowed_time.replace('Z', '+00:00'))
             return datetime.now() >= allowed_time
         except (ValueError, TypeError):
-            return True
\ No newline at end of file
+            return True
+    
+    def to_epoch_minute(self, timestamp: str) -> int:
+        """Convert an ISO timestamp to the epoch minute it falls in"""
+        if not timestamp:
+            return self.current_epoch_minute()
+        
+        try:
+            moment = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            return math.floor(moment.timestamp() / 60)
+        except (ValueError, TypeError):
+            return self.current_epoch_minute()
+    
+    def current_epoch_minute(self) -> int:
+        """Current time as a whole epoch minute"""
+        return math.floor(datetime.now().timestamp() / 60)
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Vocabulary Importer - content-hash diff of the vocabulary against stored progress
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from repositories.learning_progress_repository import LearningProgressRepository
+from repositories.vocabulary_manifest_repository import VocabularyManifestRepository
+
+@dataclass
+class VocabularyDiff:
+    """Classification of catalog entries relative to the last import"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    renamed: Dict[str, str] = field(default_factory=dict)  # old key -> new key
+    manifest: Dict[str, dict] = field(default_factory=dict)
+    
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.renamed)
+    
+    def summary(self) -> dict:
+        return {
+            'added': len(self.added),
+            'removed': len(self.removed),
+            'changed': len(self.changed),
+            'unchanged': len(self.unchanged),
+            'renamed': len(self.renamed)
+        }
+
+class VocabularyImporter:
+    """Diffs a vocabulary catalog against the previous import and applies
+    only the deltas to stored progress"""
+    
+    def __init__(self, progress_repository: LearningProgressRepository = None,
+                 manifest_repository: VocabularyManifestRepository = None):
+        self.progress_repository = progress_repository or LearningProgressRepository()
+        self.manifest_repository = manifest_repository or VocabularyManifestRepository()
+    
+    def diff(self, catalog) -> VocabularyDiff:
+        """Classify catalog entries as added, removed, changed, unchanged or renamed.
+        
+        A removed key and an added key whose meaning, example and translation
+        hash identically are treated as a rename of the same entry.
+        """
+        previous = self.manifest_repository.get_manifest()
+        result = VocabularyDiff()
+        
+        for entry in catalog:
+            # Duplicate word keys resolve to their first entry, like the catalog
+            if catalog.id_for(entry.word) != entry.word_id:
+                continue
+            record = {
+                'hash': self._content_hash(entry),
+                'bodyHash': self._body_hash(entry),
+                'category': entry.category
+            }
+            result.manifest[entry.word] = record
+            
+            old_record = previous.get(entry.word)
+            if old_record is None:
+                result.added.append(entry.word)
+            elif old_record.get('hash') == record['hash']:
+                result.unchanged.append(entry.word)
+            else:
+                result.changed.append(entry.word)
+        
+        result.removed = [key for key in previous if key not in result.manifest]
+        self._detect_renames(result, previous)
+        return result
+    
+    def apply(self, result: VocabularyDiff, prune_removed: bool = False) -> VocabularyDiff:
+        """Apply a diff to stored progress with one batched write.
+        
+        Renamed words carry their progress over to the new key, changed words
+        pick up their new category, and removed words keep their progress
+        unless ``prune_removed`` is set. A rename onto a key that already has
+        progress is not applied: the pair goes back to ``removed`` and
+        ``added`` so both records are still tracked under their own keys.
+        """
+        all_progress = self.progress_repository.get_all_progress()
+        updates = {}
+        removed_keys = []
+        
+        for old_key, new_key in list(result.renamed.items()):
+            progress = all_progress.get(old_key)
+            if progress is not None and new_key in all_progress:
+                del result.renamed[old_key]
+                result.removed.append(old_key)
+                result.added.append(new_key)
+                continue
+            if progress is None:
+                continue
+            progress.word = new_key
+            progress.category = result.manifest[new_key]['category']
+            updates[new_key] = progress
+            removed_keys.append(old_key)
+        
+        for word_key in result.changed:
+            progress = all_progress.get(word_key)
+            category = result.manifest[word_key]['category']
+            if progress is not None and progress.category != category:
+                progress.category = category
+                updates[word_key] = progress
+        
+        if prune_removed:
+            removed_keys.extend(key for key in result.removed if key in all_progress)
+        
+        if updates or removed_keys:
+            self.progress_repository.apply_changes(updates, removed_keys)
+        if result.has_changes:
+            self.manifest_repository.save_manifest(result.manifest)
+        return result
+    
+    def import_catalog(self, catalog, prune_removed: bool = False) -> VocabularyDiff:
+        """Diff and apply in one step"""
+        return self.apply(self.diff(catalog), prune_removed)
+    
+    def _detect_renames(self, result: VocabularyDiff, previous: Dict[str, dict]):
+        removed_by_body: Dict[str, List[str]] = {}
+        for key in result.removed:
+            removed_by_body.setdefault(previous[key].get('bodyHash'), []).append(key)
+        
+        renamed_new_keys = set()
+        for new_key in result.added:
+            candidates = removed_by_body.get(result.manifest[new_key]['bodyHash'])
+            # Only unambiguous one-to-one matches count as renames
+            if candidates and len(candidates) == 1:
+                old_key = candidates.pop()
+                result.renamed[old_key] = new_key
+                renamed_new_keys.add(new_key)
+        
+        if result.renamed:
+            result.added = [key for key in result.added if key not in renamed_new_keys]
+            result.removed = [key for key in result.removed if key not in result.renamed]
+    
+    def _content_hash(self, entry) -> str:
+        return self._hash([entry.word, entry.category, entry.meaning,
+                           entry.example, entry.translation])
+    
+    def _body_hash(self, entry) -> str:
+        return self._hash([entry.meaning, entry.example, entry.translation])
+    
+    def _hash(self, values: list) -> str:
+        payload = json.dumps(values, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha1(payload).hexdigest()[:16]
@@ -1,70 +1,95 @@
 """
 Serverless localStorage simulation using in-memory dictionaries
-Matches browser localStorage behavior exactly
+Matches browser localStorage behavior exactly, including the per-origin
+quota (see shared.storage_simulator)
+
+set_json writes through a storage codec (plain JSON unless configured);
+get_json accepts any codec header as well as legacy plain JSON.
+
+Old daily lists (``todayList_<date>``) are evicted oldest first when a
+write would exceed the quota; any other write that does not fit raises
+QuotaExceededError and leaves storage unchanged.
+
+Every write also advances a storage generation, a token kept beside the
+items (never among them) that caches of decoded state (warm-start
+snapshots) compare to tell whether storage has changed. A store restored
+from persisted items can be given the generation it had, for example
+``content_generation`` of the persisted text.
 """
-import json
-from typing import Dict, Optional, Any
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-class LocalStorageSimulator:
-    """Simulates browser localStorage using in-memory dictionary"""
-    
-    def __init__(self):
-        self._storage: Dict[str, str] = {}
-    
-    def get_item(self, key: str) -> Optional[str]:
-        return self._storage.get(key)
-    
-    def set_item(self, key: str, value: str):
-        self._storage[key] = value
-    
-    def remove_item(self, key: str):
-        self._storage.pop(key, None)
-    
-    def clear(self):
-        self._storage.clear()
-    
-    def get_json(self, key: str, default=None) -> Any:
-        value = self.get_item(key)
-        if value is None:
-            return default
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return default
-    
-    def set_json(self, key: str, value: Any):
-        self.set_item(key, json.dumps(value))
+import uuid
+import zlib
+from typing import Callable, Dict, Optional
 
-class SessionStorageSimulator:
-    """Simulates browser sessionStorage using in-memory dictionary"""
-    
-    def __init__(self):
-        self._storage: Dict[str, str] = {}
+from shared.storage_codec import PlainJsonCodec
+from shared.storage_simulator import (
+    DEFAULT_QUOTA_BYTES, EvictionPolicy, QuotaExceededError, SessionStorageSimulator, WebStorageSimulator
+)
+
+# Item that held the generation in stores persisted by earlier versions
+LEGACY_GENERATION_KEY = '__storageGeneration'
+
+# Daily lists can be regenerated, so they are what gives way to live state
+DAILY_LIST_EVICTION = EvictionPolicy(prefixes=('todayList_',), strategy='oldest')
+
+def content_generation(text: str) -> str:
+    """Generation for a store restored from ``text``: the same persisted
+    text always gives the same token, and any edit to it a different one"""
+    data = text.encode('utf-8')
+    return f'{zlib.crc32(data):08x}{len(data):x}:0'
+
+class LocalStorageSimulator(WebStorageSimulator):
+    """Simulates browser localStorage using in-memory dictionary.
+
+    Pass ``quota_bytes=None`` for a store without a quota (benchmarks of
+    maps larger than a browser would hold).
+    """
     
-    def get_item(self, key: str) -> Optional[str]:
-        return self._storage.get(key)
+    def __init__(self, items: Optional[Dict[str, str]] = None, codec: str = PlainJsonCodec.name,
+                 key_codecs: Optional[Dict[str, str]] = None, generation: Optional[str] = None,
+                 quota_bytes: Optional[int] = DEFAULT_QUOTA_BYTES,
+                 eviction: Optional[EvictionPolicy] = DAILY_LIST_EVICTION,
+                 on_evict: Optional[Callable[[str], None]] = None):
+        items = dict(items or {})
+        legacy_generation = items.pop(LEGACY_GENERATION_KEY, None)
+        super().__init__(quota_bytes, eviction, on_evict, codec, key_codecs, items)
+        self._generation: Optional[str] = generation or legacy_generation
     
     def set_item(self, key: str, value: str):
-        self._storage[key] = value
+        super().set_item(key, value)
+        self._advance_generation()
     
     def remove_item(self, key: str):
-        self._storage.pop(key, None)
+        super().remove_item(key)
+        self._advance_generation()
     
     def clear(self):
-        self._storage.clear()
+        super().clear()
+        self._generation = None
+        self._advance_generation()
+    
+    def get_generation(self) -> Optional[str]:
+        """'<epoch>:<count>', changed by every write; None before the first.
+        The epoch is new whenever the store starts from empty, so a rebuilt
+        store never repeats an old generation."""
+        return self._generation
     
-    def get_json(self, key: str, default=None) -> Any:
-        value = self.get_item(key)
-        if value is None:
-            return default
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return default
+    def set_generation(self, generation: str):
+        """Adopt the generation of the persisted copy just written"""
+        self._generation = generation
     
-    def set_json(self, key: str, value: Any):
-        self.set_item(key, json.dumps(value))
+    def _advance_generation(self):
+        current = self._generation
+        if current is None:
+            epoch, count = uuid.uuid4().hex[:16], 0
+        else:
+            epoch, _, count = current.partition(':')
+            count = int(count or 0)
+        self._generation = f'{epoch}:{count + 1}'
 
 # Global instances (serverless, in-memory only)
 local_storage = LocalStorageSimulator()
-session_storage = SessionStorageSimulator()
\ No newline at end of file
+session_storage = SessionStorageSimulator()
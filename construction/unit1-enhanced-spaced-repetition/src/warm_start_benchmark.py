@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Warm start measurement - construct the progress service cold vs from a snapshot
+
+Cold start parses and decodes every stored record to build the eligibility
+index and the published snapshot. Warm start loads both from the snapshot
+saved by save_warm_start(). Both must yield the same state, and a snapshot
+taken before a storage write must be rejected (falling back to cold).
+The saving is modest and shrinks with size (about 2x at 3k words, 1.4x at
+100k), since the snapshot store is rebuilt on both paths.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+import tempfile
+
+from enhanced_learning_progress_service import EnhancedLearningProgressService
+from event_bus import EventBus
+from repositories.learning_progress_repository import MIGRATIONS, LearningProgressRepository
+from serialization_benchmark import _best, _records
+from shared.serialization import dumps
+from storage_simulator import LocalStorageSimulator
+
+def _state(service: EnhancedLearningProgressService):
+    return dict(service.snapshot().records.items()), service.eligibility_index.minutes()
+
+def main():
+    parser = argparse.ArgumentParser(description='Time progress service startup, cold vs warm')
+    parser.add_argument('--words', type=int, nargs='+', default=[3000, 100000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'words':>7}  {'cold ms':>9}{'warm ms':>9}{'speedup':>9}{'snapshot KiB':>14}  stale snapshot")
+    for count in args.words:
+        # 100k-word maps are far over the browser quota; no quota here
+        storage = LocalStorageSimulator(quota_bytes=None)
+        storage.set_item(LearningProgressRepository.VERSION_KEY, str(MIGRATIONS.current_version))
+        storage.set_item(LearningProgressRepository.STORAGE_KEY,
+                         dumps({word: p.to_dict() for word, p in _records(count).items()}))
+        items, generation = storage.items(), storage.get_generation()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'progress.warm')
+            
+            def restored_store():
+                return LocalStorageSimulator(items, generation=generation, quota_bytes=None)
+            
+            def cold():
+                return EnhancedLearningProgressService(restored_store(), EventBus())
+            
+            def warm():
+                return EnhancedLearningProgressService(restored_store(), EventBus(), path)
+            
+            reference = cold()
+            EnhancedLearningProgressService(restored_store(), EventBus(), path).save_warm_start()
+            restored = warm()
+            if not restored.warm_started or _state(restored) != _state(reference):
+                raise AssertionError('warm start did not restore the cold-start state')
+            
+            # Any write changes the storage generation, so the snapshot no longer applies
+            changed = restored_store()
+            changed.set_item('lastSelectionDate', '2026-01-02')
+            stale = EnhancedLearningProgressService(changed, EventBus(), path)
+            if stale.warm_started or _state(stale) != _state(reference):
+                raise AssertionError('stale snapshot was not rejected')
+            
+            cold_ms, warm_ms = _best(cold, args.repeats), _best(warm, args.repeats)
+            size_kib = os.path.getsize(path) / 1024
+            print(f'{count:>7}  {cold_ms:>9.1f}{warm_ms:>9.1f}{cold_ms / warm_ms:>8.1f}x{size_kib:>14.0f}'
+                  f'  rejected ({stale.warm_start.last_miss})')
+
+if __name__ == '__main__':
+    main()
@@ -4,14 +4,19 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 
+import asyncio
+
 from events.event_bus import EventBus
 from events.event_handlers import EventHandlers
 from services.learning_progress_integrator import LearningProgressIntegrator
 from services.component_initializer import ComponentInitializer
 from services.progress_update_coordinator import ProgressUpdateCoordinator
 from services.date_change_monitor import DateChangeMonitor
+from services.learning_stats_aggregator import LearningStatsAggregator
 from models.learning_progress import LearningProgress, LearningStatus
-from repositories.learning_progress_repository import LearningProgressRepository
+from repositories.learning_progress_repository import AsyncLearningProgressRepository
+from local_storage_simulator import localStorage
+from shared.async_storage import AsyncStorageAdapter
 from datetime import datetime
 import time
 
@@ -31,18 +36,26 @@ def demo_unit4():
     # Initialize services
     integrator = LearningProgressIntegrator(event_bus)
     component_initializer = ComponentInitializer(integrator)
-    progress_coordinator = ProgressUpdateCoordinator(event_bus)
+    # Progress is saved through the async adapter: handlers queue writes for
+    # its I/O thread instead of waiting for the disk
+    async_progress_repo = AsyncLearningProgressRepository(AsyncStorageAdapter(localStorage))
+    asyncio.run(async_progress_repo.refresh())
+    progress_repo = async_progress_repo.repository
+    progress_coordinator = ProgressUpdateCoordinator(event_bus, progress_repo)
     date_monitor = DateChangeMonitor(integrator)
+    # Retired words come back on the first day change after their hiatus
+    event_bus.subscribe('DateChanged', progress_coordinator.handle_date_changed)
     
     print("1. App Initialization Sequence")
     print("-" * 40)
     integrator.initialize_on_app_start()
     component_initializer.initialize_components()
+    print(f"Startup: {integrator.state.startup_ms:.1f} ms, "
+          f"critical path: {' -> '.join(integrator.state.critical_path)}")
     print()
     
     print("2. Creating Sample Learning Progress Data")
     print("-" * 40)
-    progress_repo = LearningProgressRepository()
     
     # Create sample words
     sample_words = [
@@ -71,6 +84,14 @@ def demo_unit4():
     for word in sample_words:
         progress_repo.save(word.word, word)
         print(f"Created progress for: {word.word} (Status: {word.status.value})")
+    
+    # Cold start: build statistics from storage once, then keep them current from events
+    stats_aggregator = LearningStatsAggregator(event_bus, progress_repo)
+    stats_aggregator.rebuild()
+    event_bus.subscribe('ProgressUpdated', stats_aggregator.handle_progress_updated)
+    event_bus.subscribe('WordsReactivated', stats_aggregator.handle_words_reactivated)
+    event_bus.subscribe('DateChanged', stats_aggregator.handle_date_changed)
+    stats_aggregator.refresh()
     print()
     
     print("3. Progress Updates and Event Flow")
@@ -108,6 +129,21 @@ def demo_unit4():
         print(f"  {word_key}: {progress.status.value} (created: {progress.created_date})")
     print()
     
+    print("7. Incremental Statistics")
+    print("-" * 40)
+    stats = stats_aggregator.refresh()
+    print(f"By status: {stats.by_status}")
+    print(f"By category: {stats.by_category}")
+    print(f"Mastered: {stats.mastered_words}")
+    mismatches = stats_aggregator.check_consistency()
+    print(f"Consistent with storage: {not mismatches}")
+    for mismatch in mismatches:
+        print(f"  {mismatch}")
+    print()
+    
+    # Everything saved so far is on disk once this returns
+    asyncio.run(async_progress_repo.flush())
+    
     print("=== Unit 4 Demo Complete ===")
 
 if __name__ == "__main__":
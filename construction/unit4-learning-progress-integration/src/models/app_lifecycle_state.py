@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, List
 
 @dataclass
 class ComponentsReady:
@@ -8,6 +8,17 @@ class ComponentsReady:
     playback_queue: bool = False
     ui_integration: bool = False
 
+@dataclass
+class ComponentTiming:
+    # Milliseconds from the start of component initialization
+    started_ms: float = 0.0
+    initialized_ms: float = 0.0
+    ready_ms: float = 0.0
+    
+    @property
+    def duration_ms(self) -> float:
+        return self.ready_ms - self.started_ms
+
 @dataclass
 class AppLifecycleState:
     is_initialized: bool = False
@@ -16,6 +27,9 @@ class AppLifecycleState:
     has_date_changed: bool = False
     initialization_timestamp: str = ""
     components_ready: ComponentsReady = None
+    startup_timings: Dict[str, ComponentTiming] = field(default_factory=dict)
+    startup_ms: float = 0.0
+    critical_path: List[str] = field(default_factory=list)
     
     def __post_init__(self):
         if self.components_ready is None:
@@ -25,4 +39,27 @@ class AppLifecycleState:
 class SystemCoordination:
     initialization_order: list[str]
     dependency_map: Dict[str, list[str]]
-    readiness_checks: Dict[str, callable]
\ No newline at end of file
+    readiness_checks: Dict[str, callable]
+    
+    def topological_order(self) -> list[str]:
+        """Every component after its dependencies; ties keep initialization_order"""
+        components = list(self.initialization_order)
+        components += [c for c in self.dependency_map if c not in components]
+        position = {component: i for i, component in enumerate(components)}
+        for component, dependencies in self.dependency_map.items():
+            for dependency in dependencies:
+                if dependency not in position:
+                    raise ValueError(f'{component} depends on unknown component {dependency}')
+        
+        remaining = {c: set(self.dependency_map.get(c, ())) for c in components}
+        order = []
+        while remaining:
+            available = [c for c, dependencies in remaining.items() if not dependencies]
+            if not available:
+                raise ValueError(f'Dependency cycle among: {", ".join(sorted(remaining))}')
+            component = min(available, key=position.__getitem__)
+            order.append(component)
+            del remaining[component]
+            for dependencies in remaining.values():
+                dependencies.discard(component)
+        return order
@@ -41,4 +41,13 @@ class StatsRefreshedEvent(DomainEvent):
             timestamp=data.get('timestamp', ''),
             event_type='StatsRefreshed',
             data=data
+        )
+
+@dataclass
+class WordsReactivatedEvent(DomainEvent):
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__(
+            timestamp=data.get('timestamp', ''),
+            event_type='WordsReactivated',
+            data=data
         )
\ No newline at end of file
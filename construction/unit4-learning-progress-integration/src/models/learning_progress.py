@@ -1,7 +1,12 @@
+import os
+import sys
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.serialization import compile_record_codec
+
 class LearningStatus(Enum):
     NEW = "new"
     DUE = "due"
@@ -22,33 +27,15 @@ class LearningProgress:
     retired_date: Optional[str] = None
     
     def to_dict(self) -> dict:
-        return {
-            'word': self.word,
-            'category': self.category,
-            'is_learned': self.is_learned,
-            'review_count': self.review_count,
-            'last_played_date': self.last_played_date,
-            'status': self.status.value,
-            'next_review_date': self.next_review_date,
-            'created_date': self.created_date,
-            'type': self.type,
-            'retired_date': self.retired_date
-        }
+        return _CODEC.encode(self)
     
     @classmethod
     def from_dict(cls, data: dict) -> 'LearningProgress':
-        return cls(
-            word=data['word'],
-            category=data['category'],
-            is_learned=data['is_learned'],
-            review_count=data['review_count'],
-            last_played_date=data['last_played_date'],
-            status=LearningStatus(data['status']),
-            next_review_date=data['next_review_date'],
-            created_date=data['created_date'],
-            type=data.get('type'),
-            retired_date=data.get('retired_date')
-        )
+        return _CODEC.decode(data)
+
+_CODEC = compile_record_codec(LearningProgress, converters={
+    'status': (lambda status: status.value, LearningStatus)
+})
 
 @dataclass
 class DailySelection:
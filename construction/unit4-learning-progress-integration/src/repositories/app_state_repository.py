@@ -1,14 +1,19 @@
 import json
+import os
+import sys
 from local_storage_simulator import localStorage
 from models.app_lifecycle_state import AppLifecycleState
 from typing import Optional
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.async_storage import AsyncStorageAdapter
+
 class AppStateRepository:
     LAST_INIT_DATE_KEY = 'lastAppInitDate'
     SEVERITY_KEY = 'userPreferredSeverity'
     
-    def __init__(self):
-        self.storage = localStorage
+    def __init__(self, storage=None):
+        self.storage = storage or localStorage
     
     def get_last_init_date(self) -> Optional[str]:
         return self.storage.get_item(self.LAST_INIT_DATE_KEY)
@@ -20,4 +25,22 @@ class AppStateRepository:
         return self.storage.get_item(self.SEVERITY_KEY) or 'moderate'
     
     def save_preferred_severity(self, severity: str) -> None:
-        self.storage.set_item(self.SEVERITY_KEY, severity)
\ No newline at end of file
+        self.storage.set_item(self.SEVERITY_KEY, severity)
+
+class AsyncAppStateRepository:
+    """AppStateRepository over an AsyncStorageAdapter; saves do not wait for the disk"""
+    
+    def __init__(self, storage: Optional[AsyncStorageAdapter] = None):
+        self.storage = storage or AsyncStorageAdapter(localStorage)
+    
+    async def get_last_init_date(self) -> Optional[str]:
+        return await self.storage.get_item(AppStateRepository.LAST_INIT_DATE_KEY)
+    
+    async def save_last_init_date(self, date: str) -> None:
+        await self.storage.set_item(AppStateRepository.LAST_INIT_DATE_KEY, date)
+    
+    async def get_preferred_severity(self) -> str:
+        return await self.storage.get_item(AppStateRepository.SEVERITY_KEY) or 'moderate'
+    
+    async def save_preferred_severity(self, severity: str) -> None:
+        await self.storage.set_item(AppStateRepository.SEVERITY_KEY, severity)
@@ -1,43 +1,151 @@
-import json
+import os
+import sys
+from contextlib import contextmanager
 from local_storage_simulator import localStorage
 from models.learning_progress import LearningProgress, LearningStatus
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional, Set
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.schema_migrations import MigrationChain
+from shared.async_storage import AsyncStorageAdapter
+from shared.lazy_record_map import DecodedRecordView, LazyRecordMap
+from shared.serialization import loads
+
 class LearningProgressRepository:
+    """Progress repository with an in-process identity map.
+    
+    The stored map is kept as text behind a LazyRecordMap; a record is
+    located and decoded on first access and the same object is returned
+    afterwards. Saves mark records dirty and a flush splices only the dirty
+    records into the stored text before writing it once. A change token from storage detects writes made by other
+    repositories or processes and reloads the cache, keeping pending local
+    changes on top.
+    
+    The map is written as compact JSON (no space after ',' or ':'). Maps
+    written with json.dumps' default separators still load, and the first
+    flush rewrites them in the compact form.
+    """
     STORAGE_KEY = 'learningProgress'
+    VERSION_KEY = 'learningProgressVersion'
     
-    def __init__(self):
-        self.storage = localStorage
+    def __init__(self, storage=None):
+        self.storage = storage or localStorage
+        self.migrations = MigrationChain([
+            (2, self._migrate_data)
+        ])
+        self._schema_version: Optional[int] = None
+        self._raw: Optional[LazyRecordMap] = None
+        self._records: Dict[str, LearningProgress] = {}
+        self._dirty: Set[str] = set()
+        self._loaded_version = None
+        self._batch_depth = 0
     
-    def get_all(self) -> Dict[str, LearningProgress]:
-        stored = self.storage.get_item(self.STORAGE_KEY)
-        progress_map = {}
-        
-        if stored:
-            data = json.loads(stored) if isinstance(stored, str) else stored
-            for key, value in data.items():
-                # Data migration: add default values for new fields
-                migrated_data = self._migrate_data(value)
-                progress_map[key] = LearningProgress.from_dict(migrated_data)
-        
-        return progress_map
+    def get_all(self) -> Mapping[str, LearningProgress]:
+        self._ensure_loaded()
+        return DecodedRecordView(self._raw, self._record)
     
     def save_all(self, progress_map: Dict[str, LearningProgress]) -> None:
-        data = {key: progress.to_dict() for key, progress in progress_map.items()}
-        self.storage.set_item(self.STORAGE_KEY, json.dumps(data))
+        # Replaces the whole map, so external changes are intentionally discarded
+        self._raw = LazyRecordMap()
+        self._records = dict(progress_map)
+        self._dirty = set(progress_map)
+        self._loaded_version = self.storage.get_item_version(self.STORAGE_KEY)
+        self._flush_if_not_batched()
+    
+    def get_schema_version(self, has_data: Optional[bool] = None) -> int:
+        if self._schema_version is None:
+            marker = self.storage.get_item(self.VERSION_KEY)
+            if has_data is None:
+                has_data = bool(self.storage.get_item(self.STORAGE_KEY))
+            self._schema_version = self.migrations.parse_version(marker, has_data)
+        return self._schema_version
     
     def get(self, word_key: str) -> Optional[LearningProgress]:
-        progress_map = self.get_all()
-        return progress_map.get(word_key)
+        self._ensure_loaded()
+        if word_key not in self._raw:
+            return None
+        return self._record(word_key)
     
     def save(self, word_key: str, progress: LearningProgress) -> None:
-        progress_map = self.get_all()
-        progress_map[word_key] = progress
-        self.save_all(progress_map)
+        self._ensure_loaded()
+        self._raw.setdefault(word_key, {})
+        self._records[word_key] = progress
+        self._dirty.add(word_key)
+        self._flush_if_not_batched()
+    
+    @contextmanager
+    def batch(self):
+        """Defer writes until the outermost batch exits, then flush once"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+    
+    def flush(self) -> None:
+        """Write pending changes to storage with a single serialization"""
+        if not self._dirty:
+            return
+        self._ensure_loaded()
+        for word_key in self._dirty:
+            self._raw[word_key] = self._records[word_key].to_dict()
+        self.storage.set_item(self.STORAGE_KEY, self._raw.dumps())
+        self._loaded_version = self.storage.get_item_version(self.STORAGE_KEY)
+        self._dirty.clear()
+        
+        # Every record is now in the current schema, so bump the marker once
+        if self.get_schema_version() != self.migrations.current_version:
+            self.storage.set_item(self.VERSION_KEY, str(self.migrations.current_version))
+            self._schema_version = self.migrations.current_version
+    
+    def invalidate(self) -> None:
+        """Drop cached records (pending changes are kept)"""
+        self._raw = None
+        self._records = {key: self._records[key] for key in self._dirty}
+    
+    def _flush_if_not_batched(self):
+        if self._batch_depth == 0:
+            self.flush()
+    
+    def _ensure_loaded(self):
+        version = self.storage.get_item_version(self.STORAGE_KEY)
+        if self._raw is not None and version == self._loaded_version:
+            return
+        
+        raw = LazyRecordMap()
+        stored = self.storage.get_item(self.STORAGE_KEY)
+        if stored:
+            schema_version = self.get_schema_version(has_data=True)
+            if self.migrations.needs_upgrade(schema_version):
+                # Data migration only for records written before the current schema
+                data = loads(stored) if isinstance(stored, str) else stored
+                raw = LazyRecordMap.from_records({
+                    key: self.migrations.upgrade(value, schema_version) for key, value in data.items()
+                })
+            elif isinstance(stored, str):
+                raw = LazyRecordMap(stored)
+            else:
+                raw = LazyRecordMap.from_records(stored)
+        
+        # Pending local changes win over what was reloaded
+        for key in self._dirty:
+            raw.setdefault(key, {})
+        self._raw = raw
+        self._records = {key: self._records[key] for key in self._dirty}
+        self._loaded_version = version
+    
+    def _record(self, word_key: str, raw: Optional[dict] = None) -> LearningProgress:
+        record = self._records.get(word_key)
+        if record is None:
+            record = LearningProgress.from_dict(self._raw[word_key] if raw is None else raw)
+            self._records[word_key] = record
+        return record
     
     def _migrate_data(self, data: dict) -> dict:
-        """Apply default values for backward compatibility"""
+        """v2: apply default values for backward compatibility"""
         today = datetime.now().strftime('%Y-%m-%d')
         
         defaults = {
@@ -55,4 +163,61 @@ class LearningProgressRepository:
                 else:
                     data[key] = default_value
         
-        return data
\ No newline at end of file
+        return data
+
+class AsyncLearningProgressRepository:
+    """Async variant for event handlers.
+    
+    Wraps a LearningProgressRepository running on the adapter's storage
+    view: the map is read on the I/O thread the first time it is needed,
+    and saves queue a coalesced write instead of waiting for the disk.
+    Repositories sharing one adapter see each other's saves at once;
+    ``refresh`` picks up writes made by other processes, and ``flush`` makes
+    everything saved so far durable.
+    """
+    
+    def __init__(self, storage: Optional[AsyncStorageAdapter] = None):
+        self.storage = storage or AsyncStorageAdapter(localStorage)
+        self._repository = LearningProgressRepository(self.storage.view())
+        self._loaded = False
+    
+    async def get_all(self) -> Mapping[str, LearningProgress]:
+        await self._load()
+        return self._repository.get_all()
+    
+    async def get(self, word_key: str) -> Optional[LearningProgress]:
+        await self._load()
+        return self._repository.get(word_key)
+    
+    async def save(self, word_key: str, progress: LearningProgress) -> None:
+        await self._load()
+        self._repository.save(word_key, progress)
+    
+    async def save_all(self, progress_map: Dict[str, LearningProgress]) -> None:
+        await self._load()
+        self._repository.save_all(progress_map)
+    
+    def batch(self):
+        """Defer saves until the outermost batch exits, then queue one write"""
+        return self._repository.batch()
+    
+    @property
+    def repository(self) -> LearningProgressRepository:
+        """The wrapped repository, for synchronous event handlers: once the
+        map is loaded its reads are served from memory and its saves only
+        queue writes"""
+        return self._repository
+    
+    async def refresh(self) -> None:
+        await self.storage.refresh(LearningProgressRepository.STORAGE_KEY,
+                                   LearningProgressRepository.VERSION_KEY)
+        self._loaded = True
+    
+    async def flush(self) -> None:
+        """Queue pending changes and wait until they are durable"""
+        self._repository.flush()
+        await self.storage.flush()
+    
+    async def _load(self):
+        if not self._loaded:
+            await self.refresh()
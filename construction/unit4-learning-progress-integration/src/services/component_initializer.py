@@ -1,47 +1,204 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from models.app_lifecycle_state import ComponentTiming, SystemCoordination
+
+class ComponentStartupError(Exception):
+    pass
+
 class ComponentInitializer:
-    def __init__(self, integrator):
+    """Starts components as soon as their dependencies are ready.
+
+    Components come from ``coordination.dependency_map``; independent ones
+    initialize concurrently on a thread pool, so startup takes as long as the
+    slowest dependency chain instead of the sum of all components. A component
+    counts as ready once its initializer has returned and its readiness check
+    (if any) passes; only then do its dependents start.
+    """
+    
+    def __init__(self, integrator, coordination: Optional[SystemCoordination] = None,
+                 max_workers: Optional[int] = None, readiness_timeout: float = 10.0):
         self.integrator = integrator
-        self.initialization_order = [
-            'learning_progress',
-            'daily_scheduler',
-            'playback_queue',
-            'ui_integration'
-        ]
-    
-    def initialize_components(self):
+        self.coordination = coordination or self.default_coordination()
+        self.initialization_order = self.coordination.topological_order()
+        self.max_workers = max_workers or max(1, len(self.initialization_order))
+        self.readiness_timeout = readiness_timeout
+        self.initializers: Dict[str, Callable[[], None]] = {
+            'learning_progress': self._initialize_learning_progress,
+            'daily_scheduler': self._initialize_daily_scheduler,
+            'playback_queue': self._initialize_playback_queue,
+            'ui_integration': self._initialize_ui_integration
+        }
+        self._print_lock = threading.Lock()
+    
+    @staticmethod
+    def default_coordination() -> SystemCoordination:
+        return SystemCoordination(
+            initialization_order=['learning_progress', 'daily_scheduler', 'playback_queue', 'ui_integration'],
+            dependency_map={
+                'learning_progress': [],
+                # Today's selection is built from migrated, date-reset progress
+                'daily_scheduler': ['learning_progress'],
+                # The queue is filled from today's selection
+                'playback_queue': ['daily_scheduler'],
+                # The UI only subscribes to events until the queue publishes
+                'ui_integration': []
+            },
+            readiness_checks={}
+        )
+    
+    def initialize_components(self) -> Dict[str, ComponentTiming]:
+        if not self.initialization_order:
+            # Nothing would ever set all_done below
+            self._record_timings({}, 0.0)
+            return {}
+        dependency_map = self.coordination.dependency_map
+        dependents: Dict[str, list] = {component: [] for component in self.initialization_order}
+        waiting_on = {}
         for component in self.initialization_order:
-            self._initialize_component(component)
+            waiting_on[component] = len(dependency_map.get(component, ()))
+            for dependency in dependency_map.get(component, ()):
+                dependents[dependency].append(component)
+        
+        timings: Dict[str, ComponentTiming] = {}
+        errors = []
+        lock = threading.Lock()
+        all_done = threading.Event()
+        remaining = [len(self.initialization_order)]
+        started = time.perf_counter()
+        
+        def elapsed_ms() -> float:
+            return (time.perf_counter() - started) * 1000
+        
+        def run(component: str):
+            timing = ComponentTiming(started_ms=elapsed_ms())
+            try:
+                self._initialize_component(component)
+                timing.initialized_ms = elapsed_ms()
+                self._wait_until_ready(component)
+                timing.ready_ms = elapsed_ms()
+            except BaseException as error:
+                with lock:
+                    errors.append(error)
+                all_done.set()
+                return
+            
             if self.integrator.state:
                 setattr(self.integrator.state.components_ready, component, True)
-            print(f'Component {component} initialized')
+            self._log(f'Component {component} initialized')
+            
+            with lock:
+                timings[component] = timing
+                unblocked = []
+                for dependent in dependents[component]:
+                    waiting_on[dependent] -= 1
+                    if waiting_on[dependent] == 0:
+                        unblocked.append(dependent)
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    all_done.set()
+                if errors:
+                    return
+            for dependent in unblocked:
+                executor.submit(run, dependent)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='component-init') as executor:
+            for component in self.initialization_order:
+                if waiting_on[component] == 0:
+                    executor.submit(run, component)
+            all_done.wait()
+        
+        if errors:
+            raise errors[0]
+        self._record_timings(timings, elapsed_ms())
+        return timings
+    
+    def critical_path(self, timings: Dict[str, ComponentTiming]) -> list[str]:
+        """Chain of components that determined when startup finished"""
+        path = []
+        component = max(timings, key=lambda c: timings[c].ready_ms, default=None)
+        while component is not None:
+            path.append(component)
+            dependencies = self.coordination.dependency_map.get(component, ())
+            component = max(dependencies, key=lambda c: timings[c].ready_ms, default=None)
+        return list(reversed(path))
+    
+    def _record_timings(self, timings: Dict[str, ComponentTiming], total_ms: float):
+        state = self.integrator.state
+        if state is None:
+            return
+        state.startup_timings = timings
+        state.startup_ms = total_ms
+        state.critical_path = self.critical_path(timings)
+    
+    def _wait_until_ready(self, component: str):
+        check = self.coordination.readiness_checks.get(component)
+        if check is None:
+            return
+        deadline = time.monotonic() + self.readiness_timeout
+        delay = 0.001
+        while not check():
+            if time.monotonic() >= deadline:
+                raise ComponentStartupError(
+                    f'{component} not ready after {self.readiness_timeout:.1f}s'
+                )
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
     
     def _initialize_component(self, component: str):
-        if component == 'learning_progress':
-            self._initialize_learning_progress()
-        elif component == 'daily_scheduler':
-            self._initialize_daily_scheduler()
-        elif component == 'playback_queue':
-            self._initialize_playback_queue()
-        elif component == 'ui_integration':
-            self._initialize_ui_integration()
+        initializer = self.initializers.get(component)
+        if initializer is None:
+            raise ComponentStartupError(f'No initializer for component {component}')
+        initializer()
+    
+    def _log(self, message: str):
+        # Components start on several threads; keep their lines whole
+        with self._print_lock:
+            print(message)
     
     def _initialize_learning_progress(self):
         # Migrate existing data if needed
-        print('Migrating learning progress data...')
+        self._log('Migrating learning progress data...')
         
         # Reset daily counters if date changed
         if self.integrator.state and self.integrator.state.has_date_changed:
-            print('Resetting daily exposures due to date change')
+            self._log('Resetting daily exposures due to date change')
     
     def _initialize_daily_scheduler(self):
-        print('Initializing daily scheduler...')
+        self._log('Initializing daily scheduler...')
         
         # Check if daily selection exists for today
         if self.integrator.state and self.integrator.state.has_date_changed:
-            print('Generating new daily selection due to date change')
+            self._log('Generating new daily selection due to date change')
     
     def _initialize_playback_queue(self):
-        print('Initializing playback queue...')
+        self._log('Initializing playback queue...')
     
     def _initialize_ui_integration(self):
-        print('Initializing UI integration...')
\ No newline at end of file
+        self._log('Initializing UI integration...')
+
+def _benchmark():
+    """Startup with simulated component costs: one at a time vs concurrent"""
+    costs = {'learning_progress': 0.12, 'daily_scheduler': 0.08, 'playback_queue': 0.04,
+             'ui_integration': 0.15}
+    
+    class _Integrator:
+        state = None
+    
+    from models.app_lifecycle_state import AppLifecycleState
+    for label, workers in (('sequential', 1), ('concurrent', None)):
+        integrator = _Integrator()
+        integrator.state = AppLifecycleState()
+        initializer = ComponentInitializer(integrator, max_workers=workers)
+        initializer._log = lambda message: None
+        for component, cost in costs.items():
+            initializer.initializers[component] = lambda cost=cost: time.sleep(cost)
+        initializer.initialize_components()
+        state = integrator.state
+        print(f'{label:<11} {state.startup_ms:6.0f} ms  critical path: {" -> ".join(state.critical_path)}')
+    print(f'sum of components {sum(costs.values()) * 1000:.0f} ms, '
+          f'longest chain {(costs["learning_progress"] + costs["daily_scheduler"] + costs["playback_queue"]) * 1000:.0f} ms')
+
+if __name__ == '__main__':
+    _benchmark()
@@ -0,0 +1,175 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from models.learning_progress import LearningProgress, LearningStatus
+from models.events import DomainEvent, StatsRefreshedEvent
+from repositories.learning_progress_repository import LearningProgressRepository
+
+# Review count at which a word counts as mastered (matches Unit 1)
+MASTERY_REVIEW_COUNT = 10
+
+# (status, category, is_learned, is_mastered, due date or None when retired)
+WordContribution = Tuple[str, str, bool, bool, Optional[str]]
+
+@dataclass
+class LearningStats:
+    total_words: int = 0
+    learned_words: int = 0
+    mastered_words: int = 0
+    new_words: int = 0
+    due_words: int = 0
+    by_status: Dict[str, int] = field(default_factory=dict)
+    by_category: Dict[str, int] = field(default_factory=dict)
+    
+    def to_dict(self) -> dict:
+        return {
+            'total_words': self.total_words,
+            'learned_words': self.learned_words,
+            'mastered_words': self.mastered_words,
+            'new_words': self.new_words,
+            'due_words': self.due_words,
+            'by_status': dict(self.by_status),
+            'by_category': dict(self.by_category)
+        }
+
+class LearningStatsAggregator:
+    """Keeps learning statistics up to date from progress-change events.
+
+    Each word's last contribution to the counters is remembered, so an update
+    subtracts the old contribution and adds the new one in O(1). Due-today is
+    derived from a histogram of review dates and only rescanned (over distinct
+    dates, not words) when the day changes. A full rebuild from storage is
+    needed only on cold start or after drift is detected.
+    """
+    
+    def __init__(self, event_bus, progress_repo: LearningProgressRepository = None):
+        self.event_bus = event_bus
+        self.progress_repo = progress_repo or LearningProgressRepository()
+        self._reset()
+    
+    def _reset(self):
+        self._contributions: Dict[str, WordContribution] = {}
+        self._by_status: Counter = Counter()
+        self._by_category: Counter = Counter()
+        self._learned = 0
+        self._mastered = 0
+        self._due_dates: Counter = Counter()
+        self._today = self._get_current_date()
+        self._due_today = 0
+    
+    def rebuild(self) -> LearningStats:
+        """Recompute every counter from storage (cold start or drift repair)"""
+        self._reset()
+        for word_key, progress in self.progress_repo.get_all().items():
+            self._apply(word_key, self._contribution_of(progress))
+        return self.get_stats()
+    
+    def get_stats(self) -> LearningStats:
+        self._roll_date()
+        return LearningStats(
+            total_words=len(self._contributions),
+            learned_words=self._learned,
+            mastered_words=self._mastered,
+            new_words=self._by_status[LearningStatus.NEW.value],
+            due_words=self._due_today,
+            by_status={status: count for status, count in self._by_status.items() if count},
+            by_category={category: count for category, count in self._by_category.items() if count}
+        )
+    
+    def refresh(self) -> LearningStats:
+        """Publish current statistics as a StatsRefreshed event"""
+        stats = self.get_stats()
+        data = stats.to_dict()
+        data['timestamp'] = datetime.now().isoformat()
+        self.event_bus.publish(StatsRefreshedEvent(data))
+        return stats
+    
+    def handle_progress_updated(self, event: DomainEvent):
+        word_key = event.data.get('word_key')
+        progress_data = event.data.get('progress_data')
+        if not word_key or progress_data is None:
+            return
+        self.update_word(word_key, LearningProgress.from_dict(progress_data))
+    
+    def handle_words_reactivated(self, event: DomainEvent):
+        for word_key, progress_data in event.data.get('progress_data', {}).items():
+            self.update_word(word_key, LearningProgress.from_dict(progress_data))
+    
+    def handle_date_changed(self, event: DomainEvent):
+        self._roll_date()
+        self.refresh()
+    
+    def update_word(self, word_key: str, progress: LearningProgress):
+        """Apply one word's new progress to the counters in O(1)"""
+        self._roll_date()
+        self._apply(word_key, self._contribution_of(progress))
+    
+    def remove_word(self, word_key: str):
+        self._roll_date()
+        self._apply(word_key, None)
+    
+    def check_consistency(self) -> List[str]:
+        """Compare the incremental counters against a fresh scan of storage.
+
+        Returns a list of human-readable mismatches (empty when consistent).
+        """
+        expected = LearningStatsAggregator(self.event_bus, self.progress_repo)
+        expected_stats = expected.rebuild()
+        actual_stats = self.get_stats()
+        
+        mismatches = []
+        for name, expected_value in expected_stats.to_dict().items():
+            actual_value = getattr(actual_stats, name)
+            if actual_value != expected_value:
+                mismatches.append(f'{name}: expected {expected_value}, got {actual_value}')
+        return mismatches
+    
+    def rebuild_if_drifted(self) -> bool:
+        """Rebuild from storage when the counters no longer match it"""
+        if not self.check_consistency():
+            return False
+        self.rebuild()
+        return True
+    
+    def _apply(self, word_key: str, new: Optional[WordContribution]):
+        old = self._contributions.pop(word_key, None)
+        if old is not None:
+            self._count(old, -1)
+        if new is not None:
+            self._contributions[word_key] = new
+            self._count(new, 1)
+    
+    def _count(self, contribution: WordContribution, delta: int):
+        status, category, is_learned, is_mastered, due_date = contribution
+        self._by_status[status] += delta
+        self._by_category[category] += delta
+        if is_learned:
+            self._learned += delta
+        if is_mastered:
+            self._mastered += delta
+        if due_date is not None:
+            self._due_dates[due_date] += delta
+            if due_date <= self._today:
+                self._due_today += delta
+    
+    def _roll_date(self):
+        today = self._get_current_date()
+        if today != self._today:
+            self._today = today
+            self._due_today = sum(
+                count for due_date, count in self._due_dates.items() if due_date <= today
+            )
+    
+    def _contribution_of(self, progress: LearningProgress) -> WordContribution:
+        is_retired = progress.status == LearningStatus.RETIRED
+        return (
+            progress.status.value,
+            progress.category,
+            bool(progress.is_learned),
+            progress.review_count >= MASTERY_REVIEW_COUNT,
+            None if is_retired else (progress.next_review_date or '')
+        )
+    
+    def _get_current_date(self) -> str:
+        return datetime.now().strftime('%Y-%m-%d')
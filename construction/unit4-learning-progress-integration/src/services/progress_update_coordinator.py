@@ -1,12 +1,24 @@
+import os
+import sys
 from datetime import datetime, timedelta
+from typing import Optional
 from models.learning_progress import LearningProgress, LearningStatus
-from models.events import ProgressUpdatedEvent
+from models.events import DomainEvent, ProgressUpdatedEvent, WordsReactivatedEvent
 from repositories.learning_progress_repository import LearningProgressRepository
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.reactivation_calendar import ReactivationCalendar, day_of
+
+# Days a retired word stays out of rotation
+RETIREMENT_DAYS = 100
+
 class ProgressUpdateCoordinator:
-    def __init__(self, event_bus):
+    def __init__(self, event_bus, progress_repo: LearningProgressRepository = None):
         self.event_bus = event_bus
-        self.progress_repo = LearningProgressRepository()
+        self.progress_repo = progress_repo or LearningProgressRepository()
+        # Retired words by return day; filled from storage on first use
+        self.reactivation_calendar = ReactivationCalendar()
+        self._calendar_loaded = False
     
     def update_word_progress(self, word_key: str, action_type: str):
         progress_before = self.progress_repo.get(word_key)
@@ -22,6 +34,7 @@ class ProgressUpdateCoordinator:
         
         # Save updated progress
         self.progress_repo.save(word_key, progress_before)
+        self._schedule_reactivation(word_key, progress_before)
         
         # Publish progress update event
         self.event_bus.publish(ProgressUpdatedEvent({
@@ -36,10 +49,65 @@ class ProgressUpdateCoordinator:
             today = datetime.now().strftime('%Y-%m-%d')
             progress.status = LearningStatus.RETIRED
             progress.retired_date = today
-            progress.next_review_date = self._add_days(today, 100)
+            progress.next_review_date = self._add_days(today, RETIREMENT_DAYS)
             
             self.progress_repo.save(word_key, progress)
+            self._schedule_reactivation(word_key, progress)
             print(f'Word {word_key} retired until {progress.next_review_date}')
+            
+            self.event_bus.publish(ProgressUpdatedEvent({
+                'word_key': word_key,
+                'progress_data': progress.to_dict(),
+                'timestamp': datetime.now().isoformat()
+            }))
+    
+    def reactivate_due_words(self, today: Optional[str] = None) -> list[str]:
+        """Return retired words whose hiatus ends by today to the review
+        rotation. Only words filed under days up to today are looked at; all
+        of them are saved in one write and announced in one event."""
+        self._ensure_calendar()
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        reactivated = {}
+        with self.progress_repo.batch():
+            for word_key in self.reactivation_calendar.sweep(today):
+                progress = self.progress_repo.get(word_key)
+                # Skip words changed since they were filed (e.g. by another repository)
+                if (progress is None or progress.status != LearningStatus.RETIRED
+                        or day_of(progress.next_review_date) > today):
+                    continue
+                progress.status = LearningStatus.DUE
+                progress.retired_date = None
+                self.progress_repo.save(word_key, progress)
+                reactivated[word_key] = progress.to_dict()
+        
+        if reactivated:
+            print(f'Reactivated {len(reactivated)} retired words')
+            self.event_bus.publish(WordsReactivatedEvent({
+                'word_keys': list(reactivated),
+                'progress_data': reactivated,
+                'date': today,
+                'timestamp': datetime.now().isoformat()
+            }))
+        return list(reactivated)
+    
+    def handle_date_changed(self, event: DomainEvent):
+        self.reactivate_due_words(event.data.get('current_date'))
+    
+    def _ensure_calendar(self):
+        if self._calendar_loaded:
+            return
+        self._calendar_loaded = True
+        for word_key, progress in self.progress_repo.get_all().items():
+            self._schedule_reactivation(word_key, progress)
+    
+    def _schedule_reactivation(self, word_key: str, progress: LearningProgress):
+        # Words saved before the calendar is loaded are picked up by the load
+        if not self._calendar_loaded:
+            return
+        if progress.status == LearningStatus.RETIRED:
+            self.reactivation_calendar.schedule(word_key, day_of(progress.next_review_date))
+        else:
+            self.reactivation_calendar.cancel(word_key)
     
     def _update_completion(self, progress: LearningProgress):
         today = datetime.now().strftime('%Y-%m-%d')
@@ -41,11 +41,11 @@ def demo_unit5():
     print("2. Mock UI Components for Localhost Testing")
     print("-" * 40)
     # Set up mock current word
-    integration_service.state.current_word = {
+    integration_service.update_state(current_word={
         'word': 'example',
         'meaning': 'a thing characteristic of its kind',
         'category': 'topic vocab'
-    }
+    })
     print(f"Current word: {integration_service.state.current_word['word']}")
     print()
     
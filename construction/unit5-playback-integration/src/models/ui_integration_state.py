@@ -11,8 +11,9 @@ class ButtonType(Enum):
     CATEGORY = "CATEGORY"
     RETIRE = "RETIRE"
 
-@dataclass
+@dataclass(frozen=True)
 class UIIntegrationState:
+    """Immutable; PlaybackIntegrationService.update_state publishes a new one"""
     current_word: Optional[dict] = None
     is_audio_playing: bool = False
     is_paused: bool = False
@@ -54,7 +54,7 @@ class AudioCompletionDetector:
         
         # Simulate advancing to next word
         next_word = {"word": "next_example", "meaning": "Next word meaning"}
-        self.integration_service.state.current_word = next_word
+        self.integration_service.update_state(current_word=next_word)
         
         print(f"Auto-advanced to: {next_word['word']}")
     
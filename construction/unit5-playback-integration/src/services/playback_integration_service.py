@@ -1,13 +1,33 @@
+import threading
+from dataclasses import replace
 from datetime import datetime
+from typing import Callable, Optional
 from models.ui_integration_state import UIIntegrationState, ButtonInteraction, ButtonType
 
 class PlaybackIntegrationService:
     def __init__(self, event_bus):
         self.event_bus = event_bus
-        self.state = UIIntegrationState()
+        self._state = UIIntegrationState()
+        self._state_lock = threading.Lock()
+    
+    @property
+    def state(self) -> UIIntegrationState:
+        """Current UI state; a consistent snapshot that later updates never change"""
+        return self._state
+    
+    def update_state(self, change: Optional[Callable[[UIIntegrationState], dict]] = None,
+                     **changes) -> UIIntegrationState:
+        """Publish a new state with the given fields changed, all at once.
+        ``change`` maps the current state to further changes, read and
+        applied under the same lock so a concurrent update is never lost"""
+        with self._state_lock:
+            if change is not None:
+                changes.update(change(self._state))
+            self._state = replace(self._state, **changes)
+            return self._state
     
     def connect_with_vocabulary_card(self):
-        self.state.integration_active = True
+        self.update_state(integration_active=True)
         print("Connected with VocabularyCard - integration active")
     
     def handle_next_click(self) -> ButtonInteraction:
@@ -82,15 +102,18 @@ class PlaybackIntegrationService:
         )
         
         try:
-            # Call original pause/play handler
-            print(f"{'Resuming' if is_paused else 'Pausing'} playback...")
-            
-            # Update integration state
-            self.state.is_paused = not is_paused
-            self.state.is_audio_playing = is_paused
-            self.state.auto_advance_enabled = not self.state.is_paused
+            # Toggle the current state, not the caller's view of it, which
+            # a concurrent click may already have changed
+            state = self.update_state(lambda current: {
+                'is_paused': not current.is_paused,
+                'is_audio_playing': current.is_paused,
+                'auto_advance_enabled': current.is_paused
+            })
+            resumed = not state.is_paused
+            print(f"{'Resumed' if resumed else 'Paused'} playback")
             
-            interaction.resulting_action = 'RESUMED' if is_paused else 'PAUSED'
+            interaction.button_type = ButtonType.PLAY if resumed else ButtonType.PAUSE
+            interaction.resulting_action = 'RESUMED' if resumed else 'PAUSED'
             interaction.success = True
             
         except Exception as e:
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Shared-module copies - the prototype does not import construction/shared, so
+infrastructure/ carries copies of a few of its modules. Exits with status 1
+if any copy differs from its source; --sync copies the sources over.
+"""
+
+import argparse
+import filecmp
+import os
+import shutil
+import sys
+
+PROTOTYPE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_DIR = os.path.join(os.path.dirname(PROTOTYPE_DIR), 'construction', 'shared')
+
+# Modules copied verbatim from construction/shared into infrastructure/
+COPIED_MODULES = ['review_log.py', 'serialization.py', 'warm_start.py']
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the prototype copies of shared modules')
+    parser.add_argument('--sync', action='store_true', help='copy the shared sources over the copies')
+    args = parser.parse_args()
+    
+    stale = []
+    for name in COPIED_MODULES:
+        source = os.path.join(SHARED_DIR, name)
+        copy = os.path.join(PROTOTYPE_DIR, 'infrastructure', name)
+        if os.path.exists(copy) and filecmp.cmp(source, copy, shallow=False):
+            print(f'{name:<20} identical')
+        elif args.sync:
+            shutil.copyfile(source, copy)
+            print(f'{name:<20} copied from construction/shared')
+        else:
+            stale.append(name)
+            print(f'{name:<20} DIFFERS from construction/shared/{name}')
+    if stale:
+        print('Run with --sync to recopy them')
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
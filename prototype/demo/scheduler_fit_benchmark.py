@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Memory-model fitting - per-learner weights from simulated review histories,
+batched NumPy Newton steps vs the pure-Python fallback
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import math
+import random
+import time
+from typing import Dict
+from units.learning_progress import schedulers
+from units.learning_progress.schedulers import MemoryModelParams, ReviewHistory, fit_memory_models
+
+def draw_learners(count: int, seed: int = 1) -> Dict[str, MemoryModelParams]:
+    rng = random.Random(seed)
+    return {
+        f'learner{i}': MemoryModelParams(rng.gauss(0.2, 0.3), rng.gauss(0.6, 0.15), rng.gauss(-0.4, 0.15))
+        for i in range(count)
+    }
+
+def simulate(params: MemoryModelParams, words: int, reviews: int, rng: random.Random) -> ReviewHistory:
+    """Reviews of ``words`` words on a doubling schedule, the learner turning
+    up early or late, recalled with the model's probability"""
+    columns = ([], [], [], [])
+    for _ in range(words):
+        correct = incorrect = 0
+        for review in range(reviews):
+            elapsed = (2 ** min(review, 6)) * math.exp(rng.gauss(0.0, 0.6))
+            recalled = rng.random() < _recall(params, elapsed, correct, incorrect)
+            for column, value in zip(columns, (elapsed, correct, incorrect, int(recalled))):
+                column.append(value)
+            if recalled:
+                correct += 1
+            else:
+                incorrect += 1
+    return ReviewHistory(*columns)
+
+def _recall(params: MemoryModelParams, elapsed: float, correct: int, incorrect: int) -> float:
+    stability = math.exp(params.intercept + params.per_correct * correct + params.per_incorrect * incorrect)
+    return 1.0 / (1.0 + elapsed / (9.0 * stability))
+
+def _log_loss(params: MemoryModelParams, history: ReviewHistory) -> float:
+    total = 0.0
+    for elapsed, correct, incorrect, recalled in zip(*history):
+        p = min(max(_recall(params, elapsed, correct, incorrect), 1e-9), 1 - 1e-9)
+        total -= math.log(p if recalled else 1.0 - p)
+    return total / len(history.recalled)
+
+def main():
+    parser = argparse.ArgumentParser(description='Time per-learner memory-model fitting')
+    parser.add_argument('--learners', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--python-learners', type=int, default=200)
+    parser.add_argument('--words', type=int, default=20)
+    parser.add_argument('--reviews', type=int, default=8)
+    args = parser.parse_args()
+    
+    numpy = schedulers.np
+    runs = [('numpy', count) for count in args.learners] if numpy is not None else []
+    runs.append(('python', args.python_learners))
+    print(f"{'fit':<8}{'learners':>9}{'reviews':>10}{'seconds':>9}{'|err| per_correct':>19}"
+          f"{'held-out loss: default':>24}{'fitted':>8}")
+    for label, count in runs:
+        truth = draw_learners(count)
+        rng = random.Random(2)
+        histories = {k: simulate(params, args.words, args.reviews, rng) for k, params in truth.items()}
+        # Fresh reviews by the same learners: measures the fit, not memorization
+        held_out = {k: simulate(params, args.words, args.reviews, rng) for k, params in truth.items()}
+        
+        schedulers.np = numpy if label == 'numpy' else None
+        try:
+            started = time.perf_counter()
+            fitted = fit_memory_models(histories)
+            seconds = time.perf_counter() - started
+        finally:
+            schedulers.np = numpy
+        
+        error = sum(abs(fitted[k].per_correct - truth[k].per_correct) for k in truth) / count
+        default_loss = sum(_log_loss(MemoryModelParams(), held_out[k]) for k in truth) / count
+        fitted_loss = sum(_log_loss(fitted[k], held_out[k]) for k in truth) / count
+        print(f'{label:<8}{count:>9}{count * args.words * args.reviews:>10}{seconds:>9.2f}'
+              f'{error:>19.3f}{default_loss:>24.3f}{fitted_loss:>8.3f}')
+    if numpy is None:
+        print('NumPy is not installed; only the pure-Python fit was timed')
+
+if __name__ == "__main__":
+    main()
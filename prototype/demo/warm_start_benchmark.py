@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Warm start measurement - service start plus the first due-words query,
+decoding every stored word (cold) vs loading a warm-start snapshot
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import time
+from datetime import datetime, timedelta
+from infrastructure import local_storage
+from infrastructure.serialization import dumps
+from units.learning_progress import LearningProgressService
+from units.learning_progress.models import DifficultyLevel, WordProgress
+
+def _best(fn, repeats: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main(counts=(3000, 100000)):
+    print(f"{'words':>7}  {'cold ms':>9}{'warm ms':>9}{'speedup':>9}  stale snapshot")
+    base = datetime(2026, 1, 1)
+    for count in counts:
+        local_storage.clear()
+        local_storage.set_item(LearningProgressService.STORAGE_KEY, dumps({
+            f'word{i}': WordProgress(
+                word_id=f'word{i}', correct_count=i % 7, incorrect_count=i % 3,
+                last_reviewed=base + timedelta(minutes=i),
+                difficulty_level=DifficultyLevel(i % 3 + 1),
+                next_review_date=base + timedelta(days=i % 30)
+            ).to_dict()
+            for i in range(count)
+        }))
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'progress.warm')
+            reference = LearningProgressService()
+            expected = reference.get_due_words()
+            LearningProgressService(path).save_warm_start()
+            
+            warm_service = LearningProgressService(path)
+            if not warm_service.warm_started or warm_service.get_due_words() != expected:
+                raise AssertionError('warm start did not restore the stored progress')
+            
+            cold_ms = _best(lambda: LearningProgressService().get_due_words())
+            warm_ms = _best(lambda: LearningProgressService(path).get_due_words())
+            
+            # Any write changes the storage generation, so the snapshot no longer applies
+            local_storage.set_item('lastSelectionDate', '2026-01-02')
+            stale = LearningProgressService(path)
+            if stale.warm_started or stale.get_due_words() != expected:
+                raise AssertionError('stale snapshot was not rejected')
+            print(f'{count:>7}  {cold_ms:>9.1f}{warm_ms:>9.1f}{cold_ms / warm_ms:>8.1f}x'
+                  f'  rejected ({stale.warm_start.last_miss})')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import json
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional, Set, Tuple
+from .serialization import dumps
+
+_decoder = json.JSONDecoder()
+
+def _escaped(text: str, position: int) -> bool:
+    count = 0
+    position -= 1
+    while position >= 0 and text[position] == '\\':
+        count += 1
+        position -= 1
+    return count % 2 == 1
+
+class LazyObjectMap(MutableMapping):
+    """Map of model objects backed by stored JSON text.
+
+    A record is found with a substring search and decoded only when it is
+    first read; the object is kept, since callers mutate it in place. On
+    ``dumps`` every object handed out or assigned is re-encoded and spliced
+    into the text, and untouched records are copied as they were. Records
+    must be flat JSON objects, so ``"key":{`` only occurs at the top level.
+    """
+    
+    def __init__(self, text: Optional[str], decode: Callable[[dict], Any], encode: Callable[[Any], dict]):
+        self._decode = decode
+        self._encode = encode
+        self._objects: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()
+        self._rebase(text or '{}')
+    
+    def _rebase(self, text: str):
+        self._text = text
+        first_colon = text.find('":')
+        while first_colon >= 0 and _escaped(text, first_colon):
+            first_colon = text.find('":', first_colon + 1)
+        # json.dumps with default separators wrote '"key": {'
+        self._spaced = text[first_colon + 2:first_colon + 3] == ' ' if first_colon >= 0 else False
+        self._separator = '": {' if self._spaced else '":{'
+        self._spans: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._indexed = False
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self._objects.get(key)
+        if value is not None:
+            return value
+        span = None if key in self._deleted else self._locate(key)
+        if span is None:
+            raise KeyError(key)
+        value = self._objects[key] = self._decode(_decoder.raw_decode(self._text, span[1])[0])
+        return value
+    
+    def __setitem__(self, key: str, value: Any):
+        self._objects[key] = value
+        self._deleted.discard(key)
+    
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self._objects.pop(key, None)
+        self._deleted.add(key)
+    
+    def __contains__(self, key) -> bool:
+        if key in self._objects:
+            return True
+        return key not in self._deleted and self._locate(key) is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        self._index()
+        for key, span in list(self._spans.items()):
+            if span is not None and key not in self._deleted:
+                yield key
+        for key in list(self._objects):
+            if self._spans.get(key) is None:
+                yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def index(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        """Position of every record in the stored text"""
+        self._index()
+        return dict(self._spans)
+    
+    def preload(self, objects: Dict[str, Any], index: Optional[Dict[str, Optional[Tuple[int, int]]]] = None):
+        """Adopt already decoded objects (e.g. from a warm-start snapshot) so
+        they are not decoded from the text; they must match what is stored.
+        ``index`` from index() on the same text saves rescanning it."""
+        self._objects.update(objects)
+        if index is not None:
+            self._spans = dict(index)
+            self._indexed = True
+    
+    def dumps(self) -> str:
+        """Stored text with every loaded object re-encoded; the map is rebased onto it"""
+        if not self._objects and not self._deleted:
+            return self._text
+        if self._spaced:
+            text = dumps({key: self._encode(self[key]) for key in self})
+        else:
+            text = self._splice()
+        self._deleted.clear()
+        self._rebase(text)
+        return text
+    
+    def _splice(self) -> str:
+        text = self._text
+        edits, appended = [], []
+        for key in self._deleted:
+            span = self._locate(key)
+            if span is not None:
+                end = _decoder.raw_decode(text, span[1])[1]
+                start = span[0] - 1 if text[span[0] - 1] == ',' else span[0]
+                edits.append((start, end, ''))
+        for key, value in self._objects.items():
+            span = self._locate(key)
+            encoded = dumps(self._encode(value))
+            if span is None:
+                appended.append(f'{dumps(key)}:{encoded}')
+            else:
+                edits.append((span[1], _decoder.raw_decode(text, span[1])[1], encoded))
+        
+        # `leading`: only '{' emitted so far, so the next comma is dropped
+        close = text.rindex('}')
+        edits.sort()
+        edits.append((close, close, None))
+        pieces, position, leading = [], 0, False
+        for start, end, replacement in edits:
+            if leading and position < start and text[position] == ',':
+                position += 1
+            segment = text[position:start]
+            pieces.append(segment)
+            leading = segment == '{' or (leading and not segment)
+            if replacement is None:
+                break
+            pieces.append(replacement)
+            leading = leading and not replacement
+            position = end
+        if appended:
+            pieces.append(('' if leading else ',') + ','.join(appended))
+        pieces.append(text[close:])
+        return ''.join(pieces)
+    
+    def _locate(self, key: str) -> Optional[Tuple[int, int]]:
+        if key in self._spans or self._indexed:
+            return self._spans.get(key)
+        text = self._text
+        needle = dumps(key)[:-1] + self._separator
+        span = None
+        position = text.find(needle)
+        while position >= 0:
+            before = text[position - 1] if position else ''
+            if before == ' ' and self._spaced:
+                before = text[position - 2]
+            if before in ('{', ','):
+                span = (position, position + len(needle) - 1)
+                break
+            position = text.find(needle, position + 1)
+        self._spans[key] = span
+        return span
+    
+    def _index(self):
+        if self._indexed:
+            return
+        text, separator = self._text, self._separator
+        spans: Dict[str, Optional[Tuple[int, int]]] = {}
+        position = text.find(separator)
+        while position >= 0:
+            if not _escaped(text, position):
+                start = text.rfind('"', 0, position)
+                while start > 0 and _escaped(text, start):
+                    start = text.rfind('"', 0, start)
+                key = text[start + 1:position]
+                if '\\' in key:
+                    key = json.loads(text[start:position + 1])
+                spans[key] = (start, position + len(separator) - 1)
+            position = text.find(separator, position + len(separator))
+        self._spans = spans
+        self._indexed = True
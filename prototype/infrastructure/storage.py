@@ -1,23 +1,48 @@
-import json
+import uuid
 from typing import Any, Dict, Optional
+from .serialization import dumps, loads
 
 class LocalStorageSimulator:
-    """Simulates localStorage behavior using in-memory dictionaries"""
+    """Simulates localStorage behavior using in-memory dictionaries.
+
+    Every write advances a storage generation, kept beside the items rather
+    than among them; warm-start snapshots compare it to tell whether
+    storage has changed.
+    """
     
     def __init__(self):
         self._storage: Dict[str, str] = {}
+        self._generation: Optional[str] = None
     
     def get_item(self, key: str) -> Optional[str]:
         return self._storage.get(key)
     
     def set_item(self, key: str, value: str):
         self._storage[key] = value
+        self._advance_generation()
     
     def remove_item(self, key: str):
         self._storage.pop(key, None)
+        self._advance_generation()
     
     def clear(self):
         self._storage.clear()
+        self._generation = None
+        self._advance_generation()
+    
+    def get_generation(self) -> Optional[str]:
+        """'<epoch>:<count>', changed by every write; None before the first.
+        The epoch is new whenever the store starts from empty."""
+        return self._generation
+    
+    def _advance_generation(self):
+        current = self._generation
+        if current is None:
+            epoch, count = uuid.uuid4().hex[:16], 0
+        else:
+            epoch, _, count = current.partition(':')
+            count = int(count or 0)
+        self._generation = f'{epoch}:{count + 1}'
     
     def get_json(self, key: str, default=None) -> Any:
         """Get and parse JSON value"""
@@ -25,13 +50,14 @@ class LocalStorageSimulator:
         if value is None:
             return default
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
+            return loads(value)
+        except ValueError:
             return default
     
     def set_json(self, key: str, value: Any):
-        """Serialize and store JSON value"""
-        self.set_item(key, json.dumps(value))
+        """Serialize and store JSON value as compact JSON (no space after
+        ',' or ':'); values stored with json.dumps' default spacing still load"""
+        self.set_item(key, dumps(value))
 
 # Global storage instance
 local_storage = LocalStorageSimulator()
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datetime import datetime, date
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set
 from infrastructure import Event, event_bus, local_storage
+from infrastructure.warm_start import WarmStartCache
 
 class DailySchedulingService:
     """Manages daily word selection and scheduling"""
@@ -8,9 +9,10 @@ class DailySchedulingService:
     DAILY_SELECTION_KEY = 'dailySelection'
     LAST_SELECTION_DATE_KEY = 'lastSelectionDate'
     
-    def __init__(self):
+    def __init__(self, warm_start_path: Optional[str] = None):
         self._daily_words: List[str] = []
         self._last_selection_date: date = None
+        self.warm_start = WarmStartCache(warm_start_path, 'daily-selection/1') if warm_start_path else None
         self._load_daily_selection()
         
         # Subscribe to events
@@ -18,13 +20,24 @@ class DailySchedulingService:
         event_bus.subscribe('app_started', self._handle_app_started)
     
     def _load_daily_selection(self):
-        """Load daily selection from storage"""
+        """Load daily selection from storage (or a warm-start snapshot of it)"""
+        if self.warm_start is not None:
+            state = self.warm_start.load(local_storage.get_generation())
+            if state is not None:
+                self._daily_words, self._last_selection_date = state
+                return
         self._daily_words = local_storage.get_json(self.DAILY_SELECTION_KEY, [])
         
         date_str = local_storage.get_item(self.LAST_SELECTION_DATE_KEY)
         if date_str:
             self._last_selection_date = date.fromisoformat(date_str)
     
+    def save_warm_start(self):
+        """Snapshot the selection for the next start (call on shutdown)"""
+        if self.warm_start is not None:
+            self.warm_start.save(local_storage.get_generation(),
+                                 (list(self._daily_words), self._last_selection_date))
+    
     def _save_daily_selection(self):
         """Save daily selection to storage"""
         local_storage.set_json(self.DAILY_SELECTION_KEY, self._daily_words)
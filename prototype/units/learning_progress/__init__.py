@@ -1,5 +1,9 @@
 from .models import WordProgress, LearningSession, DifficultyLevel
+from .schedulers import (ReviewScheduler, IntervalTableScheduler, MemoryModelScheduler,
+                         MemoryModelParams, ReviewHistory, fit_memory_models)
 from .spaced_repetition import SpacedRepetitionEngine
 from .service import LearningProgressService
 
-__all__ = ['WordProgress', 'LearningSession', 'DifficultyLevel', 'SpacedRepetitionEngine', 'LearningProgressService']
\ No newline at end of file
+__all__ = ['WordProgress', 'LearningSession', 'DifficultyLevel', 'SpacedRepetitionEngine', 'LearningProgressService',
+           'ReviewScheduler', 'IntervalTableScheduler', 'MemoryModelScheduler', 'MemoryModelParams',
+           'ReviewHistory', 'fit_memory_models']
\ No newline at end of file
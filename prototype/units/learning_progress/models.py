@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Optional
 from enum import Enum
+from infrastructure.serialization import compile_record_codec
 
 class DifficultyLevel(Enum):
     EASY = 1
@@ -25,6 +26,25 @@ class WordProgress:
     @property
     def total_reviews(self) -> int:
         return self.correct_count + self.incorrect_count
+    
+    def to_dict(self) -> dict:
+        return _WORD_PROGRESS_CODEC.encode(self)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'WordProgress':
+        return _WORD_PROGRESS_CODEC.decode(data)
+
+def _to_iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+_WORD_PROGRESS_CODEC = compile_record_codec(WordProgress, converters={
+    'last_reviewed': (_to_iso, _from_iso),
+    'difficulty_level': (lambda level: level.value, DifficultyLevel),
+    'next_review_date': (_to_iso, _from_iso)
+})
 
 @dataclass
 class LearningSession:
@@ -0,0 +1,250 @@
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from .models import WordProgress, DifficultyLevel
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class ReviewScheduler(ABC):
+    """Plug-in interface for SpacedRepetitionEngine: decides when a word is
+    next reviewed and which difficulty level it is shown with"""
+    
+    @abstractmethod
+    def calculate_next_review(self, progress: WordProgress, is_correct: bool,
+                              now: Optional[datetime] = None) -> datetime:
+        """When the word should next be reviewed, given this review's outcome"""
+    
+    def adjust_difficulty(self, progress: WordProgress):
+        """Adjust difficulty based on performance"""
+        if progress.total_reviews >= 5:
+            if progress.success_rate >= 0.8:
+                progress.difficulty_level = DifficultyLevel.EASY
+            elif progress.success_rate <= 0.4:
+                progress.difficulty_level = DifficultyLevel.HARD
+            else:
+                progress.difficulty_level = DifficultyLevel.MEDIUM
+
+class IntervalTableScheduler(ReviewScheduler):
+    """Fixed interval tables per difficulty level (the default)"""
+    
+    # Base intervals in days for each difficulty level
+    BASE_INTERVALS = {
+        DifficultyLevel.EASY: [1, 3, 7, 14, 30],
+        DifficultyLevel.MEDIUM: [1, 2, 5, 10, 21],
+        DifficultyLevel.HARD: [1, 1, 3, 6, 12]
+    }
+    
+    def calculate_next_review(self, progress: WordProgress, is_correct: bool,
+                              now: Optional[datetime] = None) -> datetime:
+        """Calculate next review date based on performance"""
+        now = now or datetime.now()
+        
+        if not is_correct:
+            # Reset to beginning if incorrect
+            return now + timedelta(days=1)
+        
+        # Get appropriate interval based on review count and difficulty
+        intervals = self.BASE_INTERVALS[progress.difficulty_level]
+        interval_index = min(progress.correct_count, len(intervals) - 1)
+        base_interval = intervals[interval_index]
+        
+        # Apply success rate multiplier
+        multiplier = 1.0 + (progress.success_rate - 0.5) * 0.5
+        final_interval = max(1, int(base_interval * multiplier))
+        
+        return now + timedelta(days=final_interval)
+
+@dataclass
+class MemoryModelParams:
+    """Per-learner weights of the memory model, on log stability (days)"""
+    intercept: float = 0.0
+    per_correct: float = 0.7
+    per_incorrect: float = -0.5
+    
+    def as_tuple(self) -> Tuple[float, float, float]:
+        return self.intercept, self.per_correct, self.per_incorrect
+
+class ReviewHistory(NamedTuple):
+    """One learner's past reviews as parallel columns, one entry per review:
+    days since the word's previous review, the word's counts before it, and
+    whether it was recalled (1) or not (0). Lists or NumPy arrays."""
+    elapsed_days: Sequence[float]
+    correct_before: Sequence[int]
+    incorrect_before: Sequence[int]
+    recalled: Sequence[int]
+
+# Stability is the interval at which recall has dropped to 90%
+_CURVE_FACTOR = 9.0
+# Same-day repeats still count, as a few minutes of forgetting
+_MIN_ELAPSED_DAYS = 0.01
+# Largest change to any weight per Newton step
+_MAX_STEP = 1.0
+
+class MemoryModelScheduler(ReviewScheduler):
+    """SM-2/FSRS-style memory model fitted to the learner's own reviews.
+
+    A word's stability S (days) grows geometrically with its correct
+    reviews and shrinks with lapses: log S = intercept + per_correct *
+    correct + per_incorrect * incorrect, one weight set per learner.
+    Recall after t days follows the FSRS power curve
+    R = 1 / (1 + t / (9 S)), and the next review is placed where R falls to
+    ``target_retention``.
+    """
+    
+    def __init__(self, params: Optional[MemoryModelParams] = None,
+                 target_retention: float = 0.9, max_interval_days: int = 365):
+        if not 0.0 < target_retention < 1.0:
+            raise ValueError('target_retention must be between 0 and 1')
+        self.params = params or MemoryModelParams()
+        self.target_retention = target_retention
+        self.max_interval_days = max_interval_days
+    
+    def stability(self, correct_count: int, incorrect_count: int) -> float:
+        intercept, per_correct, per_incorrect = self.params.as_tuple()
+        log_stability = intercept + per_correct * correct_count + per_incorrect * incorrect_count
+        return math.exp(min(log_stability, 20.0))
+    
+    def recall_probability(self, progress: WordProgress, elapsed_days: float) -> float:
+        stability = self.stability(progress.correct_count, progress.incorrect_count)
+        return 1.0 / (1.0 + max(elapsed_days, 0.0) / (_CURVE_FACTOR * stability))
+    
+    def interval_days(self, progress: WordProgress) -> int:
+        stability = self.stability(progress.correct_count, progress.incorrect_count)
+        days = _CURVE_FACTOR * stability * (1.0 / self.target_retention - 1.0)
+        return max(1, min(self.max_interval_days, int(round(days))))
+    
+    def calculate_next_review(self, progress: WordProgress, is_correct: bool,
+                              now: Optional[datetime] = None) -> datetime:
+        # Counts already include this review, and a lapse lowers stability through them
+        now = now or datetime.now()
+        return now + timedelta(days=self.interval_days(progress))
+
+def fit_memory_models(histories: Dict[str, ReviewHistory], prior_strength: float = 2.0,
+                      iterations: int = 25) -> Dict[str, MemoryModelParams]:
+    """Maximum-likelihood weights for each learner, shrunk towards weights
+    pooled over all learners so sparse histories still get sensible ones;
+    learners with no history get the pooled weights themselves.
+
+    Under the power curve, recall is a logistic function of log S minus
+    log(t / 9), so each learner's fit is a small penalized logistic
+    regression solved with Newton steps. With NumPy every learner takes its
+    step at once as one batched 3x3 solve; without it learners are fitted
+    one at a time in pure Python.
+    """
+    learners = [learner for learner, history in histories.items() if len(history.recalled)]
+    if not learners:
+        return {learner: MemoryModelParams() for learner in histories}
+    fit = _fit_numpy if np is not None else _fit_python
+    pooled, per_learner = fit([histories[learner] for learner in learners], prior_strength, iterations)
+    fitted = {learner: MemoryModelParams(*pooled) for learner in histories}
+    for learner, weights in zip(learners, per_learner):
+        fitted[learner] = MemoryModelParams(*weights)
+    return fitted
+
+def _fit_numpy(histories: List[ReviewHistory], prior_strength: float, iterations: int
+               ) -> Tuple[Tuple[float, float, float], List[Tuple[float, float, float]]]:
+    lengths = np.array([len(history.recalled) for history in histories])
+    learner = np.repeat(np.arange(len(histories)), lengths)
+    features = np.column_stack([
+        np.ones(lengths.sum()),
+        np.concatenate([np.asarray(history.correct_before, dtype=float) for history in histories]),
+        np.concatenate([np.asarray(history.incorrect_before, dtype=float) for history in histories])
+    ])
+    elapsed = np.concatenate([np.asarray(history.elapsed_days, dtype=float) for history in histories])
+    offset = np.log(_CURVE_FACTOR) - np.log(np.maximum(elapsed, _MIN_ELAPSED_DAYS))
+    recalled = np.concatenate([np.asarray(history.recalled, dtype=float) for history in histories])
+    
+    # Pooled weights first (around the defaults), then every learner around them
+    default = np.array(MemoryModelParams().as_tuple())
+    pooled = _newton_numpy(np.zeros_like(learner), 1, features, offset, recalled,
+                           default[None, :], prior_strength, iterations)
+    return tuple(pooled[0].tolist()), [
+        tuple(row) for row in _newton_numpy(learner, len(histories), features, offset, recalled,
+                                            pooled, prior_strength, iterations).tolist()]
+
+def _newton_numpy(learner, groups: int, features, offset, recalled, prior, strength: float,
+                  iterations: int):
+    weights = np.broadcast_to(prior, (groups, prior.shape[1])).copy()
+    size = features.shape[1]
+    ridge = strength * np.eye(size)
+    for _ in range(iterations):
+        logits = np.einsum('ij,ij->i', weights[learner], features) + offset
+        predicted = 1.0 / (1.0 + np.exp(-np.clip(logits, -30.0, 30.0)))
+        residual = recalled - predicted
+        curvature = predicted * (1.0 - predicted)
+        gradient = np.column_stack([
+            np.bincount(learner, residual * features[:, a], minlength=groups) for a in range(size)
+        ]) - strength * (weights - prior)
+        hessian = np.empty((groups, size, size))
+        for a in range(size):
+            for b in range(a, size):
+                hessian[:, a, b] = hessian[:, b, a] = np.bincount(
+                    learner, curvature * features[:, a] * features[:, b], minlength=groups)
+        step = np.linalg.solve(hessian + ridge, gradient[..., None])[..., 0]
+        # Both fits cap each step at _MAX_STEP: nearly separable histories overshoot
+        step *= np.minimum(1.0, _MAX_STEP / np.maximum(np.abs(step).max(axis=1, keepdims=True), 1e-12))
+        weights += step
+        if np.abs(step).max() < 1e-6:
+            break
+    return weights
+
+def _fit_python(histories: List[ReviewHistory], prior_strength: float, iterations: int
+                ) -> Tuple[Tuple[float, float, float], List[Tuple[float, float, float]]]:
+    rows = [_rows_python(history) for history in histories]
+    pooled = _newton_python([row for learner_rows in rows for row in learner_rows],
+                            list(MemoryModelParams().as_tuple()), prior_strength, iterations)
+    return tuple(pooled), [tuple(_newton_python(learner_rows, pooled, prior_strength, iterations))
+                           for learner_rows in rows]
+
+def _rows_python(history: ReviewHistory) -> List[Tuple[Tuple[float, float, float], float, float]]:
+    log_factor = math.log(_CURVE_FACTOR)
+    return [
+        ((1.0, float(correct), float(incorrect)),
+         log_factor - math.log(max(float(elapsed), _MIN_ELAPSED_DAYS)), float(recalled))
+        for elapsed, correct, incorrect, recalled in zip(
+            history.elapsed_days, history.correct_before, history.incorrect_before, history.recalled)
+    ]
+
+def _newton_python(rows, prior: List[float], strength: float, iterations: int) -> List[float]:
+    weights = list(prior)
+    size = len(weights)
+    for _ in range(iterations):
+        gradient = [-strength * (w - p) for w, p in zip(weights, prior)]
+        hessian = [[strength if a == b else 0.0 for b in range(size)] for a in range(size)]
+        for features, offset, recalled in rows:
+            logit = sum(w * x for w, x in zip(weights, features)) + offset
+            predicted = 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, logit))))
+            residual = recalled - predicted
+            curvature = predicted * (1.0 - predicted)
+            for a in range(size):
+                gradient[a] += residual * features[a]
+                for b in range(size):
+                    hessian[a][b] += curvature * features[a] * features[b]
+        step = _solve(hessian, gradient)
+        scale = min(1.0, _MAX_STEP / max(max(abs(s) for s in step), 1e-12))
+        step = [s * scale for s in step]
+        weights = [w + s for w, s in zip(weights, step)]
+        if max(abs(s) for s in step) < 1e-6:
+            break
+    return weights
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Gaussian elimination with partial pivoting for the small Newton systems"""
+    size = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, size):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, size + 1):
+                rows[r][c] -= factor * rows[col][c]
+    solution = [0.0] * size
+    for r in reversed(range(size)):
+        solution[r] = (rows[r][size] - sum(rows[r][c] * solution[c] for c in range(r + 1, size))) / rows[r][r]
+    return solution
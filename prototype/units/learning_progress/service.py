@@ -1,49 +1,90 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import List, Optional
 from infrastructure import Event, event_bus, local_storage
+from infrastructure.lazy_map import LazyObjectMap
+from infrastructure.review_log import NO_OUTCOME, SECONDS_PER_DAY, ReviewLog
+from infrastructure.warm_start import WarmStartCache, pack_records, schema_of, unpack_records
 from .models import WordProgress, LearningSession, DifficultyLevel
+from .schedulers import ReviewHistory, ReviewScheduler
 from .spaced_repetition import SpacedRepetitionEngine
 
 class LearningProgressService:
     """Manages learning progress and spaced repetition"""
     
     STORAGE_KEY = 'learningProgress'
+    REVIEW_LOG_KEY = 'reviewLog'
+    # Review log entries held in memory before they are written to storage
+    REVIEW_LOG_FLUSH_EVERY = 64
     
-    def __init__(self):
-        self.engine = SpacedRepetitionEngine()
-        self._progress: Dict[str, WordProgress] = {}
+    def __init__(self, warm_start_path: Optional[str] = None, scheduler: Optional[ReviewScheduler] = None):
+        self.engine = SpacedRepetitionEngine(scheduler)
+        self.warm_start = WarmStartCache(warm_start_path, schema_of(WordProgress)) if warm_start_path else None
         self._load_progress()
+        self.review_log = ReviewLog.load(local_storage, self.REVIEW_LOG_KEY)
         
         # Subscribe to events
         event_bus.subscribe('word_reviewed', self._handle_word_reviewed)
         event_bus.subscribe('session_completed', self._handle_session_completed)
     
     def _load_progress(self):
-        """Load progress from storage"""
-        data = local_storage.get_json(self.STORAGE_KEY, {})
-        for word_id, progress_data in data.items():
-            self._progress[word_id] = WordProgress(
-                word_id=progress_data['word_id'],
-                correct_count=progress_data.get('correct_count', 0),
-                incorrect_count=progress_data.get('incorrect_count', 0),
-                last_reviewed=datetime.fromisoformat(progress_data['last_reviewed']) if progress_data.get('last_reviewed') else None,
-                difficulty_level=DifficultyLevel(progress_data.get('difficulty_level', 2)),
-                next_review_date=datetime.fromisoformat(progress_data['next_review_date']) if progress_data.get('next_review_date') else None
-            )
+        """Open stored progress; words are decoded on first access, or taken
+        from a warm-start snapshot of this storage generation"""
+        self._progress: LazyObjectMap = LazyObjectMap(local_storage.get_item(self.STORAGE_KEY),
+                                                      WordProgress.from_dict, WordProgress.to_dict)
+        self.warm_started = False
+        if self.warm_start is not None:
+            state = self.warm_start.load(local_storage.get_generation())
+            if state is not None:
+                records, index = state
+                self._progress.preload(unpack_records(records, WordProgress), index)
+                self.warm_started = True
+    
+    def save_warm_start(self):
+        """Snapshot every decoded word for the next start (call on shutdown)"""
+        if self.warm_start is not None:
+            records = {word_id: self._progress[word_id] for word_id in self._progress}
+            self.warm_start.save(local_storage.get_generation(),
+                                 (pack_records(records, WordProgress), self._progress.index()))
+    
+    def save_review_log(self):
+        """Write review log entries appended since the last save"""
+        if self.review_log.unsaved:
+            self.review_log.save(local_storage, self.REVIEW_LOG_KEY)
+    
+    def review_history(self) -> ReviewHistory:
+        """Logged reviews in the form fit_memory_models takes. Each review is
+        paired with the word's previous one; counts before it are worked back
+        from the word's current totals."""
+        reviews = defaultdict(list)
+        for word_id, timestamp, outcome, action in zip(*self.review_log.between()):
+            if action == 'review' and outcome != NO_OUTCOME:
+                reviews[word_id].append((timestamp, outcome))
+        
+        history = ReviewHistory([], [], [], [])
+        for word_id, word_reviews in reviews.items():
+            progress = self._progress.get(word_id)
+            if progress is None:
+                continue
+            correct = progress.correct_count - sum(outcome for _, outcome in word_reviews)
+            incorrect = progress.incorrect_count - sum(1 - outcome for _, outcome in word_reviews)
+            if correct < 0 or incorrect < 0:
+                # Counts were reset after these reviews were logged
+                continue
+            previous = None
+            for timestamp, outcome in word_reviews:
+                if previous is not None:
+                    for column, value in zip(history, ((timestamp - previous) / SECONDS_PER_DAY,
+                                                       correct, incorrect, outcome)):
+                        column.append(value)
+                correct += outcome
+                incorrect += 1 - outcome
+                previous = timestamp
+        return history
     
     def _save_progress(self):
-        """Save progress to storage"""
-        data = {}
-        for word_id, progress in self._progress.items():
-            data[word_id] = {
-                'word_id': progress.word_id,
-                'correct_count': progress.correct_count,
-                'incorrect_count': progress.incorrect_count,
-                'last_reviewed': progress.last_reviewed.isoformat() if progress.last_reviewed else None,
-                'difficulty_level': progress.difficulty_level.value,
-                'next_review_date': progress.next_review_date.isoformat() if progress.next_review_date else None
-            }
-        local_storage.set_json(self.STORAGE_KEY, data)
+        """Save progress to storage, re-encoding only the words that were loaded"""
+        local_storage.set_item(self.STORAGE_KEY, self._progress.dumps())
     
     def get_due_words(self) -> List[str]:
         """Get words due for review"""
@@ -71,6 +112,9 @@ class LearningProgressService:
         
         # Update timing
         progress.last_reviewed = datetime.now()
+        self.review_log.append(word_id, is_correct, 'review', progress.last_reviewed.timestamp())
+        if self.review_log.unsaved >= self.REVIEW_LOG_FLUSH_EVERY:
+            self.save_review_log()
         progress.next_review_date = self.engine.calculate_next_review(progress, is_correct)
         
         # Adjust difficulty
@@ -88,6 +132,7 @@ class LearningProgressService:
     def _handle_session_completed(self, event: Event):
         """Handle session completion event"""
         session = event.data['session']
+        self.save_review_log()
         
         # Publish analytics event
         event_bus.publish(Event('learning_analytics_updated', {
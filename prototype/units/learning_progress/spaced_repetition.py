@@ -1,35 +1,20 @@
-from datetime import datetime, timedelta
-from typing import List, Dict
-from .models import WordProgress, DifficultyLevel
+from datetime import datetime
+from typing import List, Dict, Optional
+from .models import WordProgress
+from .schedulers import IntervalTableScheduler, ReviewScheduler
 
 class SpacedRepetitionEngine:
     """Implements spaced repetition algorithm for vocabulary learning"""
     
-    # Base intervals in days for each difficulty level
-    BASE_INTERVALS = {
-        DifficultyLevel.EASY: [1, 3, 7, 14, 30],
-        DifficultyLevel.MEDIUM: [1, 2, 5, 10, 21], 
-        DifficultyLevel.HARD: [1, 1, 3, 6, 12]
-    }
+    # Kept for compatibility; the tables live on IntervalTableScheduler
+    BASE_INTERVALS = IntervalTableScheduler.BASE_INTERVALS
+    
+    def __init__(self, scheduler: Optional[ReviewScheduler] = None):
+        self.scheduler = scheduler or IntervalTableScheduler()
     
     def calculate_next_review(self, progress: WordProgress, is_correct: bool) -> datetime:
         """Calculate next review date based on performance"""
-        now = datetime.now()
-        
-        if not is_correct:
-            # Reset to beginning if incorrect
-            return now + timedelta(days=1)
-        
-        # Get appropriate interval based on review count and difficulty
-        intervals = self.BASE_INTERVALS[progress.difficulty_level]
-        interval_index = min(progress.correct_count, len(intervals) - 1)
-        base_interval = intervals[interval_index]
-        
-        # Apply success rate multiplier
-        multiplier = 1.0 + (progress.success_rate - 0.5) * 0.5
-        final_interval = max(1, int(base_interval * multiplier))
-        
-        return now + timedelta(days=final_interval)
+        return self.scheduler.calculate_next_review(progress, is_correct)
     
     def get_due_words(self, all_progress: Dict[str, WordProgress]) -> List[str]:
         """Get list of word IDs that are due for review"""
@@ -44,10 +29,4 @@ class SpacedRepetitionEngine:
     
     def adjust_difficulty(self, progress: WordProgress):
         """Adjust difficulty based on performance"""
-        if progress.total_reviews >= 5:
-            if progress.success_rate >= 0.8:
-                progress.difficulty_level = DifficultyLevel.EASY
-            elif progress.success_rate <= 0.4:
-                progress.difficulty_level = DifficultyLevel.HARD
-            else:
-                progress.difficulty_level = DifficultyLevel.MEDIUM
\ No newline at end of file
+        self.scheduler.adjust_difficulty(progress)
\ No newline at end of file